@@ -0,0 +1,4 @@
+from dotenv import load_dotenv
+
+# Loaded once for the whole package, before any module reads its settings with os.getenv
+load_dotenv()
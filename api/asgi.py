@@ -0,0 +1,241 @@
+"""
+ASGI entry point: `uvicorn api.asgi:app`.
+
+The LLM-bound routes are served as native coroutines, so one process can hold many
+in-flight OpenAI calls. Every other route is delegated to the Flask app in `api/index.py`.
+"""
+import os
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from api.index import app as flask_app
+from api.job_queue.base_queue import JOB_PRIORITY_BULK, JOB_PRIORITY_INTERACTIVE, parse_job_priority
+from api.services import job_service
+from api.services.analysis_service import (
+    ANALYSIS_BATCH_CONCURRENCY,
+    async_perform_answer_analysis,
+    async_perform_batch_answer_analysis,
+    async_iter_batch_answer_analysis,
+    validate_batch,
+)
+from api.services.speech_service import get_default_speech_service
+from api.utils.admission import (
+    ADMISSION_ENABLED,
+    ANSWER_ANALYSIS_POLICY,
+    AdmissionPolicy,
+    admission_controller,
+    body_items_cost,
+    client_identity,
+)
+from api.utils.logger_config import logger
+from api.utils.metrics import observe_request, server_timing_header, start_request_timings, stop_request_timings
+
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "64"))
+
+_wsgi_executor = ThreadPoolExecutor(max_workers=ASGI_WSGI_THREADS, thread_name_prefix="wsgi")
+
+
+class _ConcurrentWsgiToAsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs WSGI apps thread-sensitively, i.e. one request at a time on a single shared
+    # thread, so one long poll stalls every Flask route. Flask is thread-safe: use a pool instead.
+    run_wsgi_app = sync_to_async(
+        WsgiToAsgiInstance.__dict__["run_wsgi_app"].func, thread_sensitive=False, executor=_wsgi_executor)
+
+
+class _ConcurrentWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await _ConcurrentWsgiToAsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+class _RequestMetricsMiddleware:
+    """Request metrics and Server-Timing for the native routes; the Flask app records its own."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = start_request_timings()
+        response = {"status": 500, "from_flask": False}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                if "server-timing" in headers:
+                    response["from_flask"] = True
+                else:
+                    headers.append("Server-Timing", server_timing_header(total=time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stop_request_timings(token)
+            if not response["from_flask"]:
+                observe_request(scope["method"], scope["path"], response["status"], time.perf_counter() - started)
+
+
+def _session_tokens(request: Request):
+    """Reads the user's access and refresh tokens the same way `get_current_user` does."""
+    auth_header = request.headers.get("Authorization")
+    user_jwt = auth_header.split(" ")[1] if auth_header and auth_header.startswith("Bearer ") else None
+    return user_jwt, request.headers.get("refresh-token")
+
+
+def _decide_admission(request: Request, policy: AdmissionPolicy, cost: int, slots: int):
+    identity = client_identity(request.headers, request.client.host if request.client else None)
+    return admission_controller.admit(policy, identity, cost, slots)
+
+
+async def _admit(request: Request, policy: AdmissionPolicy, cost: int = 1, slots: int = 1):
+    """
+    Admission control for the native routes, as `admission_control` does for the Flask ones.
+    Returns (rejection response, lease); a lease must be released once the LLM work is done.
+    """
+    if not ADMISSION_ENABLED:
+        return None, None
+    rejection, lease = await asyncio.to_thread(_decide_admission, request, policy, max(1, cost), slots)
+    if rejection is not None:
+        return JSONResponse({"error": rejection.error}, status_code=rejection.status, headers=rejection.headers()), None
+    return None, lease
+
+
+async def _release(lease):
+    if lease is not None:
+        await asyncio.to_thread(admission_controller.release, lease)
+
+
+async def analyze_answer(request: Request):
+    lease = None
+    try:
+        rejection, lease = await _admit(request, ANSWER_ANALYSIS_POLICY)
+        if rejection is not None:
+            return rejection
+
+        data = await request.json()
+        answer_text = data.get("answer_text")
+        question = data.get("question")
+
+        analysis_result = await async_perform_answer_analysis(answer_text, question)
+        return JSONResponse({"analysis": analysis_result}, status_code=200)
+
+    except ValueError as ve:
+        logger.warning(f"Validation error analyzing answer: {str(ve)}")
+        return JSONResponse({"error": str(ve)}, status_code=400)
+
+    except Exception as e:
+        logger.error(f"Error analyzing answer: {str(e)}")
+        return JSONResponse({"error": "Internal server error during analysis"}, status_code=500)
+    finally:
+        await _release(lease)
+
+
+async def analyze_answers_batch(request: Request):
+    lease = None
+    try:
+        data = await request.json()
+        items = validate_batch(data.get("items"))
+
+        rejection, lease = await _admit(request, ANSWER_ANALYSIS_POLICY, body_items_cost("items")(data),
+                                        body_items_cost("items", ANALYSIS_BATCH_CONCURRENCY)(data))
+        if rejection is not None:
+            return rejection
+
+        if data.get("stream"):
+            stream_lease, lease = lease, None  # Held until the last result is sent
+
+            async def ndjson():
+                try:
+                    async for result in async_iter_batch_answer_analysis(items):
+                        yield json.dumps(result) + "\n"
+                finally:
+                    await _release(stream_lease)
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+        return JSONResponse({"results": await async_perform_batch_answer_analysis(items)}, status_code=200)
+
+    except ValueError as ve:
+        logger.warning(f"Validation error analyzing answers batch: {str(ve)}")
+        return JSONResponse({"error": str(ve)}, status_code=400)
+
+    except Exception as e:
+        logger.error(f"Error analyzing answers batch: {str(e)}")
+        return JSONResponse({"error": "Internal server error during batch analysis"}, status_code=500)
+    finally:
+        await _release(lease)
+
+
+async def process_job_background(request: Request):
+    logger.debug("Processing background job route (async)")
+    try:
+        data = await request.json()
+        job_description_id_str = data.get("job_description_id")
+        job_description_id_strs = data.get("job_description_ids")
+        user_jwt, refresh_token = _session_tokens(request)
+
+        if job_description_id_strs:
+            logger.info(f"Background route: Received request to process a batch of {len(job_description_id_strs)} jobs")
+            await job_service.async_process_job_batch(
+                job_description_id_strs, user_jwt=user_jwt, refresh_token=refresh_token,
+                priority=parse_job_priority(data.get("priority"), JOB_PRIORITY_BULK),
+                next_job_description_id_strs=data.get("next_job_description_ids"))
+            return JSONResponse({"message": "Background processing acknowledged"}, status_code=200)
+
+        if not job_description_id_str:
+            logger.error("Background route: job_description_id missing in payload.")
+            return JSONResponse({"error": "job_description_id is required"}, status_code=400)
+
+        logger.info(f"Background route: Received request to process job {job_description_id_str}")
+        await job_service.async_process_job_background_task(
+            job_description_id_str, user_jwt=user_jwt, refresh_token=refresh_token,
+            priority=parse_job_priority(data.get("priority"), JOB_PRIORITY_INTERACTIVE))
+
+        return JSONResponse({"message": "Background processing acknowledged"}, status_code=200)
+    except Exception as e:
+        logger.error(f"Error in process_job_background_route: {e}")
+        return JSONResponse({"error": "Internal server error handling background task trigger"}, status_code=500)
+
+
+async def get_speech_token(request: Request):
+    speech_service = get_default_speech_service()
+    try:
+        token = await speech_service.async_get_speech_token()
+        return JSONResponse({
+            "token": token,
+            "region": speech_service.speech_region,
+            "expires_in": speech_service.token_expires_in
+        }, status_code=200)
+
+    except ConnectionError as ce:
+        logger.error(f"Speech service connection error: {str(ce)}")
+        return JSONResponse({"error": "Service temporarily unavailable while fetching speech token"}, status_code=503)
+
+    except Exception as e:
+        logger.error(f"Error fetching speech token: {str(e)}")
+        return JSONResponse({"error": "Internal server error fetching speech token"}, status_code=500)
+
+
+app = Starlette(middleware=[Middleware(_RequestMetricsMiddleware)], routes=[
+    Route('/api/analyses', analyze_answer, methods=['POST']),
+    Route('/api/analyses/batch', analyze_answers_batch, methods=['POST']),
+    Route('/api/internal/process-job-background', process_job_background, methods=['POST']),
+    Route('/api/speech-token', get_speech_token, methods=['GET']),
+    Mount('/', app=_ConcurrentWsgiToAsgi(flask_app)),
+])
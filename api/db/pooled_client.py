@@ -0,0 +1,58 @@
+from typing import Dict, Optional, Union
+
+from httpx import Timeout
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from postgrest.utils import SyncClient
+from supabase import Client, ClientOptions, SupabaseAuthClient
+
+from api.utils.http_pool import get_httpx_client, get_httpx_transport
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """Postgrest client whose HTTP session runs on the shared connection pool."""
+
+    def create_session(
+            self,
+            base_url: str,
+            headers: Dict[str, str],
+            timeout: Union[int, float, Timeout],
+            verify: bool = True,
+            proxy: Optional[str] = None) -> SyncClient:
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=get_httpx_transport(),
+        )
+
+
+class PooledClient(Client):
+    """Supabase client that reuses the process-wide HTTP connection pool."""
+
+    @staticmethod
+    def _init_supabase_auth_client(
+            auth_url: str,
+            client_options: ClientOptions,
+            verify: bool = True,
+            proxy: Optional[str] = None) -> SupabaseAuthClient:
+        return SupabaseAuthClient(
+            url=auth_url,
+            auto_refresh_token=client_options.auto_refresh_token,
+            persist_session=client_options.persist_session,
+            storage=client_options.storage,
+            headers=client_options.headers,
+            flow_type=client_options.flow_type,
+            http_client=get_httpx_client(),
+        )
+
+    @staticmethod
+    def _init_postgrest_client(
+            rest_url: str,
+            headers: Dict[str, str],
+            schema: str,
+            timeout: Union[int, float, Timeout] = DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+            verify: bool = True,
+            proxy: Optional[str] = None) -> SyncPostgrestClient:
+        return _PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
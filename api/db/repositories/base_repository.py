@@ -1,4 +1,5 @@
-from api.utils.logger_config import logger
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import timed
 
 
 class BaseRepository:
@@ -6,6 +7,14 @@ class BaseRepository:
         self.client = db_client
         self.table_name = table_name
         self.logger = logger
+        self.sampled_logger = sampled_logger  # For per-request read logs
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public query method is timed as a "db.<method>" stage
+        for name, attribute in list(vars(cls).items()):
+            if callable(attribute) and not name.startswith("_"):
+                setattr(cls, name, timed(f"db.{name}")(attribute))
 
     def _handle_supabase_error(self, error, operation: str):
         self.logger.error(f"Supabase {operation} on table {self.table_name} error: {error}")
@@ -0,0 +1,88 @@
+import os
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from .job_description_repository import JobDescriptionRepository
+from .question_repository import QuestionRepository
+from api.utils.logger_config import logger
+from api.utils.metrics import timed
+
+# Set to "false" for databases without the complete_job function (supabase/migrations)
+JOB_COMPLETION_RPC_ENABLED = os.getenv("JOB_COMPLETION_RPC_ENABLED", "true").lower() == "true"
+
+COMPLETE_JOB_FUNCTION = "complete_job"
+_FUNCTION_NOT_FOUND = "PGRST202"  # PostgREST error code for an unknown function
+
+
+class JobCompletionUnitOfWork:
+    """
+    Buffers the writes that finish a processing run (title, questions, final status) and
+    commits them as one call to the `complete_job` Postgres function, which applies them in a
+    single transaction. Nothing is visible before `commit`, so a job is never `completed` with
+    part of its questions missing. Without the function the same writes are made one by one.
+    """
+
+    # Turned off for the whole process the first time the database reports the function missing
+    rpc_available = JOB_COMPLETION_RPC_ENABLED
+
+    def __init__(self, db_client, job_description_id: UUID, replace_questions: bool = False):
+        self.client = db_client
+        self.job_description_id = job_description_id
+        # Questions left by an earlier, failed attempt are dropped in the same commit
+        self.replace_questions = replace_questions
+        self.title: Optional[str] = None
+        self.questions: List[Dict] = []
+
+    def set_title(self, title: str):
+        self.title = title
+
+    def add_question(self, row: Dict):
+        self.questions.append({**row, "job_description_id": str(row["job_description_id"])})
+
+    @timed("db.complete_job")
+    def commit(self) -> bool:
+        """Applies the buffered writes and marks the job completed. Returns False if nothing was committed."""
+        if not self.client:
+            logger.error("Supabase client is not initialized. Cannot complete job.")
+            return False
+
+        if JobCompletionUnitOfWork.rpc_available:
+            try:
+                data, count = self.client.rpc(COMPLETE_JOB_FUNCTION, {
+                    "p_job_description_id": str(self.job_description_id),
+                    "p_title": self.title,
+                    "p_questions": self.questions,
+                }).execute()
+                logger.info(f"Completed job {self.job_description_id} with {data[1]} new questions in one transaction.")
+                return True
+            except Exception as e:
+                if getattr(e, "code", None) != _FUNCTION_NOT_FOUND:
+                    logger.error(f"Supabase {COMPLETE_JOB_FUNCTION} for job {self.job_description_id} error: {e}")
+                    return False
+                JobCompletionUnitOfWork.rpc_available = False
+                logger.warning(
+                    f"Database function {COMPLETE_JOB_FUNCTION} not found; completing jobs with sequential writes.")
+
+        return self._commit_sequentially()
+
+    def _commit_sequentially(self) -> bool:
+        """
+        Makes the writes one by one and only marks the job completed if every one succeeded.
+        A failed run leaves the status unchanged, so the job is retried rather than completed
+        with missing questions.
+        """
+        job_desc_repo = JobDescriptionRepository(self.client)
+        question_repo = QuestionRepository(self.client)
+
+        if self.title is not None and job_desc_repo.update_title(self.job_description_id, self.title) is None:
+            logger.error(f"Could not store the title of job {self.job_description_id}; leaving it unfinished.")
+            return False
+        # Without a transaction an earlier failed run may have stored part of its questions
+        # while the job stayed 'created', so existing questions are always replaced here
+        if not question_repo.delete_by_job_description_id(self.job_description_id):
+            logger.error(f"Could not clear earlier questions of job {self.job_description_id}; leaving it unfinished.")
+            return False
+        if self.questions and len(question_repo.create_questions_batch(self.questions)) != len(self.questions):
+            logger.error(f"Could not store the questions of job {self.job_description_id}; leaving it unfinished.")
+            return False
+        return job_desc_repo.update_status(self.job_description_id, "completed") is not None
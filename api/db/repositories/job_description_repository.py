@@ -1,10 +1,19 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from .base_repository import BaseRepository
 
+# PostgREST cannot select a substring; description_preview is a generated column (supabase/migrations)
+JOB_SUMMARY_COLUMNS = ("id", "title", "status", "created_at", "description_preview")
+# Databases without the description_preview column (supabase/migrations) are listed with full descriptions
+_FALLBACK_SUMMARY_COLUMNS = ("id", "title", "status", "created_at", "description")
+_UNDEFINED_COLUMN = "42703"  # Postgres error code for an unknown column
+
 
 class JobDescriptionRepository(BaseRepository):
+    # Turned off for the whole process the first time the database reports the column missing
+    preview_column_available = True
+
     def __init__(self, db_client):
         super().__init__("job_descriptions", db_client)
 
@@ -31,12 +40,43 @@ class JobDescriptionRepository(BaseRepository):
                 self.logger.info(f"Created job description with ID: {data[1][0]['id']}. User ID: {user_id if user_id else 'Anonymous'}")
                 return data[1][0]
 
-            self.logger.warning(f"No data returned after inserting job description: {description}")
+            self.logger.warning(f"No data returned after inserting job description {description_id}")
             return None
 
         except Exception as e:
             return self._handle_supabase_error(e, "create")
 
+    def create_batch(self, descriptions: List[Tuple[UUID, str]], user_id: UUID) -> Optional[List[Dict[str, Any]]]:
+        """Create several job descriptions in one multi-row insert. Returns None unless all rows were created."""
+        if not self.client:
+            self.logger.error("Supabase client is not initialized. Cannot create job descriptions.")
+            return None
+
+        try:
+            payload = []
+            for description_id, description in descriptions:
+                row = {
+                    "id": str(description_id),
+                    "title": None,
+                    "description": description,
+                    "status": "created"
+                }
+                if user_id is not None:
+                    row["user_id"] = str(user_id)
+                payload.append(row)
+
+            data, count = self.client.table(self.table_name).insert(payload).execute()
+
+            if data and len(data[1]) == len(payload):
+                self.logger.info(f"Created {len(payload)} job descriptions. User ID: {user_id if user_id else 'Anonymous'}")
+                return data[1]
+
+            self.logger.warning(f"Expected {len(payload)} rows after batch insert of job descriptions, got {len(data[1]) if data else 0}")
+            return None
+
+        except Exception as e:
+            return self._handle_supabase_error(e, "create_batch")
+
     def get_by_id(self, job_description_id: UUID) -> Optional[Dict[str, Any]]:
         """Get a job description by its ID."""
         if not self.client:
@@ -51,7 +91,7 @@ class JobDescriptionRepository(BaseRepository):
             data, count = query.execute()
 
             if data and len(data[1]) > 0:
-                self.logger.info(f"Retrieved job description with ID: {job_description_id}")
+                self.sampled_logger.info(f"Retrieved job description with ID: {job_description_id}")
                 return data[1][0]
 
             self.logger.warning(f"No job description found with ID: {job_description_id}")
@@ -60,6 +100,29 @@ class JobDescriptionRepository(BaseRepository):
         except Exception as e:
             return self._handle_supabase_error(e, f"get_by_id ({job_description_id})")
 
+    def get_by_id_with_questions(self, job_description_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a job description and its questions (under the "questions" key) in a single query."""
+        if not self.client:
+            self.logger.error("Supabase client is not initialized. Cannot get job description.")
+            return None
+
+        try:
+            query = self.client.table(self.table_name)\
+                .select("*, questions(*)")\
+                .eq("id", str(job_description_id))
+
+            data, count = query.execute()
+
+            if data and len(data[1]) > 0:
+                self.sampled_logger.info(f"Retrieved job description with questions for ID: {job_description_id}")
+                return data[1][0]
+
+            self.logger.warning(f"No job description found with ID: {job_description_id}")
+            return None
+
+        except Exception as e:
+            return self._handle_supabase_error(e, f"get_by_id_with_questions ({job_description_id})")
+
     def update_status(self, job_description_id: UUID, new_status: str):
         """Update the status of a job description."""
         if not self.client:
@@ -83,6 +146,30 @@ class JobDescriptionRepository(BaseRepository):
         except Exception as e:
             return self._handle_supabase_error(e, f"update_status ({job_description_id})")
 
+    def fail_unfinished(self, job_description_ids: List[UUID]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Marks the given job descriptions failed unless they already reached a final status, in
+        one conditional update, so a job that completed meanwhile keeps its result.
+        Returns the rows that were marked failed.
+        """
+        if not self.client:
+            self.logger.error("Supabase client is not initialized. Cannot update job description status.")
+            return None
+
+        try:
+            data, count = self.client.table(self.table_name)\
+                .update({"status": "failed"})\
+                .in_("id", [str(job_description_id) for job_description_id in job_description_ids])\
+                .not_.in_("status", ["completed", "failed"])\
+                .execute()
+
+            records = data[1] if data and len(data) > 1 else []
+            self.logger.info(f"Marked {len(records)} of {len(job_description_ids)} unfinished job descriptions failed.")
+            return records
+
+        except Exception as e:
+            return self._handle_supabase_error(e, "fail_unfinished")
+
     def update_title(self, job_description_id: UUID, job_title: str):
         """Update the title of a job description."""
         if not self.client:
@@ -106,27 +193,44 @@ class JobDescriptionRepository(BaseRepository):
         except Exception as e:
             return self._handle_supabase_error(e, f"update_title ({job_description_id})")
     
-    def get_job_details(self) -> Optional[Dict[str, Any]]:
-        """Get all job descriptions for the authenticated user."""
+    def get_job_summaries(
+            self,
+            limit: int,
+            cursor_created_at: Optional[str] = None,
+            cursor_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a page of the authenticated user's job descriptions, newest first, limited to
+        the listing columns. Keyset-paginated on (created_at, id): pass the last row's
+        values as the cursor to get the next page.
+        """
         if not self.client:
             self.logger.error("Supabase client is not initialized. Cannot get job descriptions.")
             return None
 
+        columns = JOB_SUMMARY_COLUMNS if JobDescriptionRepository.preview_column_available \
+            else _FALLBACK_SUMMARY_COLUMNS
         try:
             query = self.client.table(self.table_name)\
-                .select("*")\
-                .order("created_at", desc=True)
+                .select(", ".join(columns))\
+                .order("created_at", desc=True)\
+                .order("id", desc=True)\
+                .limit(limit)
+
+            if cursor_created_at and cursor_id:
+                query = query.or_(
+                    f'created_at.lt."{cursor_created_at}",'
+                    f'and(created_at.eq."{cursor_created_at}",id.lt.{cursor_id})'
+                )
 
             data, count = query.execute()
 
             records = data[1] if data and len(data) > 1 else []
-            if records:
-                self.logger.info(f"Retrieved {len(records)} job descriptions.")
-                self.logger.debug(f"Job descriptions data: {records}")
-                return data
-
-            self.logger.warning("No job descriptions found.")
-            return None
+            self.sampled_logger.info(f"Retrieved {len(records)} job description summaries.")
+            return records
 
         except Exception as e:
-            return self._handle_supabase_error(e, "get_all")
+            if getattr(e, "code", None) == _UNDEFINED_COLUMN and columns is JOB_SUMMARY_COLUMNS:
+                JobDescriptionRepository.preview_column_available = False
+                self.logger.warning("Column description_preview not found; listing jobs with full descriptions.")
+                return self.get_job_summaries(limit, cursor_created_at, cursor_id)
+            return self._handle_supabase_error(e, "get_job_summaries")
@@ -46,7 +46,7 @@ class QuestionRepository(BaseRepository):
             data, count = payload.execute()
 
             if data and len(data[1]) > 0:
-                self.logger.info(f"Retrieved {len(data[1])} questions for job description ID: {job_description_id}")
+                self.sampled_logger.info(f"Retrieved {len(data[1])} questions for job description ID: {job_description_id}")
                 return data[1]
 
             self.logger.warning(f"No questions found for job description ID: {job_description_id}")
@@ -56,3 +56,22 @@ class QuestionRepository(BaseRepository):
             self.logger.error(f"Error retrieving questions for job description ID {job_description_id}: {str(e)}")
             self._handle_supabase_error(e, f"get_by_job_description_id ({job_description_id})")
             return []
+
+    def delete_by_job_description_id(self, job_description_id: UUID) -> bool:
+        """Deletes all questions for a given job_description_id."""
+        if not self.client:
+            self.logger.error("Supabase client not initialized. Cannot delete questions.")
+            return False
+
+        try:
+            self.client.table(self.table_name) \
+                .delete() \
+                .eq("job_description_id", str(job_description_id)) \
+                .execute()
+
+            self.logger.info(f"Deleted questions for job description ID: {job_description_id}")
+            return True
+
+        except Exception as e:
+            self._handle_supabase_error(e, f"delete_by_job_description_id ({job_description_id})")
+            return False
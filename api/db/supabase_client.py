@@ -1,26 +1,123 @@
 import os
-from uuid import UUID
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
 
+import jwt
 from flask import g
-from supabase import create_client, Client
-from dotenv import load_dotenv
-from api.utils.logger_config import logger
 
-load_dotenv()
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import timed
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("NEXT_PUBLIC_SUPABASE_ANON_KEY")
 
+USER_CLIENT_CACHE_SIZE = int(os.getenv("SUPABASE_USER_CLIENT_CACHE_SIZE", "256"))
+USER_CLIENT_TTL_SECONDS = int(os.getenv("SUPABASE_USER_CLIENT_TTL_SECONDS", "300"))
+
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
     logger.error("Supabase URL or Anon Key not found in environment variables.")
 
 
-def get_supabase_client(user_jwt: str = None, refresh_token: str = None) -> Client:
+class SupabaseClientRegistry:
+    """
+    Process-level registry of Supabase clients.
+    Holds one shared anonymous client and an LRU of user-scoped clients keyed by session,
+    each valid until the configured TTL or the access token's expiry, whichever comes first.
+    """
 
-    try:
-        supabase_client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-        logger.info("Supabase client created successfully.")
+    def __init__(self, max_user_clients: int = USER_CLIENT_CACHE_SIZE, ttl_seconds: int = USER_CLIENT_TTL_SECONDS):
+        self.max_user_clients = max_user_clients
+        self.ttl_seconds = ttl_seconds
+        self._anon_client: Optional["Client"] = None
+        self._user_clients: "OrderedDict[str, Tuple[Client, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_client(auto_refresh_token: bool = True, access_token: Optional[str] = None) -> "Client":
+        # Imported on first use: the Supabase SDK is a large share of cold-start import time
+        from supabase import ClientOptions
+        from api.db.pooled_client import PooledClient
+
+        options = ClientOptions(auto_refresh_token=auto_refresh_token)
+        if access_token:
+            # Database requests carry the token as is, without an auth session to refresh
+            options.headers["Authorization"] = f"Bearer {access_token}"
+        return PooledClient.create(SUPABASE_URL, SUPABASE_ANON_KEY, options)
+
+    @staticmethod
+    def _session_key(user_jwt: str, refresh_token: Optional[str]) -> str:
+        return hashlib.sha256(f"{user_jwt}:{refresh_token}".encode("utf-8")).hexdigest()
+
+    def _expires_at(self, user_jwt: str) -> float:
+        expires_at = time.time() + self.ttl_seconds
+        try:
+            claims = jwt.decode(user_jwt, options={"verify_signature": False})
+            if claims.get("exp"):
+                expires_at = min(expires_at, float(claims["exp"]))
+        except jwt.InvalidTokenError:
+            pass
+        return expires_at
+
+    def get_anon_client(self) -> "Client":
+        if self._anon_client is None:
+            with self._lock:
+                if self._anon_client is None:
+                    self._anon_client = self._create_client()
+                    logger.info("Shared anonymous Supabase client created successfully.")
+        return self._anon_client
+
+    def get_user_client(self, user_jwt: str, refresh_token: Optional[str]) -> "Client":
+        """
+        Client acting as the token's user. Without a refresh token (tokens minted for background
+        jobs) the access token is sent with each request instead of starting an auth session.
+        """
+        key = self._session_key(user_jwt, refresh_token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._user_clients.get(key)
+            if entry and entry[1] > now:
+                self._user_clients.move_to_end(key)
+                return entry[0]
+            self._user_clients.pop(key, None)
+
+        # Built outside the lock: set_session does a network round trip.
+        # Auto refresh is disabled because cached clients never outlive the access token.
+        if refresh_token:
+            supabase_client = self._create_client(auto_refresh_token=False)
+            supabase_client.auth.set_session(access_token=user_jwt, refresh_token=refresh_token)
+            logger.info("Supabase client authenticated with user JWT and refresh token.")
+        else:
+            supabase_client = self._create_client(auto_refresh_token=False, access_token=user_jwt)
+            logger.info("Supabase client authenticated with user JWT.")
+
+        with self._lock:
+            self._user_clients[key] = (supabase_client, self._expires_at(user_jwt))
+            self._user_clients.move_to_end(key)
+            while len(self._user_clients) > self.max_user_clients:
+                self._user_clients.popitem(last=False)
+
+        return supabase_client
+
+    def clear(self):
+        with self._lock:
+            self._anon_client = None
+            self._user_clients.clear()
+
+
+client_registry = SupabaseClientRegistry()
 
+
+@timed("supabase_client")
+def get_supabase_client(user_jwt: str = None, refresh_token: str = None) -> "Client":
+
+    try:
         try:
             if user_jwt is None:
                 user_jwt = g.get("user_jwt", None)
@@ -31,13 +128,11 @@ def get_supabase_client(user_jwt: str = None, refresh_token: str = None) -> Clie
         except RuntimeError:
             logger.warning("Flask g context not available. User JWT and refresh token will not be set.")
 
-        if user_jwt and refresh_token:
-            supabase_client.auth.set_session(access_token=user_jwt, refresh_token=refresh_token)
-            logger.info("Supabase client authenticated with user JWT and refresh token.")
-        else:
-            logger.info("No user JWT found. Supabase client created without authentication.")
+        if user_jwt:
+            return client_registry.get_user_client(user_jwt, refresh_token)
 
-        return supabase_client
+        sampled_logger.debug("No user JWT found. Using shared anonymous Supabase client.")
+        return client_registry.get_anon_client()
 
     except Exception as e:
         logger.error(f"Error creating Supabase client: {e}")
@@ -3,12 +3,19 @@ from flask import Flask
 from api.routes.analysis_routes import register_analysis_routes
 from api.routes.home_routes import register_home_routes
 from api.routes.job_routes import register_job_routes
+from api.routes.metrics_routes import register_metrics_routes
+from api.routes.speech_routes import register_speech_routes
+from api.services.job_service import start_background_workers
 
 app = Flask(__name__)
 
+register_metrics_routes(app)
 register_home_routes(app)
 register_analysis_routes(app)
 register_job_routes(app)
+register_speech_routes(app)
+
+start_background_workers()
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,104 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from api.utils.logger_config import logger
+
+# Jobs of one batch processed at the same time by the invocation that receives the batch
+JOB_BATCH_CONCURRENCY = int(os.getenv("JOB_BATCH_CONCURRENCY", "5"))
+
+# Scheduling classes, lower first: interactive before bulk, authenticated before anonymous
+JOB_PRIORITY_INTERACTIVE = 0
+JOB_PRIORITY_INTERACTIVE_ANONYMOUS = 1
+JOB_PRIORITY_BULK = 2
+JOB_PRIORITY_BULK_ANONYMOUS = 3
+
+JOB_PRIORITY_NAMES = {
+    JOB_PRIORITY_INTERACTIVE: "interactive",
+    JOB_PRIORITY_INTERACTIVE_ANONYMOUS: "interactive-anonymous",
+    JOB_PRIORITY_BULK: "bulk",
+    JOB_PRIORITY_BULK_ANONYMOUS: "bulk-anonymous",
+}
+
+
+def parse_job_priority(value, default: int) -> int:
+    """The scheduling class sent in a trigger payload, or `default` if it is missing or unknown."""
+    if isinstance(value, int) and not isinstance(value, bool) and value in JOB_PRIORITY_NAMES:
+        return value
+    return default
+
+
+# All anonymous jobs share one fair-queueing flow, so a scraper competes as a single user
+ANONYMOUS_USER_KEY = "anonymous"
+
+
+def job_priority(bulk: bool, user_id: Optional[UUID]) -> int:
+    if bulk:
+        return JOB_PRIORITY_BULK if user_id else JOB_PRIORITY_BULK_ANONYMOUS
+    return JOB_PRIORITY_INTERACTIVE if user_id else JOB_PRIORITY_INTERACTIVE_ANONYMOUS
+
+
+@dataclass
+class QueuedJob:
+    # Backends that persist jobs leave the tokens empty; the handler acts as `user_key` instead
+    id: int
+    job_description_id: str
+    user_jwt: Optional[str]
+    refresh_token: Optional[str]
+    attempts: int
+    max_attempts: int
+    enqueued_at: float = 0.0
+    user_key: str = ANONYMOUS_USER_KEY
+    priority: int = JOB_PRIORITY_INTERACTIVE
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+
+# A handler processes one job and returns True on success, False if it should be retried.
+JobHandler = Callable[[QueuedJob], bool]
+
+
+class BaseJobQueue:
+    def __init__(self, name: str):
+        self.name = name
+        self.logger = logger
+
+    def enqueue(self,
+                job_description_id: UUID,
+                user_jwt: Optional[str],
+                refresh_token: Optional[str],
+                user_id: Optional[UUID] = None,
+                priority: int = JOB_PRIORITY_INTERACTIVE) -> bool:
+        """
+        Schedule a job description for background processing. Queues that order their jobs serve
+        lower `priority` classes first and share each class fairly among users (`user_id`).
+        """
+        raise NotImplementedError
+
+    def enqueue_batch(self,
+                      job_description_ids: List[UUID],
+                      user_jwt: Optional[str],
+                      refresh_token: Optional[str],
+                      user_id: Optional[UUID] = None,
+                      priority: int = JOB_PRIORITY_BULK) -> bool:
+        """Schedule several job descriptions at once. Backends override this to avoid per-job overhead."""
+        return all([self.enqueue(job_description_id, user_jwt, refresh_token, user_id, priority)
+                    for job_description_id in job_description_ids])
+
+    def extend_lease(self, job: QueuedJob) -> bool:
+        """Keeps a running job leased to its worker. No-op for queues without leases."""
+        return True
+
+    def start(self, handler: JobHandler):
+        """Start consuming jobs with the given handler. No-op for queues processed elsewhere."""
+        pass
+
+    def stop(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and age, for the metrics endpoint. Empty for queues processed elsewhere."""
+        return {}
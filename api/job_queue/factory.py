@@ -0,0 +1,30 @@
+import os
+
+from api.utils.logger_config import logger
+
+from .base_queue import BaseJobQueue
+
+
+def get_job_queue_backend() -> str:
+    """
+    Selects the backend from JOB_QUEUE_BACKEND. Defaults to the HTTP trigger on Vercel,
+    where no process outlives the request, and to the durable local queue elsewhere.
+    """
+    default_backend = "http" if os.getenv("VERCEL_URL") else "sqlite"
+    return os.getenv("JOB_QUEUE_BACKEND", default_backend).lower()
+
+
+def create_job_queue() -> BaseJobQueue:
+    backend = get_job_queue_backend()
+
+    if backend == "sqlite":
+        from .sqlite_queue import SQLiteJobQueue
+        job_queue = SQLiteJobQueue()
+    elif backend == "http":
+        from .http_trigger_queue import HttpTriggerJobQueue
+        job_queue = HttpTriggerJobQueue()
+    else:
+        raise ValueError(f"Unknown job queue backend: {backend}")
+
+    logger.info(f"Using '{job_queue.name}' job queue backend.")
+    return job_queue
@@ -0,0 +1,162 @@
+import os
+import math
+import time
+import threading
+import requests
+
+from typing import List, Optional
+from uuid import UUID
+
+from api.db.supabase_client import get_supabase_client
+from api.db.repositories.job_description_repository import JobDescriptionRepository
+from api.utils.http_pool import get_http_session
+
+from .base_queue import JOB_BATCH_CONCURRENCY, JOB_PRIORITY_BULK, JOB_PRIORITY_INTERACTIVE, BaseJobQueue
+
+# Longest a processing invocation may run (the function's maxDuration on Vercel)
+JOB_TRIGGER_MAX_DURATION_SECONDS = float(os.getenv("JOB_TRIGGER_MAX_DURATION_SECONDS", "60"))
+# Expected time of one job, LLM retries included; sizes the batches handed to one invocation
+JOB_TRIGGER_SECONDS_PER_JOB = float(os.getenv("JOB_TRIGGER_SECONDS_PER_JOB", "60"))
+
+
+def trigger_chunk_size() -> int:
+    """Jobs one invocation can finish within its time limit, JOB_BATCH_CONCURRENCY at a time."""
+    waves = max(1, math.floor(JOB_TRIGGER_MAX_DURATION_SECONDS / JOB_TRIGGER_SECONDS_PER_JOB))
+    return JOB_BATCH_CONCURRENCY * waves
+
+
+class HttpTriggerJobQueue(BaseJobQueue):
+    """
+    Serverless backend: each job is handed to the /api/internal/process-job-background
+    endpoint over HTTP, so it runs in its own function invocation. Jobs are not queued, so
+    classes are kept apart differently than in the local queue: single jobs are triggered at
+    once, while a bulk batch is processed one chunk at a time, each invocation triggering the
+    next chunk when its own is done. A batch therefore never runs more than JOB_BATCH_CONCURRENCY
+    jobs at once, however large it is, and leaves capacity to other users. Within each
+    invocation the jobs' OpenAI calls are scheduled by class. `user_id` is not used.
+    """
+
+    def __init__(self):
+        super().__init__("http")
+
+    def enqueue(self,
+                job_description_id: UUID,
+                user_jwt: Optional[str],
+                refresh_token: Optional[str],
+                user_id: Optional[UUID] = None,
+                priority: int = JOB_PRIORITY_INTERACTIVE) -> bool:
+        self._start_trigger([job_description_id], user_jwt, refresh_token, priority)
+        self.logger.info(f"Background trigger thread started for job ID: {job_description_id}.")
+        return True
+
+    def enqueue_batch(self,
+                      job_description_ids: List[UUID],
+                      user_jwt: Optional[str],
+                      refresh_token: Optional[str],
+                      user_id: Optional[UUID] = None,
+                      priority: int = JOB_PRIORITY_BULK) -> bool:
+        """
+        Splits the batch into chunks that each finish within the function's time limit. Bulk
+        batches send only the first chunk, carrying the rest for the receiving invocation to
+        pass on; other batches send every chunk at once.
+        """
+        chunk_size = trigger_chunk_size()
+        if priority >= JOB_PRIORITY_BULK:
+            self._start_trigger(job_description_ids[:chunk_size], user_jwt, refresh_token, priority,
+                                remaining_ids=job_description_ids[chunk_size:])
+        else:
+            for start in range(0, len(job_description_ids), chunk_size):
+                self._start_trigger(job_description_ids[start:start + chunk_size], user_jwt, refresh_token, priority)
+        self.logger.info(
+            f"Background trigger started for a batch of {len(job_description_ids)} jobs in chunks of {chunk_size}.")
+        return True
+
+    def _start_trigger(self,
+                       job_description_ids: List[UUID],
+                       user_jwt: Optional[str],
+                       refresh_token: Optional[str],
+                       priority: int,
+                       remaining_ids: Optional[List[UUID]] = None):
+        trigger_thread = threading.Thread(
+            target=self.trigger_background_job_processing,
+            args=(job_description_ids, user_jwt, refresh_token, priority, remaining_ids or []),
+        )
+        trigger_thread.daemon = True  # Allows main program to exit even if thread is running
+        trigger_thread.start()
+
+        # Give the trigger a head start before the serverless function is frozen
+        time.sleep(0.1)
+
+    def trigger_background_job_processing(
+            self,
+            job_description_ids: List[UUID],
+            user_jwt: Optional[str],
+            refresh_token: Optional[str],
+            priority: int = JOB_PRIORITY_INTERACTIVE,
+            remaining_ids: Optional[List[UUID]] = None):
+        """
+        Makes an asynchronous HTTP POST request to the background processing endpoint.
+        `remaining_ids` are the rest of a bulk batch, triggered by the receiving invocation.
+        """
+        remaining_ids = remaining_ids or []
+
+        supabase_client = get_supabase_client(user_jwt=user_jwt, refresh_token=refresh_token)
+        job_desc_repo = JobDescriptionRepository(supabase_client)
+
+        base_url = f"https://{os.getenv('VERCEL_URL')}" if os.getenv("VERCEL_URL") else "http://localhost:3000"
+
+        if not base_url:
+            raise RuntimeError("Cannot determine application base URL for internal trigger.")
+        process_url = f"{base_url.rstrip('/')}/api/internal/process-job-background"
+
+        if len(job_description_ids) == 1 and not remaining_ids:
+            payload = {"job_description_id": str(job_description_ids[0]), "priority": priority}
+        else:
+            payload = {
+                "job_description_ids": [str(job_description_id) for job_description_id in job_description_ids],
+                "next_job_description_ids": [str(job_description_id) for job_description_id in remaining_ids],
+                "priority": priority,
+            }
+        job_label = ", ".join(str(job_description_id) for job_description_id in job_description_ids)
+
+        def mark_failed():
+            # The invocation may have finished some jobs before the trigger gave up; those keep their status.
+            # The rest of the batch is failed too: nothing will trigger it any more
+            job_desc_repo.fail_unfinished(job_description_ids + remaining_ids)
+
+        self.logger.info(f"THREAD/TRIGGER (requests): Attempting for job ID(s): {job_label} to URL: {process_url}")
+
+        try:
+            headers = {}
+
+            # Add access token and refresh token in headers if provided
+            if user_jwt:
+                headers["Authorization"] = f"Bearer {user_jwt}"
+            if refresh_token:
+                headers["Refresh-Token"] = refresh_token
+
+            response = get_http_session().post(
+                process_url,
+                json=payload,
+                # The response arrives once the whole chunk is processed, which the platform cuts off
+                # after its time limit; a little slack covers the round trip
+                timeout=JOB_TRIGGER_MAX_DURATION_SECONDS + 5,
+                headers=headers,
+            )
+
+            if 200 <= response.status_code < 300:
+                self.logger.info(f"THREAD/TRIGGER (requests): Successfully triggered. Status: {response.status_code}")
+            else:
+                self.logger.error(
+                    f"THREAD/TRIGGER (requests): Failed. HTTP Status: {response.status_code}, Response: {response.text}")
+                mark_failed()
+
+        except requests.exceptions.Timeout:
+            self.logger.error(f"THREAD/TRIGGER (requests): Timeout for job(s) {job_label} at {process_url}")
+            mark_failed()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"THREAD/TRIGGER (requests): Request error for job(s) {job_label}: {e}")
+            mark_failed()
+        except Exception as e:
+            self.logger.error(f"THREAD/TRIGGER (requests): Unexpected error for job(s) {job_label}: {e}", exc_info=True)
+            mark_failed()
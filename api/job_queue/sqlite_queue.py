@@ -0,0 +1,371 @@
+import os
+import math
+import time
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from api.utils.logger_config import logger
+
+from .base_queue import (
+    ANONYMOUS_USER_KEY,
+    JOB_PRIORITY_BULK,
+    JOB_PRIORITY_INTERACTIVE,
+    JOB_PRIORITY_NAMES,
+    BaseJobQueue,
+    JobHandler,
+    QueuedJob,
+)
+from .worker_pool import JobWorkerPool
+
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "job_queue.db")
+JOB_QUEUE_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "4"))
+JOB_QUEUE_MAX_ATTEMPTS = int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", "3"))
+JOB_QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("JOB_QUEUE_VISIBILITY_TIMEOUT", "180"))
+JOB_QUEUE_BACKOFF_BASE = float(os.getenv("JOB_QUEUE_BACKOFF_BASE", "2"))
+JOB_QUEUE_BACKOFF_MAX = float(os.getenv("JOB_QUEUE_BACKOFF_MAX", "60"))
+# Dead jobs are kept this long for inspection, then deleted
+JOB_QUEUE_DEAD_RETENTION_SECONDS = float(os.getenv("JOB_QUEUE_DEAD_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+
+def _parse_user_weights(value: str) -> Dict[str, float]:
+    """Parses "user_id=weight,..."; entries without a positive, finite weight are logged and ignored."""
+    weights = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        user_key, _, weight = item.partition("=")
+        try:
+            parsed_weight = float(weight)
+        except ValueError:
+            parsed_weight = None
+        if not user_key.strip() or parsed_weight is None or not 0 < parsed_weight < math.inf:
+            logger.warning(f"Ignoring JOB_QUEUE_USER_WEIGHTS entry '{item.strip()}': expected user_id=weight with weight > 0")
+            continue
+        weights[user_key.strip()] = parsed_weight
+    return weights
+
+
+# "user_id=weight,..."; users not listed (and the anonymous flow) have weight 1
+JOB_QUEUE_USER_WEIGHTS = _parse_user_weights(os.getenv("JOB_QUEUE_USER_WEIGHTS", ""))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_description_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fair_queue_flows (
+    priority INTEGER NOT NULL,
+    user_key TEXT NOT NULL,
+    last_finish REAL NOT NULL,
+    PRIMARY KEY (priority, user_key)
+);
+CREATE TABLE IF NOT EXISTS fair_queue_clock (
+    priority INTEGER PRIMARY KEY,
+    virtual_time REAL NOT NULL
+);
+"""
+
+# Columns added after the first release; queue files created before are migrated on open
+_ADDED_COLUMNS = (
+    ("user_key", f"TEXT NOT NULL DEFAULT '{ANONYMOUS_USER_KEY}'"),
+    ("priority", "INTEGER NOT NULL DEFAULT 0"),
+    ("virtual_start", "REAL NOT NULL DEFAULT 0"),
+    ("finished_at", "REAL"),
+)
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_available ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_schedule ON jobs (status, priority, virtual_start, id);
+"""
+
+_INSERT_JOB = (
+    "INSERT INTO jobs (job_description_id, max_attempts, available_at, created_at, user_key, priority, virtual_start) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteJobQueue(BaseJobQueue):
+    """
+    Durable local backend. Jobs are persisted in a SQLite file and consumed by a bounded
+    worker pool. A claimed job is leased for `visibility_timeout` seconds and the lease is
+    renewed while the job runs; if the worker dies, the job becomes visible again once the
+    lease runs out. Failed jobs are retried with exponential backoff until `max_attempts` is
+    reached, and dead jobs are deleted after JOB_QUEUE_DEAD_RETENTION_SECONDS.
+
+    Only the user id of a job is stored, never the user's tokens: the handler gets fresh
+    credentials for the user when it runs the job.
+
+    Jobs are claimed by priority class first. Within a class, users share the workers by
+    start-time fair queueing: each job is tagged with a virtual start time that advances by
+    1/weight per job of the same user, and the smallest tag is claimed next. A user with a
+    hundred queued jobs therefore delays another user's next job by at most one job.
+    """
+
+    def __init__(self,
+                 path: str = JOB_QUEUE_PATH,
+                 max_workers: int = JOB_QUEUE_WORKERS,
+                 max_attempts: int = JOB_QUEUE_MAX_ATTEMPTS,
+                 visibility_timeout: float = JOB_QUEUE_VISIBILITY_TIMEOUT,
+                 backoff_base: float = JOB_QUEUE_BACKOFF_BASE,
+                 backoff_max: float = JOB_QUEUE_BACKOFF_MAX,
+                 user_weights: Optional[Dict[str, float]] = None):
+        super().__init__("sqlite")
+        self.path = path
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.user_weights = JOB_QUEUE_USER_WEIGHTS if user_weights is None else user_weights
+        self._worker_pool: Optional[JobWorkerPool] = None
+        self._start_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, definition in _ADDED_COLUMNS:
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+            if "finished_at" not in columns:
+                # Dead jobs of earlier releases have no time of death; their retention starts now
+                conn.execute("UPDATE jobs SET finished_at = ? WHERE status = 'dead'", (time.time(),))
+            if "user_jwt" in columns:
+                # Queue files of earlier releases stored the user's tokens; they are not read any more
+                conn.execute("UPDATE jobs SET user_jwt = NULL, refresh_token = NULL "
+                             "WHERE user_jwt IS NOT NULL OR refresh_token IS NOT NULL")
+            conn.executescript(_INDEXES)
+            self._prune_dead(conn)
+
+    def _prune_dead(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM jobs WHERE status = 'dead' AND finished_at <= ?",
+                     (time.time() - JOB_QUEUE_DEAD_RETENTION_SECONDS,))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _insert_jobs(self, job_description_ids: List[UUID], user_id: Optional[UUID], priority: int):
+        """Inserts the jobs of one user in one transaction, tagging each with its virtual start time."""
+        now = time.time()
+        user_key = str(user_id) if user_id else ANONYMOUS_USER_KEY
+        cost = 1.0 / self.user_weights.get(user_key, 1.0)
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                clock = conn.execute(
+                    "SELECT virtual_time FROM fair_queue_clock WHERE priority = ?", (priority,)).fetchone()
+                flow = conn.execute(
+                    "SELECT last_finish FROM fair_queue_flows WHERE priority = ? AND user_key = ?",
+                    (priority, user_key)
+                ).fetchone()
+                # A user who has been idle starts at the class's current virtual time, not behind it
+                virtual_start = max(clock[0] if clock else 0.0, flow[0] if flow else 0.0)
+
+                rows = []
+                for job_description_id in job_description_ids:
+                    rows.append((str(job_description_id), self.max_attempts, now, now, user_key, priority, virtual_start))
+                    virtual_start += cost
+
+                conn.executemany(_INSERT_JOB, rows)
+                conn.execute(
+                    "INSERT INTO fair_queue_flows (priority, user_key, last_finish) VALUES (?, ?, ?) "
+                    "ON CONFLICT (priority, user_key) DO UPDATE SET last_finish = excluded.last_finish",
+                    (priority, user_key, virtual_start)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self,
+                job_description_id: UUID,
+                user_jwt: Optional[str],
+                refresh_token: Optional[str],
+                user_id: Optional[UUID] = None,
+                priority: int = JOB_PRIORITY_INTERACTIVE) -> bool:
+        try:
+            self._insert_jobs([job_description_id], user_id, priority)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to enqueue job {job_description_id}: {e}")
+            return False
+
+        self.logger.info(f"Enqueued job {job_description_id} ({JOB_PRIORITY_NAMES.get(priority)}) in local job queue.")
+        if self._worker_pool:
+            self._worker_pool.notify()
+        return True
+
+    def enqueue_batch(self,
+                      job_description_ids: List[UUID],
+                      user_jwt: Optional[str],
+                      refresh_token: Optional[str],
+                      user_id: Optional[UUID] = None,
+                      priority: int = JOB_PRIORITY_BULK) -> bool:
+        """Inserts all jobs in one transaction and wakes the workers once."""
+        try:
+            self._insert_jobs(job_description_ids, user_id, priority)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to enqueue batch of {len(job_description_ids)} jobs: {e}")
+            return False
+
+        self.logger.info(
+            f"Enqueued batch of {len(job_description_ids)} jobs ({JOB_PRIORITY_NAMES.get(priority)}) in local job queue.")
+        if self._worker_pool:
+            self._worker_pool.notify()
+        return True
+
+    def claim(self) -> Optional[QueuedJob]:
+        """Lease the next available job, including jobs whose previous lease expired."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) "
+                    "   OR (status = 'running' AND locked_until <= ?) "
+                    "ORDER BY priority, virtual_start, id LIMIT 1",
+                    (now, now)
+                ).fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, locked_until = ? WHERE id = ?",
+                    (now + self.visibility_timeout, row["id"])
+                )
+                # The class's virtual time follows the jobs being served; flows behind it carry no state
+                conn.execute(
+                    "INSERT INTO fair_queue_clock (priority, virtual_time) VALUES (?, ?) "
+                    "ON CONFLICT (priority) DO UPDATE SET virtual_time = MAX(virtual_time, excluded.virtual_time)",
+                    (row["priority"], row["virtual_start"])
+                )
+                conn.execute(
+                    "DELETE FROM fair_queue_flows WHERE priority = ? AND last_finish <= "
+                    "(SELECT virtual_time FROM fair_queue_clock WHERE priority = ?)",
+                    (row["priority"], row["priority"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return QueuedJob(
+            id=row["id"],
+            job_description_id=row["job_description_id"],
+            user_jwt=None,
+            refresh_token=None,
+            attempts=row["attempts"] + 1,
+            max_attempts=row["max_attempts"],
+            enqueued_at=row["created_at"],
+            user_key=row["user_key"],
+            priority=row["priority"],
+        )
+
+    def extend_lease(self, job: QueuedJob) -> bool:
+        """Pushes back the lease of a running job; False if the job was re-claimed or finished meanwhile."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET locked_until = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                (time.time() + self.visibility_timeout, job.id, job.attempts)
+            )
+            return cursor.rowcount == 1
+
+    def ack(self, job: QueuedJob):
+        """Deletes a finished job, unless its lease expired and another worker has claimed it since."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE id = ? AND status = 'running' AND attempts = ?", (job.id, job.attempts))
+            if cursor.rowcount == 0:
+                self.logger.warning(f"Job {job.job_description_id} was re-claimed before attempt {job.attempts} finished.")
+
+    def fail(self, job: QueuedJob, error: str):
+        """
+        Schedule a retry with exponential backoff, or mark the job dead after its last attempt.
+        Like `ack`, does nothing if the job was re-claimed after this attempt's lease expired.
+        """
+        with self._connect() as conn:
+            if job.is_last_attempt:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'dead', locked_until = NULL, last_error = ?, finished_at = ? "
+                    "WHERE id = ? AND status = 'running' AND attempts = ?",
+                    (error, time.time(), job.id, job.attempts)
+                )
+                if cursor.rowcount == 0:
+                    self.logger.warning(
+                        f"Job {job.job_description_id} was re-claimed before attempt {job.attempts} failed.")
+                    return
+                self._prune_dead(conn)
+                self.logger.error(f"Job {job.job_description_id} failed after {job.attempts} attempts: {error}")
+                return
+
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (job.attempts - 1)))
+            delay *= random.uniform(0.8, 1.2)
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', locked_until = NULL, available_at = ?, last_error = ? "
+                "WHERE id = ? AND status = 'running' AND attempts = ?",
+                (time.time() + delay, error, job.id, job.attempts)
+            )
+            if cursor.rowcount == 0:
+                self.logger.warning(f"Job {job.job_description_id} was re-claimed before attempt {job.attempts} failed.")
+                return
+            self.logger.warning(
+                f"Job {job.job_description_id} attempt {job.attempts} failed, retrying in {delay:.1f}s: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            class_rows = conn.execute(
+                "SELECT priority, COUNT(*), COUNT(DISTINCT user_key), MIN(created_at) FROM jobs "
+                "WHERE status = 'queued' GROUP BY priority"
+            ).fetchall()
+
+        classes = {
+            JOB_PRIORITY_NAMES.get(priority, str(priority)): {
+                "queued": queued,
+                "users": users,
+                "oldest_queued_age_seconds": now - class_oldest,
+            }
+            for priority, queued, users, class_oldest in class_rows
+        }
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "dead": counts.get("dead", 0),
+            "oldest_queued_age_seconds": now - oldest if oldest else 0.0,
+            "classes": classes,
+        }
+
+    def start(self, handler: JobHandler):
+        with self._start_lock:
+            if self._worker_pool is None:
+                self._worker_pool = JobWorkerPool(self, handler, max_workers=self.max_workers,
+                                                  lease_renew_interval=self.visibility_timeout / 3)
+                self._worker_pool.start()
+
+    def stop(self):
+        with self._start_lock:
+            if self._worker_pool:
+                self._worker_pool.stop()
+                self._worker_pool = None
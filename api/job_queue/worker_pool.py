@@ -0,0 +1,112 @@
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+
+from api.utils.logger_config import logger
+from api.utils.metrics import metrics
+
+from .base_queue import JOB_PRIORITY_NAMES, JobHandler, QueuedJob
+
+JOB_QUEUE_POLL_INTERVAL = float(os.getenv("JOB_QUEUE_POLL_INTERVAL", "1.0"))
+
+job_queue_age = metrics.histogram(
+    "hiremeplease_job_queue_age_seconds", "Time from enqueue until a worker claimed the job, per attempt and class.",
+    ["priority"])
+
+
+class JobWorkerPool:
+    """
+    Bounded pool of daemon threads that claim jobs from a queue, run the handler and
+    acknowledge or fail each job. Idle workers sleep until notified or the poll interval elapses.
+    With a `lease_renew_interval`, one more thread renews the leases of running jobs, so a job
+    that runs longer than the queue's visibility timeout is not handed to a second worker.
+    """
+
+    def __init__(self,
+                 queue,
+                 handler: JobHandler,
+                 max_workers: int,
+                 poll_interval: float = JOB_QUEUE_POLL_INTERVAL,
+                 lease_renew_interval: Optional[float] = None):
+        self.queue = queue
+        self.handler = handler
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.lease_renew_interval = lease_renew_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running_jobs: Dict[int, QueuedJob] = {}
+        self._running_lock = threading.Lock()
+
+    def start(self):
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._run, name=f"job-worker-{i}")
+            worker.daemon = True
+            worker.start()
+            self._threads.append(worker)
+        if self.lease_renew_interval:
+            renewer = threading.Thread(target=self._renew_leases, name="job-lease-renewer")
+            renewer.daemon = True
+            renewer.start()
+            self._threads.append(renewer)
+        logger.info(f"Started {self.max_workers} job workers.")
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wakeup.set()
+        for worker in self._threads:
+            worker.join(timeout)
+        self._threads.clear()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _renew_leases(self):
+        while not self._stopping.wait(self.lease_renew_interval):
+            with self._running_lock:
+                running_jobs = list(self._running_jobs.values())
+            for job in running_jobs:
+                try:
+                    if not self.queue.extend_lease(job):
+                        logger.warning(f"Lease of job {job.job_description_id} was lost while it was running.")
+                except Exception as e:
+                    logger.error(f"Failed to renew the lease of job {job.job_description_id}: {e}")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim()
+            except Exception as e:
+                logger.error(f"Job worker failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            if job.enqueued_at:
+                job_queue_age.observe(time.time() - job.enqueued_at,
+                                      priority=JOB_PRIORITY_NAMES.get(job.priority, str(job.priority)))
+
+            with self._running_lock:
+                self._running_jobs[job.id] = job
+            try:
+                succeeded = self.handler(job)
+                error = None if succeeded else "Handler reported failure"
+            except Exception as e:
+                succeeded = False
+                error = str(e)
+            finally:
+                with self._running_lock:
+                    self._running_jobs.pop(job.id, None)
+
+            try:
+                if succeeded:
+                    self.queue.ack(job)
+                else:
+                    self.queue.fail(job, error)
+            except Exception as e:
+                logger.error(f"Job worker failed to update job {job.job_description_id}: {e}")
@@ -39,12 +39,22 @@ class TaggedPhrase(BaseModel):
     comment: str
 
 
-# Main feedback model with alias for JSON keys
-class Feedback(BaseModel):
+# Overall part of the feedback, with alias for JSON keys
+class OverallFeedback(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
     summary_of_strengths: str = Field(alias="Summary of Strengths")
     areas_for_improvement: str = Field(alias="Areas for Improvement")
     specific_suggestions: List[str] = Field(alias="Specific Suggestions")
     practice_exercises: List[str] = Field(alias="Practice Exercises")
     encouragement: str = Field(alias="Encouragement")
+
+
+# Main feedback model
+class Feedback(OverallFeedback):
     tagged_answer: List[TaggedPhrase] = Field(alias="tagged_answer")
+
+
+# Analysis of one transcript segment of a live answer
+class SegmentAnalysis(BaseModel):
+    tagged_answer: List[TaggedPhrase]
+    notes: str
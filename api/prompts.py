@@ -1,3 +1,11 @@
+QUESTION_GENERATION_MODEL = "gpt-4o-mini"
+ANSWER_ANALYSIS_MODEL = "gpt-4o-mini"
+
+# Bump when a prompt changes so cached LLM results produced by the old prompt are not reused.
+question_generation_prompt_version = "1"
+answer_analysis_prompt_version = "1"
+answer_session_prompt_version = "1"
+
 question_generation_prompt = {
         "role": "system",
         "content": """You are a highly skilled interview assistant. Your task is to analyze a job description and generate 5 behavioral questions and 5 technical questions (if applicable) tailored to help the user prepare effectively. Ensure the questions are diverse, relevant to the role, and encourage deep reflection or domain-specific thinking. Include examples where needed.
@@ -49,4 +57,36 @@ answer_analysis_prompt = {
         - Tailor your feedback to help the user demonstrate their expertise, problem-solving abilities, and alignment with the job requirements.
 
         Output only the JSON object without any additional text."""
-    }
\ No newline at end of file
+    }
+
+segment_analysis_prompt = {
+        "role": "system",
+
+        "content": """You are an interview coach. The user is answering an interview question aloud and you receive one segment of the live transcript at a time. Analyze only the given segment:
+
+        1. **Tagging**:
+        - Tag phrases in the segment where meaningful improvement or reinforcement is needed, using the types 'must-say', 'good', 'unnecessary' and 'should-be-avoided'.
+        - Each 'phrase' must be copied verbatim from the segment. Do not tag every phrase.
+        - For each tagged phrase, provide a constructive, actionable 'comment' tailored to the interview question.
+
+        2. **Notes**:
+        - In 'notes', write at most two sentences on what the segment conveys and how well it answers the question. The notes of all segments are later combined into the overall feedback, so mention concrete strengths and gaps.
+
+        Output only the JSON object without any additional text."""
+    }
+
+session_feedback_prompt = {
+        "role": "system",
+
+        "content": """You are an interview coach with expertise in helping candidates excel in their interviews. The user answered an interview question aloud. Instead of the full transcript you receive the coach's notes on each segment of the answer, in order, and the phrases that were tagged so far. Segments that have not been analyzed yet, usually the last one, are given as their transcript instead of notes. Write the overall feedback for the whole answer:
+
+            - 'Summary of Strengths': a string summarizing the strengths in the user's response.
+            - 'Areas for Improvement': a string identifying areas where the user can improve.
+            - 'Specific Suggestions': a list of strings providing actionable suggestions for improvement.
+            - 'Practice Exercises': a list of strings suggesting exercises or practice opportunities.
+            - 'Encouragement': a string offering encouraging remarks.
+
+        Consider the answer as a whole: its structure, whether it answers the question, and what the interviewer is likely evaluating.
+
+        Output only the JSON object without any additional text."""
+    }
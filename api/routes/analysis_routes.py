@@ -1,24 +1,150 @@
-from flask import request, jsonify
-from api.services.analysis_service import perform_answer_analysis
+import json
+
+from flask import request, jsonify, g, Response, stream_with_context
+from api.services.analysis_service import (
+    ANALYSIS_BATCH_CONCURRENCY,
+    perform_answer_analysis,
+    perform_batch_answer_analysis,
+    iter_batch_answer_analysis,
+    validate_batch,
+)
+from api.services.analysis_session import (
+    ANALYSIS_SESSIONS_ENABLED,
+    start_analysis_session,
+    push_session_segment,
+    finish_analysis_session,
+    end_analysis_session,
+)
+from api.utils.admission import (
+    ANSWER_ANALYSIS_POLICY,
+    SEGMENT_ANALYSIS_POLICY,
+    SESSION_START_POLICY,
+    admission_control,
+    body_items_cost,
+    client_identity,
+)
 from api.utils.logger_config import logger
 
 
+def _sessions_unavailable():
+    return jsonify({"error": "Analysis sessions are not available on this deployment"}), 501
+
+
+def _session_owner() -> str:
+    """The caller's identity; a session only answers to the identity that started it."""
+    return client_identity(request.headers, request.remote_addr, g.get("user_id"))
+
+
 def register_analysis_routes(app):
     logger.debug("Registering analysis routes")
 
     @app.route('/api/analyses', methods=['POST'])
+    @admission_control(ANSWER_ANALYSIS_POLICY)
     def analyze_answer():
         try:
             data = request.json
             answer_text = data.get("answer_text")
+            question = data.get("question")
 
-            analysis_result = perform_answer_analysis(answer_text)
+            analysis_result = perform_answer_analysis(answer_text, question)
             return jsonify({"analysis": analysis_result}), 200
 
         except ValueError as ve:
-            logger.warning("Validation error analyzing answer: {str(ve)}")
+            logger.warning(f"Validation error analyzing answer: {str(ve)}")
             return jsonify({"error": str(ve)}), 400
 
         except Exception as e:
             logger.error(f"Error analyzing answer: {str(e)}")
             return jsonify({"error": "Internal server error during analysis"}), 500
+
+    @app.route('/api/analyses/batch', methods=['POST'])
+    @admission_control(ANSWER_ANALYSIS_POLICY, cost=body_items_cost("items"),
+                       slots=body_items_cost("items", ANALYSIS_BATCH_CONCURRENCY))
+    def analyze_answers_batch():
+        try:
+            data = request.json
+            items = validate_batch(data.get("items"))
+
+            if data.get("stream"):
+                # One JSON result per line, in completion order
+                def ndjson():
+                    for result in iter_batch_answer_analysis(items):
+                        yield json.dumps(result) + "\n"
+
+                return Response(stream_with_context(ndjson()), mimetype="application/x-ndjson")
+
+            return jsonify({"results": perform_batch_answer_analysis(items)}), 200
+
+        except ValueError as ve:
+            logger.warning(f"Validation error analyzing answers batch: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
+
+        except Exception as e:
+            logger.error(f"Error analyzing answers batch: {str(e)}")
+            return jsonify({"error": "Internal server error during batch analysis"}), 500
+
+    @app.route('/api/analyses/sessions', methods=['POST'])
+    @admission_control(SESSION_START_POLICY)
+    def start_analysis_session_route():
+        if not ANALYSIS_SESSIONS_ENABLED:
+            return _sessions_unavailable()
+        try:
+            data = request.get_json(silent=True) or {}
+            session = start_analysis_session(data.get("question"), _session_owner())
+            return jsonify({"sessionId": session.session_id}), 201
+
+        except ValueError as ve:
+            logger.warning(f"Validation error starting analysis session: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
+
+        except Exception as e:
+            logger.error(f"Error starting analysis session: {str(e)}")
+            return jsonify({"error": "Internal server error starting analysis session"}), 500
+
+    @app.route('/api/analyses/sessions/<session_id>/segments', methods=['POST'])
+    @admission_control(SEGMENT_ANALYSIS_POLICY)
+    def push_session_segment_route(session_id):
+        """Body: {"index": n, "text": "..."}; re-sending an index replaces that segment."""
+        if not ANALYSIS_SESSIONS_ENABLED:
+            return _sessions_unavailable()
+        try:
+            data = request.json
+            changed = push_session_segment(session_id, _session_owner(), data.get("index"), data.get("text"))
+            if changed is None:
+                return jsonify({"error": "Analysis session not found"}), 404
+            return jsonify({"changed": changed}), 202
+
+        except ValueError as ve:
+            logger.warning(f"Validation error pushing transcript segment: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
+
+        except Exception as e:
+            logger.error(f"Error pushing transcript segment: {str(e)}")
+            return jsonify({"error": "Internal server error pushing transcript segment"}), 500
+
+    @app.route('/api/analyses/sessions/<session_id>/finish', methods=['POST'])
+    @admission_control(ANSWER_ANALYSIS_POLICY)
+    def finish_analysis_session_route(session_id):
+        if not ANALYSIS_SESSIONS_ENABLED:
+            return _sessions_unavailable()
+        try:
+            analysis_result = finish_analysis_session(session_id, _session_owner())
+            if analysis_result is None:
+                return jsonify({"error": "Analysis session not found"}), 404
+            return jsonify({"analysis": analysis_result}), 200
+
+        except ValueError as ve:
+            logger.warning(f"Validation error finishing analysis session: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
+
+        except Exception as e:
+            logger.error(f"Error finishing analysis session: {str(e)}")
+            return jsonify({"error": "Internal server error during analysis"}), 500
+
+    @app.route('/api/analyses/sessions/<session_id>', methods=['DELETE'])
+    def end_analysis_session_route(session_id):
+        if not ANALYSIS_SESSIONS_ENABLED:
+            return _sessions_unavailable()
+        if not end_analysis_session(session_id, _session_owner()):
+            return jsonify({"error": "Analysis session not found"}), 404
+        return "", 204
@@ -1,6 +1,10 @@
-from flask import request, jsonify, g
+import json
 
+from flask import request, jsonify, g, Response, stream_with_context
+
+from api.job_queue.base_queue import JOB_PRIORITY_BULK, JOB_PRIORITY_INTERACTIVE, parse_job_priority
 from api.services import job_service
+from api.utils.admission import JOB_CREATION_POLICY, admission_control, body_items_cost
 from api.utils.authentication import login_optional, login_required
 from api.utils.logger_config import logger
 
@@ -10,6 +14,7 @@ def register_job_routes(app):
 
     @app.route('/api/jobs', methods=['POST'])
     @login_optional
+    @admission_control(JOB_CREATION_POLICY)
     def create_job_initiate_route():
 
         try:
@@ -37,6 +42,32 @@ def register_job_routes(app):
             logger.error(f"Error creating job: {str(e)}")
             return jsonify({"error": "Internal server error creating job"}), 500
 
+    @app.route('/api/jobs/batch', methods=['POST'])
+    @login_optional
+    @admission_control(JOB_CREATION_POLICY, cost=body_items_cost("descriptions"))
+    def create_jobs_batch_route():
+        try:
+            data = request.json or {}
+
+            job_ids = job_service.initiate_batch_job_creation(
+                data.get("descriptions"),
+                g.get("user_id", None),
+                g.get("user_jwt", None),
+                g.get("refresh_token", None)
+            )
+
+            if job_ids:
+                return jsonify({"jobIds": job_ids}), 202
+            else:
+                return jsonify({"error": "Failed to initiate job creation"}), 500
+
+        except ValueError as ve:
+            logger.warning(f"Validation error creating jobs: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
+        except Exception as e:
+            logger.error(f"Error creating jobs: {str(e)}")
+            return jsonify({"error": "Internal server error creating jobs"}), 500
+
     @app.route('/api/internal/process-job-background', methods=['POST'])
     @login_optional
     def process_job_background_route():
@@ -44,13 +75,24 @@ def register_job_routes(app):
         try:
             data = request.json
             job_description_id_str = data.get("job_description_id")
+            job_description_id_strs = data.get("job_description_ids")
+
+            if job_description_id_strs:
+                logger.info(f"Background route: Received request to process a batch of {len(job_description_id_strs)} jobs")
+                # Worker threads have no request context, so the session is passed explicitly
+                job_service.process_job_batch(
+                    job_description_id_strs, user_jwt=g.get("user_jwt", None), refresh_token=g.get("refresh_token", None),
+                    priority=parse_job_priority(data.get("priority"), JOB_PRIORITY_BULK),
+                    next_job_description_id_strs=data.get("next_job_description_ids"))
+                return jsonify({"message": "Background processing acknowledged"}), 200
 
             if not job_description_id_str:
                 logger.error("Background route: job_description_id missing in payload.")
                 return jsonify({"error": "job_description_id is required"}), 400
 
             logger.info(f"Background route: Received request to process job {job_description_id_str}")
-            job_service.process_job_background_task(job_description_id_str)
+            job_service.process_job_background_task(
+                job_description_id_str, priority=parse_job_priority(data.get("priority"), JOB_PRIORITY_INTERACTIVE))
 
             return jsonify({"message": "Background processing acknowledged"}), 200
         except Exception as e:
@@ -61,32 +103,68 @@ def register_job_routes(app):
     @login_optional
     def get_job_route(job_id):
         try:
-            details = job_service.get_job_details(job_id)
-            if details:
-                return jsonify(details)
-            else:
+            wait = request.args.get("wait", default=0, type=float)
+            known_status = request.args.get("status", default=None)
+
+            result = job_service.get_job_details_with_etag(
+                job_id, wait=max(0.0, wait), known_status=known_status, user_id=g.get("user_id", None))
+            if not result:
                 return jsonify({"error": "Job not found"}), 404
 
-        except ConnectionError as ce:
-            logger.error(f"Speech service connection error for job {job_id}: {str(ce)}")
-            return jsonify({"error": "Service temporarily unavailable while fetching speech token"}), 503
+            details, etag = result
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = jsonify(details)
+
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
 
         except Exception as e:
             logger.error(f"Error retrieving job {job_id}: {str(e)}")
             return jsonify({"error": "Internal server error retrieving job"}), 500
 
+    @app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+    @login_optional
+    def stream_job_route(job_id):
+        try:
+            events = job_service.stream_job_events(job_id)
+            if events is None:
+                return jsonify({"error": "Job not found"}), 404
+
+            def sse():
+                for event, data in events:
+                    yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+            return Response(
+                stream_with_context(sse()),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        except Exception as e:
+            logger.error(f"Error streaming job {job_id}: {str(e)}")
+            return jsonify({"error": "Internal server error streaming job"}), 500
+
     @app.route('/api/jobs', methods=['GET'])
     @login_optional
     def fetch_user_jobs():
         logger.debug("Fetching all job details route")
         try:
-            job_descriptions = job_service.get_user_job_details()
+            limit = request.args.get("limit", default=job_service.JOB_LIST_DEFAULT_LIMIT, type=int)
+            cursor = request.args.get("cursor", default=None)
 
-            if job_descriptions:
+            job_descriptions = job_service.get_user_job_details(limit=limit, cursor=cursor)
+
+            if job_descriptions is not None:
                 return jsonify(job_descriptions), 200
             else:
                 return jsonify({"error": "No job descriptions found"}), 404
 
+        except ValueError as ve:
+            logger.warning(f"Validation error fetching job descriptions: {str(ve)}")
+            return jsonify({"error": str(ve)}), 400
         except Exception as e:
             logger.error(f"Error fetching job descriptions: {str(e)}")
-            return jsonify({"error": "Internal server error fetching job descriptions"}), 500
\ No newline at end of file
+            return jsonify({"error": "Internal server error fetching job descriptions"}), 500
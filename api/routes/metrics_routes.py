@@ -0,0 +1,55 @@
+import os
+import hmac
+import time
+
+from flask import Response, g, jsonify, request
+
+from api.utils.logger_config import logger
+from api.utils.metrics import (
+    metrics,
+    observe_request,
+    server_timing_header,
+    start_request_timings,
+    stop_request_timings,
+)
+
+# The metrics endpoint is only served when a token is configured
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def register_metrics_routes(app):
+    logger.debug("Registering metrics routes")
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_started = time.perf_counter()
+        g.request_timings_token = start_request_timings()
+
+    @app.after_request
+    def finish_request_metrics(response):
+        started = g.get("request_started")
+        if started is None:
+            return response
+
+        duration = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        observe_request(request.method, route, response.status_code, duration)
+        response.headers["Server-Timing"] = server_timing_header(total=duration)
+        return response
+
+    @app.teardown_request
+    def stop_request_metrics(exc=None):
+        token = g.pop("request_timings_token", None)
+        if token is not None:
+            stop_request_timings(token)
+
+    @app.route('/api/internal/metrics', methods=['GET'])
+    def metrics_route():
+        if not METRICS_TOKEN:
+            return jsonify({"error": "Not found"}), 404
+
+        authorization = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {METRICS_TOKEN}".encode("utf-8")):
+            return jsonify({"error": "Authentication required"}), 401
+
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,31 @@
+from flask import jsonify
+
+from api.utils.authentication import login_optional
+from api.utils.logger_config import logger
+
+
+def register_speech_routes(app):
+    logger.debug("Registering speech routes")
+
+    @app.route('/api/speech-token', methods=['GET'])
+    @login_optional
+    def get_speech_token_route():
+        # Imported on first use to keep the HTTP client libraries off the cold start
+        from api.services.speech_service import get_default_speech_service
+
+        speech_service = get_default_speech_service()
+        try:
+            token = speech_service.get_speech_token()
+            return jsonify({
+                "token": token,
+                "region": speech_service.speech_region,
+                "expires_in": speech_service.token_expires_in
+            }), 200
+
+        except ConnectionError as ce:
+            logger.error(f"Speech service connection error: {str(ce)}")
+            return jsonify({"error": "Service temporarily unavailable while fetching speech token"}), 503
+
+        except Exception as e:
+            logger.error(f"Error fetching speech token: {str(e)}")
+            return jsonify({"error": "Internal server error fetching speech token"}), 500
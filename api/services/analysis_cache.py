@@ -0,0 +1,70 @@
+import os
+import re
+import hashlib
+from typing import Dict, Optional
+
+from api.prompts import ANSWER_ANALYSIS_MODEL, answer_analysis_prompt_version, answer_session_prompt_version
+from api.utils.logger_config import logger
+from api.utils.metrics import metrics
+from api.utils.ttl_cache import TTLCache
+
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "86400"))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+analysis_cache = TTLCache(max_size=ANALYSIS_CACHE_MAX_ENTRIES, ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS)
+
+analysis_cache_lookups = metrics.counter(
+    "hiremeplease_analysis_cache_lookups_total", "Analysis cache lookups by kind (answer, segment) and result.",
+    ["kind", "result"])
+
+
+def _normalize(text: Optional[str]) -> str:
+    # Case is kept: tagged phrases quote the answer verbatim
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def analysis_hash(answer_text: str, question: Optional[str]) -> str:
+    """Key of an answer analysis for the current model and prompt version."""
+    key_material = "\x1f".join([
+        ANSWER_ANALYSIS_MODEL,
+        answer_analysis_prompt_version,
+        _normalize(question),
+        _normalize(answer_text),
+    ])
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def get_cached_analysis(answer_text: str, question: Optional[str]) -> Optional[Dict]:
+    analysis = analysis_cache.get(analysis_hash(answer_text, question))
+    analysis_cache_lookups.inc(kind="answer", result="miss" if analysis is None else "hit")
+    if analysis is not None:
+        logger.info("Answer analysis cache hit.")
+    return analysis
+
+
+def cache_analysis(answer_text: str, question: Optional[str], analysis: Dict):
+    analysis_cache.set(analysis_hash(answer_text, question), analysis)
+
+
+def segment_analysis_hash(segment_text: str, question: Optional[str]) -> str:
+    """Key of the analysis of one live-transcript segment; shares the cache with whole answers."""
+    key_material = "\x1f".join([
+        "segment",
+        ANSWER_ANALYSIS_MODEL,
+        answer_session_prompt_version,
+        _normalize(question),
+        _normalize(segment_text),
+    ])
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def get_cached_segment_analysis(segment_text: str, question: Optional[str]) -> Optional[Dict]:
+    analysis = analysis_cache.get(segment_analysis_hash(segment_text, question))
+    analysis_cache_lookups.inc(kind="segment", result="miss" if analysis is None else "hit")
+    return analysis
+
+
+def cache_segment_analysis(segment_text: str, question: Optional[str], analysis: Dict):
+    analysis_cache.set(segment_analysis_hash(segment_text, question), analysis)
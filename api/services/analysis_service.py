@@ -1,20 +1,149 @@
-from api.services.llm_calls import generate_answer_analysis
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from api.services.analysis_cache import get_cached_analysis, cache_analysis
 from api.utils.logger_config import logger
 
+ANALYSIS_BATCH_CONCURRENCY = int(os.getenv("ANALYSIS_BATCH_CONCURRENCY", "5"))
+ANALYSIS_BATCH_MAX_ITEMS = int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", "20"))
 
-def perform_answer_analysis(answer_text):
-    """Performs analysis on the provided answer text."""
 
+def validate_question(question):
+    if question is not None and not isinstance(question, str):
+        raise ValueError("question must be a string")
+
+
+def validate_analysis_input(answer_text, question):
+    """Raises ValueError unless the answer is a non-empty string and the question a string or missing."""
     if not answer_text:
         logger.warning("Attempt to analyze empty answer")
         raise ValueError("Answer text is required")
+    if not isinstance(answer_text, str):
+        raise ValueError("answer_text must be a string")
+    validate_question(question)
+
+
+def perform_answer_analysis(answer_text, question: Optional[str] = None):
+    """Performs analysis on the provided answer text."""
+    validate_analysis_input(answer_text, question)
+
+    analysis = get_cached_analysis(answer_text, question)
+    if analysis:
+        return analysis
 
     logger.info("Generating answer analysis via LLM call")
-    analysis = generate_answer_analysis(answer_text)
+    # Imported on first use: the OpenAI SDK dominates cold-start import time
+    from api.services.llm_calls import generate_answer_analysis
+    analysis = generate_answer_analysis(answer_text, question)
+
+    if analysis:
+        logger.debug("Successfully generated answer analysis")
+        cache_analysis(answer_text, question, analysis)
+        return analysis
+    else:
+        logger.error("Failed to generate analysis")
+        raise Exception("Failed to generate analysis")
+
+
+async def async_perform_answer_analysis(answer_text, question: Optional[str] = None):
+    """Async variant of `perform_answer_analysis` for the ASGI entry point."""
+
+    validate_analysis_input(answer_text, question)
+
+    analysis = get_cached_analysis(answer_text, question)
+    if analysis:
+        return analysis
+
+    logger.info("Generating answer analysis via async LLM call")
+    from api.services.llm_calls import async_generate_answer_analysis
+    analysis = await async_generate_answer_analysis(answer_text, question)
 
     if analysis:
         logger.debug("Successfully generated answer analysis")
+        cache_analysis(answer_text, question, analysis)
         return analysis
     else:
         logger.error("Failed to generate analysis")
         raise Exception("Failed to generate analysis")
+
+
+def validate_batch(items) -> List[Dict]:
+    """Validates a batch request body: a non-empty list of {answer_text, question} objects."""
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list")
+    if len(items) > ANALYSIS_BATCH_MAX_ITEMS:
+        raise ValueError(f"At most {ANALYSIS_BATCH_MAX_ITEMS} items can be analyzed per batch")
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError("Each item must be an object with answer_text and question")
+    for index, item in enumerate(items):
+        if not isinstance(item.get("answer_text"), str):
+            raise ValueError(f"Item {index}: answer_text must be a string")
+        if item.get("question") is not None and not isinstance(item.get("question"), str):
+            raise ValueError(f"Item {index}: question must be a string")
+    return items
+
+
+def _batch_result(index: int, analysis: Optional[dict] = None, error: Optional[Exception] = None) -> Dict:
+    if error is None:
+        return {"index": index, "analysis": analysis}
+    if isinstance(error, ValueError):
+        return {"index": index, "error": str(error)}
+    return {"index": index, "error": "Failed to generate analysis"}
+
+
+def iter_batch_answer_analysis(items: List[Dict], concurrency: int = ANALYSIS_BATCH_CONCURRENCY) -> Iterator[Dict]:
+    """
+    Analyzes a batch of answers concurrently, at most `concurrency` at a time.
+    Yields one result per item, tagged with its index, as soon as each completes.
+    """
+    validate_batch(items)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as executor:
+        futures = {
+            executor.submit(perform_answer_analysis, item.get("answer_text"), item.get("question")): index
+            for index, item in enumerate(items)
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield _batch_result(index, analysis=future.result())
+            except Exception as e:
+                logger.warning(f"Batch analysis item {index} failed: {str(e)}")
+                yield _batch_result(index, error=e)
+
+
+def perform_batch_answer_analysis(items: List[Dict], concurrency: int = ANALYSIS_BATCH_CONCURRENCY) -> List[Dict]:
+    """Analyzes a batch of answers concurrently and returns the results in input order."""
+    results = list(iter_batch_answer_analysis(items, concurrency))
+    return sorted(results, key=lambda result: result["index"])
+
+
+async def async_iter_batch_answer_analysis(
+        items: List[Dict],
+        concurrency: int = ANALYSIS_BATCH_CONCURRENCY) -> AsyncIterator[Dict]:
+    """Async variant of `iter_batch_answer_analysis` for the ASGI entry point."""
+    validate_batch(items)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def analyze(index: int, item: Dict) -> Dict:
+        async with semaphore:
+            try:
+                analysis = await async_perform_answer_analysis(item.get("answer_text"), item.get("question"))
+                return _batch_result(index, analysis=analysis)
+            except Exception as e:
+                logger.warning(f"Batch analysis item {index} failed: {str(e)}")
+                return _batch_result(index, error=e)
+
+    for next_result in asyncio.as_completed([analyze(index, item) for index, item in enumerate(items)]):
+        yield await next_result
+
+
+async def async_perform_batch_answer_analysis(
+        items: List[Dict],
+        concurrency: int = ANALYSIS_BATCH_CONCURRENCY) -> List[Dict]:
+    """Async variant of `perform_batch_answer_analysis` for the ASGI entry point."""
+    results = [result async for result in async_iter_batch_answer_analysis(items, concurrency)]
+    return sorted(results, key=lambda result: result["index"])
@@ -0,0 +1,207 @@
+import os
+import uuid
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from api.services.analysis_cache import cache_segment_analysis, get_cached_segment_analysis, segment_analysis_hash
+from api.services.analysis_service import validate_question
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import metrics, span
+from api.utils.ttl_cache import TTLCache
+
+
+def _single_process_deployment() -> bool:
+    return not os.getenv("VERCEL_URL") and int(os.getenv("WEB_CONCURRENCY", "1")) <= 1
+
+
+# Sessions are held in this process's memory and their segments are tagged on background threads
+# after the response is sent. They therefore need one long-running server process: every request
+# of a session must reach the process holding it, and that process must keep running between
+# requests. Serverless instances (Vercel) and several worker processes break both, so sessions are
+# off there unless explicitly enabled (e.g. behind sticky routing to always-on workers).
+ANALYSIS_SESSIONS_ENABLED = os.getenv(
+    "ANALYSIS_SESSIONS_ENABLED", str(_single_process_deployment())).lower() == "true"
+ANALYSIS_SESSION_TTL_SECONDS = int(os.getenv("ANALYSIS_SESSION_TTL_SECONDS", "1800"))
+ANALYSIS_SESSION_MAX_ENTRIES = int(os.getenv("ANALYSIS_SESSION_MAX_ENTRIES", "1000"))
+ANALYSIS_SESSION_MAX_SEGMENTS = int(os.getenv("ANALYSIS_SESSION_MAX_SEGMENTS", "50"))
+# Segment analyses of all sessions run on this many threads
+ANALYSIS_SESSION_WORKERS = int(os.getenv("ANALYSIS_SESSION_WORKERS", "8"))
+
+session_segments = metrics.counter(
+    "hiremeplease_analysis_session_segments_total",
+    "Transcript segments pushed to analysis sessions by outcome.", ["outcome"])
+
+_executor = ThreadPoolExecutor(max_workers=ANALYSIS_SESSION_WORKERS, thread_name_prefix="segment-analysis")
+
+
+def _analyze_segment(segment_text: str, question: Optional[str]) -> Optional[Dict]:
+    analysis = get_cached_segment_analysis(segment_text, question)
+    if analysis:
+        return analysis
+
+    # Imported on first use: the OpenAI SDK dominates cold-start import time
+    from api.services.llm_calls import generate_segment_analysis
+    analysis = generate_segment_analysis(segment_text, question)
+    if analysis:
+        cache_segment_analysis(segment_text, question, analysis)
+    return analysis
+
+
+@dataclass
+class _Segment:
+    text: str
+    key: str
+    analysis: Future
+
+
+def _merge_tags(analyses: List[Dict]) -> List[Dict]:
+    """Tagged phrases of all segments in transcript order, each phrase and type once."""
+    tags = []
+    seen = set()
+    for analysis in analyses:
+        for tag in analysis.get("tagged_answer") or []:
+            tag_key = (tag["phrase"].casefold(), tag["type"])
+            if tag_key not in seen:
+                seen.add(tag_key)
+                tags.append(tag)
+    return tags
+
+
+class AnalysisSession:
+    """
+    Answer analysis built up while the user speaks. Each transcript segment is tagged on its
+    own as soon as it is pushed, so only new or changed segments cost an LLM call. Finishing
+    writes the overall feedback from the segments' notes rather than the full transcript, so
+    it costs about one segment's worth of latency and tokens.
+    """
+
+    def __init__(self, question: Optional[str], owner: str):
+        self.session_id = str(uuid.uuid4())
+        self.question = question
+        # The identity (user or client address) that started the session; only it may use the session
+        self.owner = owner
+        self._segments: Dict[int, _Segment] = {}
+        self._lock = threading.Lock()
+        self._feedback: Optional[Tuple[Tuple[str, ...], Dict]] = None
+
+    def put_segment(self, index: int, text: str) -> bool:
+        """
+        Sets the transcript segment at `index`; an empty text removes it. Returns whether the
+        segment changed. A changed segment is (re-)analyzed in the background right away.
+        """
+        with self._lock:
+            existing = self._segments.get(index)
+
+            if not text.strip():
+                self._segments.pop(index, None)
+                return existing is not None
+
+            key = segment_analysis_hash(text, self.question)
+            if existing is not None and existing.key == key:
+                session_segments.inc(outcome="unchanged")
+                return False
+            if existing is None and len(self._segments) >= ANALYSIS_SESSION_MAX_SEGMENTS:
+                raise ValueError(f"At most {ANALYSIS_SESSION_MAX_SEGMENTS} segments can be analyzed per session")
+
+            self._segments[index] = _Segment(text, key, _executor.submit(_analyze_segment, text, self.question))
+            session_segments.inc(outcome="analyzed")
+            return True
+
+    def _segment_analysis(self, segment: _Segment) -> Dict:
+        analysis = segment.analysis.result()
+        if analysis is None:
+            # One more try on the request thread before giving up on the answer
+            analysis = _analyze_segment(segment.text, self.question)
+        if analysis is None:
+            raise Exception("Failed to generate analysis")
+        return analysis
+
+    def finish(self) -> Dict:
+        """Returns the Feedback for the transcript pushed so far."""
+        with self._lock:
+            segments = [segment for _, segment in sorted(self._segments.items())]
+        if not segments:
+            raise ValueError("No transcript segments have been pushed")
+
+        transcript_key = tuple(segment.key for segment in segments)
+        if self._feedback is not None and self._feedback[0] == transcript_key:
+            return self._feedback[1]
+
+        # Segments still being analyzed (usually the last one) go into the overall feedback as
+        # transcript, so it is written while their tags are generated instead of after
+        notes = []
+        tagged_so_far = []
+        for segment in segments:
+            if segment.analysis.done() and segment.analysis.result():
+                notes.append(segment.analysis.result()["notes"])
+                tagged_so_far.append(segment.analysis.result())
+            else:
+                notes.append(f"Transcript (not analyzed yet): {segment.text}")
+
+        from api.services.llm_calls import generate_session_feedback
+        overall = generate_session_feedback(self.question, notes, _merge_tags(tagged_so_far))
+        if not overall:
+            logger.error(f"Failed to generate feedback for analysis session {self.session_id}")
+            raise Exception("Failed to generate analysis")
+
+        with span("analysis.segment_wait"):
+            analyses = [self._segment_analysis(segment) for segment in segments]
+
+        feedback = {**overall, "tagged_answer": _merge_tags(analyses)}
+        self._feedback = (transcript_key, feedback)
+        logger.info(f"Analysis session {self.session_id} finished with {len(segments)} segments")
+        return feedback
+
+
+analysis_sessions = TTLCache(max_size=ANALYSIS_SESSION_MAX_ENTRIES, ttl_seconds=ANALYSIS_SESSION_TTL_SECONDS)
+
+
+def start_analysis_session(question: Optional[str], owner: str) -> AnalysisSession:
+    validate_question(question)
+    session = AnalysisSession(question, owner)
+    analysis_sessions.set(session.session_id, session)
+    logger.info(f"Started analysis session {session.session_id}")
+    return session
+
+
+def get_analysis_session(session_id: str, owner: str) -> Optional[AnalysisSession]:
+    """The session, or None if it does not exist, expired or was started by someone else."""
+    session = analysis_sessions.get(session_id)
+    if session is None or session.owner != owner:
+        return None
+    # Sessions expire ANALYSIS_SESSION_TTL_SECONDS after their last use
+    analysis_sessions.set(session_id, session)
+    return session
+
+
+def push_session_segment(session_id: str, owner: str, index, text) -> Optional[bool]:
+    """Returns whether the segment changed, or None if `owner` has no such session (or it expired)."""
+    if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+        raise ValueError("index must be a non-negative integer")
+    if not isinstance(text, str):
+        raise ValueError("text must be a string")
+
+    session = get_analysis_session(session_id, owner)
+    if session is None:
+        return None
+    changed = session.put_segment(index, text)
+    sampled_logger.info(f"Analysis session {session_id} segment {index} {'changed' if changed else 'unchanged'}")
+    return changed
+
+
+def finish_analysis_session(session_id: str, owner: str) -> Optional[Dict]:
+    """Returns the session's Feedback, or None if `owner` has no such session (or it expired)."""
+    session = get_analysis_session(session_id, owner)
+    if session is None:
+        return None
+    return session.finish()
+
+
+def end_analysis_session(session_id: str, owner: str) -> bool:
+    session = analysis_sessions.get(session_id)
+    if session is None or session.owner != owner:
+        return False
+    analysis_sessions.delete(session_id)
+    return True
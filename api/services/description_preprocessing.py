@@ -0,0 +1,256 @@
+import os
+import re
+import html
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from api.utils.logger_config import logger
+
+JOB_DESCRIPTION_PREPROCESSING_ENABLED = os.getenv("JOB_DESCRIPTION_PREPROCESSING_ENABLED", "true").lower() == "true"
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("JOB_DESCRIPTION_TOKEN_BUDGET", "3000"))
+
+# Rough average for English text with the GPT-4o tokenizer
+CHARS_PER_TOKEN = 4
+
+# Lines shorter than this (bullets like "Python", "Remote") may legitimately repeat
+MIN_DEDUPE_LINE_LENGTH = 20
+MAX_HEADING_LENGTH = 60
+
+_BLOCK_TAG_RE = re.compile(r"<\s*(br|/p|/div|/li|/h[1-6]|/tr|/ul|/ol)\b[^>]*>", re.IGNORECASE)
+_LIST_ITEM_TAG_RE = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+_SCRIPT_STYLE_RE = re.compile(r"<\s*(script|style)\b.*?<\s*/\s*\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_INVISIBLE_RE = re.compile(r"[\u200b\u200c\u200d\u2060\ufeff]")
+_INLINE_WHITESPACE_RE = re.compile(r"[ \t\f\v\u00a0\u2007\u202f]+")
+_HEADING_MARKUP_RE = re.compile(r"^[#*_\s]+|[#*_:\s]+$")
+
+# Sections that carry no signal for interview questions. Matched against the whole heading, so
+# a heading that merely mentions one of these words ("Salary platform work:") is kept
+_BOILERPLATE_HEADING_RE = re.compile(
+    r"((an )?equal (employment )?opportunit(y|ies)( employer| statement)?|eeo( statement)?"
+    r"|diversity( (and|&) inclusion| statement)?|(our |your )?(benefits|perks)( (and|&) (benefits|perks))?"
+    r"|(what )?we offer( you)?|compensation( (and|&) benefits)?|salary( range)?|pay( range)?"
+    r"|how to apply|application process|privacy( notice| policy)?|disclaimer|legal notice)[.!]?",
+    re.IGNORECASE,
+)
+
+# Lines describing the work itself; a section holding any of them is never dropped as boilerplate
+_ROLE_CONTENT_RE = re.compile(
+    r"\b(you will|you'll|responsib\w*|requir\w*|qualifications?|experience (with|in)|years of"
+    r"|proficien\w*|build|design|develop|implement|maintain|own)\b",
+    re.IGNORECASE,
+)
+
+# Boilerplate that also shows up as stray paragraphs outside a titled section
+_BOILERPLATE_LINE_RE = re.compile(
+    r"(equal opportunity employer|without regard to (race|age|sex|religion)|reasonable accommodation"
+    r"|e-verify|protected veteran|applicants with disabilities|privacy notice|recruitment agencies)",
+    re.IGNORECASE,
+)
+
+# Sections truncated first when the description is over budget
+_LOW_PRIORITY_HEADING_RE = re.compile(
+    r"(about (us|the company|the team)|who we are|our (mission|story|culture|values)|company overview|culture)",
+    re.IGNORECASE,
+)
+_HIGH_PRIORITY_HEADING_RE = re.compile(
+    r"(responsibilit|requirement|qualification|skills|experience|what you.?ll do|what you.?ll bring"
+    r"|the role|about the (role|job|position)|your role|must have|nice to have|tech stack)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class PreprocessedDescription:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    dropped_sections: List[str] = field(default_factory=list)
+    duplicates_removed: int = 0
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+@dataclass
+class _Section:
+    heading: Optional[str]
+    lines: List[str]
+
+    @property
+    def text(self) -> str:
+        lines = ([self.heading] if self.heading else []) + self.lines
+        return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting; no tokenizer dependency."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def _strip_markup(text: str) -> str:
+    if "<" in text and _TAG_RE.search(text):
+        text = _SCRIPT_STYLE_RE.sub("", text)
+        text = _BLOCK_TAG_RE.sub("\n", text)
+        text = _LIST_ITEM_TAG_RE.sub("\n- ", text)
+        text = _TAG_RE.sub("", text)
+    return html.unescape(text)
+
+
+def _normalize_lines(text: str) -> List[str]:
+    text = _INVISIBLE_RE.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    return [_INLINE_WHITESPACE_RE.sub(" ", line).strip() for line in text.split("\n")]
+
+
+def _heading_of(line: str) -> Optional[str]:
+    """Returns the heading text if the line looks like a section heading."""
+    if not line or len(line) > MAX_HEADING_LENGTH:
+        return None
+
+    heading = _HEADING_MARKUP_RE.sub("", line)
+    if not heading:
+        return None
+
+    looks_like_heading = (
+        line.startswith("#")
+        or line.endswith(":")
+        or (line.startswith("**") and line.rstrip(":").endswith("**"))
+        or (heading.isupper() and len(heading) > 3)
+    )
+    known_heading = (
+        _BOILERPLATE_HEADING_RE.fullmatch(heading)
+        or _LOW_PRIORITY_HEADING_RE.fullmatch(heading)
+        or _HIGH_PRIORITY_HEADING_RE.match(heading)
+    )
+    if looks_like_heading or known_heading:
+        return heading
+    return None
+
+
+def _split_sections(lines: List[str]) -> List[_Section]:
+    sections = [_Section(heading=None, lines=[])]
+    for line in lines:
+        if not line:
+            continue
+        heading = _heading_of(line)
+        if heading:
+            sections.append(_Section(heading=line, lines=[]))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.heading or section.lines]
+
+
+def _section_name(section: _Section) -> str:
+    return _HEADING_MARKUP_RE.sub("", section.heading or "")
+
+
+def _drop_boilerplate(sections: List[_Section]) -> Tuple[List[_Section], List[str]]:
+    kept, dropped = [], []
+    for section in sections:
+        name = _section_name(section)
+        if (name and _BOILERPLATE_HEADING_RE.fullmatch(name)
+                and not any(_ROLE_CONTENT_RE.search(line) for line in section.lines)):
+            dropped.append(name)
+            continue
+        section.lines = [line for line in section.lines if not _BOILERPLATE_LINE_RE.search(line)]
+        kept.append(section)
+    return kept, dropped
+
+
+def _dedupe_lines(sections: List[_Section]) -> int:
+    seen = set()
+    removed = 0
+    for section in sections:
+        unique_lines = []
+        for line in section.lines:
+            key = re.sub(r"\W+", " ", line).strip().casefold()
+            if len(key) >= MIN_DEDUPE_LINE_LENGTH:
+                if key in seen:
+                    removed += 1
+                    continue
+                seen.add(key)
+            unique_lines.append(line)
+        section.lines = unique_lines
+    return removed
+
+
+def _section_priority(index: int, section: _Section) -> int:
+    """Lower is kept first. The untitled preamble usually holds the title and summary."""
+    name = _section_name(section)
+    if index == 0 and not name:
+        return 0
+    if _HIGH_PRIORITY_HEADING_RE.search(name):
+        return 0
+    if _LOW_PRIORITY_HEADING_RE.search(name):
+        return 2
+    return 1
+
+
+def _apply_budget(sections: List[_Section], token_budget: int) -> bool:
+    """
+    Fits the sections into the token budget, filling high-priority sections first and
+    cutting whole lines from the rest. Sections keep their original order. Returns True if anything was cut.
+    """
+    if estimate_tokens("\n\n".join(section.text for section in sections)) <= token_budget:
+        return False
+
+    order = sorted(range(len(sections)), key=lambda i: (_section_priority(i, sections[i]), i))
+    remaining = token_budget
+    kept_lines = {}
+
+    for i in order:
+        section = sections[i]
+        cost = estimate_tokens(section.heading or "") + 1
+        if remaining - cost <= 0:
+            kept_lines[i] = None
+            continue
+
+        remaining -= cost
+        lines = []
+        for line in section.lines:
+            line_cost = estimate_tokens(line) + 1
+            if line_cost > remaining:
+                break
+            lines.append(line)
+            remaining -= line_cost
+        kept_lines[i] = lines if (lines or not section.lines) else None
+
+    for i, section in enumerate(sections):
+        section.lines = kept_lines[i] or []
+    sections[:] = [section for i, section in enumerate(sections) if kept_lines[i] is not None]
+    return True
+
+
+def preprocess_description(description: str, token_budget: int = JOB_DESCRIPTION_TOKEN_BUDGET) -> PreprocessedDescription:
+    """
+    Cleans a pasted job description before it is sent to the LLM: strips HTML and
+    whitespace noise, drops boilerplate sections (EEO, benefits, ...), removes repeated
+    lines and trims low-priority sections to fit the token budget.
+    """
+    tokens_before = estimate_tokens(description)
+
+    if not JOB_DESCRIPTION_PREPROCESSING_ENABLED or not description:
+        return PreprocessedDescription(text=description, tokens_before=tokens_before, tokens_after=tokens_before)
+
+    sections = _split_sections(_normalize_lines(_strip_markup(description)))
+    sections, dropped_sections = _drop_boilerplate(sections)
+    duplicates_removed = _dedupe_lines(sections)
+    truncated = _apply_budget(sections, token_budget)
+
+    text = "\n\n".join(section.text for section in sections if section.lines)
+    if not text.strip():
+        # Never send an empty prompt because a heuristic was too eager
+        logger.warning("Description preprocessing removed everything; using the original text.")
+        return PreprocessedDescription(text=description, tokens_before=tokens_before, tokens_after=tokens_before)
+
+    return PreprocessedDescription(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(text),
+        dropped_sections=dropped_sections,
+        duplicates_removed=duplicates_removed,
+        truncated=truncated,
+    )
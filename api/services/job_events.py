@@ -0,0 +1,47 @@
+import queue
+import threading
+from collections import defaultdict
+from typing import Dict, Set
+
+from api.utils.logger_config import logger
+
+
+class JobEventHub:
+    """
+    In-process publish/subscribe of job events (new questions, status changes).
+    Each subscriber gets its own queue; publishing never blocks the background task.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[queue.Queue]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> queue.Queue:
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers[str(job_id)].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, job_id: str, subscriber: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(str(job_id))
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[str(job_id)]
+
+    def publish(self, job_id: str, event: str, data: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(job_id), ()))
+
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait({"event": event, "data": data})
+            except queue.Full:
+                # A slow consumer falls back to reading state from the database
+                logger.warning(f"Dropping '{event}' event for job {job_id}: subscriber queue full.")
+
+
+job_event_hub = JobEventHub()
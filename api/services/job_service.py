@@ -1,81 +1,158 @@
 import os
+import json
+import asyncio
+import base64
 import uuid
+import hashlib
+import time
+import queue
 import threading
-import requests
 
-from typing import Optional, Dict
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Iterator, List, Tuple
 from uuid import UUID
 
 
 from api.db.supabase_client import get_supabase_client
-from api.db.repositories.question_repository import QuestionRepository
 from api.db.repositories.job_description_repository import JobDescriptionRepository
-
-from api.models import InterviewPreparation
-from api.services.llm_calls import generate_response
-from api.services.speech_service import get_default_speech_service
-from api.utils.logger_config import logger
-
-
-load_dotenv()
-
-speech_service = get_default_speech_service()
-
-
-def trigger_background_job_processing(
-        job_description_id: UUID,
-        user_jwt: Optional[str],
-        refresh_token: Optional[str]):
+from api.db.repositories.job_completion_unit_of_work import JobCompletionUnitOfWork
+from api.job_queue.base_queue import (
+    ANONYMOUS_USER_KEY,
+    JOB_BATCH_CONCURRENCY,
+    JOB_PRIORITY_BULK,
+    JOB_PRIORITY_INTERACTIVE,
+    BaseJobQueue,
+    QueuedJob,
+    job_priority,
+)
+from api.job_queue.factory import create_job_queue, get_job_queue_backend
+
+from api.services.description_preprocessing import preprocess_description
+from api.services.job_events import job_event_hub
+from api.services.preparation_cache import (
+    cache_preparation,
+    description_hash,
+    get_cached_preparation,
+    get_cached_preparation_by_hash,
+)
+from api.services.similarity_index import SIMILAR_JOB_REUSE_ENABLED, similar_job_index
+from api.utils.authentication import SUPABASE_JWT_SECRET, mint_user_jwt
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import metrics, timed
+from api.utils.single_flight import AsyncSingleFlight, SingleFlight
+from api.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from api.models import InterviewPreparation
+
+
+QUESTION_STREAMING_ENABLED = os.getenv("QUESTION_STREAMING_ENABLED", "true").lower() == "true"
+JOB_STREAM_POLL_INTERVAL = float(os.getenv("JOB_STREAM_POLL_INTERVAL", "2"))
+JOB_STREAM_TIMEOUT = float(os.getenv("JOB_STREAM_TIMEOUT", "120"))
+JOB_LONG_POLL_MAX_WAIT = float(os.getenv("JOB_LONG_POLL_MAX_WAIT", "30"))
+COMPLETED_JOB_CACHE_TTL_SECONDS = int(os.getenv("COMPLETED_JOB_CACHE_TTL_SECONDS", "3600"))
+COMPLETED_JOB_CACHE_MAX_ENTRIES = int(os.getenv("COMPLETED_JOB_CACHE_MAX_ENTRIES", "1000"))
+JOB_LIST_DEFAULT_LIMIT = 20
+JOB_LIST_MAX_LIMIT = 100
+JOB_BATCH_MAX_ITEMS = int(os.getenv("JOB_BATCH_MAX_ITEMS", "100"))
+JOB_DESCRIPTION_PREVIEW_LENGTH = 200
+
+FINAL_JOB_STATUSES = ("completed", "failed")
+
+_job_queue: Optional[BaseJobQueue] = None
+_job_queue_lock = threading.Lock()
+_reported_queue_classes = set()
+
+# Concurrent jobs with the same description share one LLM generation
+_generation_flight = SingleFlight("Question generation")
+_async_generation_flight = AsyncSingleFlight("Question generation")
+
+# Concurrent readers of the same job (polling tabs, SSE fallbacks) share one database read
+_job_read_flight = SingleFlight("Job read")
+
+job_status_transitions = metrics.counter(
+    "hiremeplease_job_status_transitions_total", "Job status changes by new status.", ["status"])
+similar_job_reuses = metrics.counter(
+    "hiremeplease_similar_job_reuses_total", "Jobs that reused the questions of a near-duplicate job.")
+job_queue_depth = metrics.gauge(
+    "hiremeplease_job_queue_jobs", "Jobs in the local job queue by state.", ["state"])
+job_queue_oldest_age = metrics.gauge(
+    "hiremeplease_job_queue_oldest_age_seconds", "Age of the oldest job waiting in the local job queue.")
+job_queue_class_depth = metrics.gauge(
+    "hiremeplease_job_queue_class_jobs", "Jobs waiting in the local job queue by scheduling class.", ["priority"])
+job_queue_class_users = metrics.gauge(
+    "hiremeplease_job_queue_class_users", "Users with jobs waiting in the local job queue by scheduling class.",
+    ["priority"])
+job_queue_class_oldest_age = metrics.gauge(
+    "hiremeplease_job_queue_class_oldest_age_seconds",
+    "Age of the oldest job waiting in the local job queue by scheduling class.", ["priority"])
+
+# Formatted responses (and ETags) of completed jobs, which never change
+completed_job_cache = TTLCache(max_size=COMPLETED_JOB_CACHE_MAX_ENTRIES, ttl_seconds=COMPLETED_JOB_CACHE_TTL_SECONDS)
+
+
+def get_job_queue() -> BaseJobQueue:
+    """Returns the process-wide job queue, starting its workers on first use."""
+    global _job_queue
+
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                job_queue = create_job_queue()
+                if job_queue.name == "sqlite" and not SUPABASE_JWT_SECRET:
+                    logger.error("SUPABASE_JWT_SECRET is not configured: queued jobs of signed-in users "
+                                 "cannot get credentials and will fail until they are dead-lettered.")
+                job_queue.start(_process_queued_job)
+                metrics.on_collect(lambda: _collect_queue_stats(job_queue))
+                _job_queue = job_queue
+
+    return _job_queue
+
+
+def _collect_queue_stats(job_queue: BaseJobQueue):
+    stats = job_queue.stats()
+    for state in ("queued", "running", "dead"):
+        if state in stats:
+            job_queue_depth.set(stats[state], state=state)
+    if "oldest_queued_age_seconds" in stats:
+        job_queue_oldest_age.set(stats["oldest_queued_age_seconds"])
+
+    classes = stats.get("classes", {})
+    # Classes that drained since the last scrape report zero rather than their last value
+    for priority in set(classes) | _reported_queue_classes:
+        class_stats = classes.get(priority, {})
+        job_queue_class_depth.set(class_stats.get("queued", 0), priority=priority)
+        job_queue_class_users.set(class_stats.get("users", 0), priority=priority)
+        job_queue_class_oldest_age.set(class_stats.get("oldest_queued_age_seconds", 0.0), priority=priority)
+    _reported_queue_classes.update(classes)
+
+
+def start_background_workers():
     """
-    Makes an asynchronous HTTP POST request to the background processing endpoint.
+    Starts the job queue eagerly so jobs persisted before a restart are resumed. The HTTP
+    trigger backend persists nothing to resume and is left to start on first use, off the cold start.
     """
-
-    supabase_client = get_supabase_client(user_jwt=user_jwt, refresh_token=refresh_token)
-    job_desc_repo = JobDescriptionRepository(supabase_client)
-
-    base_url = f"https://{os.getenv('VERCEL_URL')}" if os.getenv("VERCEL_URL") else "http://localhost:3000"
-
-    if not base_url:
-        raise RuntimeError("Cannot determine application base URL for internal trigger.")
-    process_url = f"{base_url.rstrip('/')}/api/internal/process-job-background"
-
-    payload = {"job_description_id": str(job_description_id)}
-
-    logger.info(f"THREAD/TRIGGER (requests): Attempting for job ID: {job_description_id} to URL: {process_url}")
-
-    try:
-        headers = {}
-
-        # Add access token and refresh token in headers if provided
-        if user_jwt:
-            headers["Authorization"] = f"Bearer {user_jwt}"
-        if refresh_token:
-            headers["Refresh-Token"] = refresh_token
-
-        response = requests.post(
-            process_url,
-            json=payload,
-            timeout=60.0,
-            headers=headers,
-        )
-
-        if 200 <= response.status_code < 300:
-            logger.info(f"THREAD/TRIGGER (requests): Successfully triggered. Status: {response.status_code}")
-        else:
-            logger.error(
-                f"THREAD/TRIGGER (requests): Failed. HTTP Status: {response.status_code}, Response: {response.text}")
-            job_desc_repo.update_status(job_description_id, "failed")
-
-    except requests.exceptions.Timeout:
-        logger.error(f"THREAD/TRIGGER (requests): Timeout for job {job_description_id} at {process_url}")
-        job_desc_repo.update_status(job_description_id, "failed")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"THREAD/TRIGGER (requests): Request error for job {job_description_id}: {e}")
-        job_desc_repo.update_status(job_description_id, "failed")
-    except Exception as e:
-        logger.error(f"THREAD/TRIGGER (requests): Unexpected error for job {job_description_id}: {e}", exc_info=True)
-        job_desc_repo.update_status(job_description_id, "failed")
+    if get_job_queue_backend() != "http":
+        get_job_queue()
+
+
+def _process_queued_job(job: QueuedJob) -> bool:
+    user_jwt, refresh_token = job.user_jwt, job.refresh_token
+    if user_jwt is None and job.user_key != ANONYMOUS_USER_KEY:
+        # The queue keeps only the user id; the job gets a token of its own when it runs
+        user_jwt = mint_user_jwt(job.user_key)
+        if user_jwt is None:
+            # As the anonymous client the job would be hidden by RLS and acked unprocessed
+            raise RuntimeError(f"Cannot mint credentials for the user of job {job.job_description_id}")
+
+    return process_job_background_task(
+        job.job_description_id,
+        user_jwt=user_jwt,
+        refresh_token=refresh_token,
+        mark_failed=job.is_last_attempt,
+        priority=job.priority
+    )
 
 
 def initiate_job_creation(
@@ -90,7 +167,7 @@ def initiate_job_creation(
     supabase_client = get_supabase_client()
     job_desc_repo = JobDescriptionRepository(supabase_client)
 
-    logger.info(f"Initiating job creation by user {user_id} for job description {description_txt}")
+    logger.info(f"Initiating job creation by user {user_id} for a job description of {len(description_txt)} chars")
     description_id = uuid.uuid4()
 
     job_desc_record = job_desc_repo.create(
@@ -102,157 +179,563 @@ def initiate_job_creation(
     if not job_desc_record:
         logger.error(f"Failed to create job description in the database for user {user_id}")
         return None
+    job_status_transitions.inc(status="created")
 
-    trigger_thread = threading.Thread(
-        target=trigger_background_job_processing,
-        args=(description_id, user_jwt, refresh_token),
-    )
-    trigger_thread.daemon = True  # Allows main program to exit even if thread is running
-    trigger_thread.start()
-
-    import time
-    time.sleep(0.1)
+    if not get_job_queue().enqueue(
+            description_id, user_jwt, refresh_token, user_id=user_id, priority=job_priority(False, user_id)):
+        logger.error(f"Failed to enqueue background processing for job {description_id}")
+        _set_job_status(job_desc_repo, description_id, "failed")
+        return None
 
-    logger.info(
-        f"Background trigger thread started for job ID: {description_id}. Returning initial response to client NOW.")
+    logger.info(f"Background processing scheduled for job ID: {description_id}. Returning initial response to client NOW.")
 
     return str(description_id)
 
 
-def process_job_background_task(job_description_id_str: str):
+def validate_job_batch(descriptions) -> List[str]:
+    """Validates a batch request body: a non-empty list of non-empty description strings."""
+    if not isinstance(descriptions, list) or not descriptions:
+        raise ValueError("descriptions must be a non-empty list")
+    if len(descriptions) > JOB_BATCH_MAX_ITEMS:
+        raise ValueError(f"At most {JOB_BATCH_MAX_ITEMS} jobs can be created per batch")
+    if not all(isinstance(description, str) and description.strip() for description in descriptions):
+        raise ValueError("Each description must be a non-empty string")
+    return descriptions
+
+
+def initiate_batch_job_creation(
+        descriptions: List[str],
+        user_id: Optional[UUID],
+        user_jwt: Optional[str],
+        refresh_token: Optional[str]) -> Optional[List[str]]:
     """
-    The actual background task: fetches job, calls LLM, saves questions.
-    This is called by the /api/internal/process-job-background endpoint.
+    Batch variant of `initiate_job_creation`: all rows are created in one insert and
+    processing is scheduled as one batch. Returns the job IDs in request order.
     """
+    validate_job_batch(descriptions)
+
     supabase_client = get_supabase_client()
-    question_repo = QuestionRepository(supabase_client)
     job_desc_repo = JobDescriptionRepository(supabase_client)
 
+    logger.info(f"Initiating batch creation of {len(descriptions)} jobs by user {user_id}")
+    description_ids = [uuid.uuid4() for _ in descriptions]
+
+    job_desc_records = job_desc_repo.create_batch(list(zip(description_ids, descriptions)), user_id=user_id)
+
+    if not job_desc_records:
+        logger.error(f"Failed to create {len(descriptions)} job descriptions in the database for user {user_id}")
+        return None
+    job_status_transitions.inc(len(description_ids), status="created")
+
+    if not get_job_queue().enqueue_batch(
+            description_ids, user_jwt, refresh_token, user_id=user_id, priority=job_priority(True, user_id)):
+        logger.error(f"Failed to enqueue background processing for a batch of {len(description_ids)} jobs")
+        for description_id in description_ids:
+            _set_job_status(job_desc_repo, description_id, "failed")
+        return None
+
+    logger.info(f"Background processing scheduled for a batch of {len(description_ids)} jobs.")
+
+    return [str(description_id) for description_id in description_ids]
+
+
+def _question_row(job_description_id: UUID, question_type: str, question: Dict) -> Dict:
+    """Maps a generated BehavioralQuestion/TechnicalQuestion to a row of the questions table."""
+    if question_type == "behavioral":
+        return {
+            "job_description_id": str(job_description_id),
+            "content": question["question"],
+            "type": "Behavioral",
+            "keyword": question["category"],
+            "explanation": question["explanation"]
+        }
+
+    return {
+        "job_description_id": str(job_description_id),
+        "content": question["question"],
+        "type": "Technical",
+        "keyword": question["skill_area"],
+        "explanation": question["explanation"]
+    }
+
+
+def _format_question(q_data: Dict) -> Tuple[Optional[str], Dict]:
+    """Maps a row of the questions table back to the frontend question format."""
+    question_type = (q_data.get("type") or "").lower()
+
+    if question_type == "behavioral":
+        return question_type, {
+            "question": q_data.get("content"),
+            "category": q_data.get("keyword"),
+            "explanation": q_data.get("explanation")
+        }
+    if question_type == "technical":
+        return question_type, {
+            "question": q_data.get("content"),
+            "skill_area": q_data.get("keyword"),
+            "explanation": q_data.get("explanation")
+        }
+    return None, {}
+
+
+def _set_job_status(job_desc_repo: JobDescriptionRepository, job_description_id: UUID, status: str):
+    job_desc_repo.update_status(job_description_id, status)
+    _record_job_status(job_description_id, status)
+
+
+def _record_job_status(job_description_id: UUID, status: str):
+    job_status_transitions.inc(status=status)
+    job_event_hub.publish(job_description_id, "status", {"status": status})
+
+
+def _preprocessed_description(job_description_id: UUID, description_text: str) -> str:
+    """Runs the preprocessing stage and logs the prompt-size savings for the job."""
+    preprocessed = preprocess_description(description_text)
+    logger.info(
+        f"Background: Job {job_description_id} description preprocessed: "
+        f"~{preprocessed.tokens_before} -> ~{preprocessed.tokens_after} tokens "
+        f"(dropped sections: {preprocessed.dropped_sections or 'none'}, "
+        f"duplicate lines: {preprocessed.duplicates_removed}, truncated: {preprocessed.truncated})"
+    )
+    return preprocessed.text
+
+
+def _similar_job_preparation(run: "_JobRun", description_text: str) -> Optional["InterviewPreparation"]:
+    """Questions of an already completed job whose description is a near-duplicate of this one."""
+    if not SIMILAR_JOB_REUSE_ENABLED:
+        return None
+
+    match = similar_job_index.find_similar(description_text, exclude_job_id=run.job_description_id)
+    if not match:
+        return None
+
+    # Cross-user matches are served from the process cache; the stored rows are subject to RLS
+    interview_prep_data = get_cached_preparation_by_hash(match.description_hash) or run.load_preparation(match.job_id)
+    if not interview_prep_data:
+        return None
+
+    logger.info(
+        f"Background: Job {run.job_description_id} reuses the questions of job {match.job_id} "
+        f"(similarity {match.similarity:.2f})")
+    similar_job_reuses.inc()
+    # Not cached or indexed under this text: reuses must not chain (A -> B -> C) further away from
+    # the description the questions were generated for than the similarity threshold allows
+    run.reused_from = match.job_id
+    return interview_prep_data
+
+
+def _index_completed_job(run: "_JobRun", description_text: str):
+    if SIMILAR_JOB_REUSE_ENABLED and run.reused_from is None:
+        similar_job_index.add(run.job_description_id, description_text, description_hash(description_text))
+
+
+def _llm_priority(job_priority: int) -> int:
+    """Generations of each job class queue for OpenAI capacity behind answer analyses and earlier classes."""
+    from api.services.llm_scheduler import PRIORITY_BACKGROUND
+    return PRIORITY_BACKGROUND + job_priority
+
+
+def _generate_and_cache_preparation(
+        description_text: str,
+        on_question=None,
+        priority: int = JOB_PRIORITY_INTERACTIVE) -> Optional["InterviewPreparation"]:
+    # A previous leader may have finished between our cache miss and joining the flight
+    interview_prep_data = get_cached_preparation(description_text)
+    if interview_prep_data:
+        return interview_prep_data
+
+    # Imported on first use: the OpenAI SDK dominates cold-start import time
+    from api.services.llm_calls import generate_response, stream_response
+
+    if QUESTION_STREAMING_ENABLED and on_question:
+        interview_prep_data = stream_response(description_text, on_question, priority=_llm_priority(priority))
+    else:
+        interview_prep_data = generate_response(description_text, priority=_llm_priority(priority))
+    if interview_prep_data:
+        cache_preparation(description_text, interview_prep_data)
+    return interview_prep_data
+
+
+class _JobRun:
+    """Database steps of one background processing run, shared by the sync and async tasks."""
+
+    def __init__(self, job_description_id: UUID, user_jwt: Optional[str], refresh_token: Optional[str]):
+        supabase_client = get_supabase_client(user_jwt=user_jwt, refresh_token=refresh_token)
+        self.job_description_id = job_description_id
+        self.job_desc_repo = JobDescriptionRepository(supabase_client)
+        # Title, questions and the final status are written together when the run completes
+        self.completion = JobCompletionUnitOfWork(supabase_client, job_description_id)
+        self.published_questions = set()
+        # Set when the questions are another job's, found by similarity rather than generated for this text
+        self.reused_from: Optional[str] = None
+
+    def load(self) -> Optional[Dict]:
+        """Returns the job description to process, or None if there is nothing to do."""
+        logger.info(f"Background: Starting processing for job {self.job_description_id}")
+        job_desc = self.job_desc_repo.get_by_id(self.job_description_id)
+
+        if not job_desc:
+            logger.error(f"Background: Job description {self.job_description_id} not found for processing.")
+            return None
+
+        if job_desc.get('status') == 'completed':  # Avoid reprocessing
+            logger.info(f"Background: Job {self.job_description_id} already completed. Skipping.")
+            return None
+
+        return job_desc
+
+    def load_preparation(self, job_id: str) -> Optional["InterviewPreparation"]:
+        """Rebuilds the parts of a completed job's preparation that `complete` needs from its stored rows."""
+        job_desc = self.job_desc_repo.get_by_id_with_questions(job_id)
+        if not job_desc or job_desc.get("status") != "completed":
+            return None
+
+        interview_prep_data = {"job_title": job_desc.get("title"), "behavioral_questions": [], "technical_questions": []}
+        for q_data in job_desc.get("questions") or []:
+            question_type, question = _format_question(q_data)
+            if question_type:
+                interview_prep_data[f"{question_type}_questions"].append(question)
+
+        if not interview_prep_data["behavioral_questions"] and not interview_prep_data["technical_questions"]:
+            return None
+        return interview_prep_data
+
+    def begin(self, job_desc: Dict):
+        # Nothing is written until `complete`; a retried job may still have questions from an earlier attempt
+        self.completion.replace_questions = job_desc.get('status') != 'created'
+
+    def save_question(self, question_type: str, question: Dict):
+        """Streams a generated question to subscribers; it is stored with the rest in `complete`."""
+        self.published_questions.add((question_type, question["question"]))
+        job_event_hub.publish(self.job_description_id, "question", {"type": question_type, **question})
+
+    def complete(self, interview_prep_data: "InterviewPreparation"):
+        self.completion.set_title(interview_prep_data["job_title"])
+
+        # Subscribers already have the streamed questions (cache hits and coalesced followers have none)
+        question_events = []
+
+        for question_type, list_key in (("behavioral", "behavioral_questions"), ("technical", "technical_questions")):
+            for question in interview_prep_data[list_key]:
+                self.completion.add_question(_question_row(self.job_description_id, question_type, question))
+                if (question_type, question["question"]) not in self.published_questions:
+                    question_events.append({"type": question_type, **question})
+
+        if not self.completion.commit():
+            raise RuntimeError(f"Could not store the results of job {self.job_description_id}")
+
+        for question_event in question_events:
+            job_event_hub.publish(self.job_description_id, "question", question_event)
+        _record_job_status(self.job_description_id, "completed")
+        logger.info(f"Background: Successfully processed job {self.job_description_id}")
+
+    def fail(self):
+        try:
+            _set_job_status(self.job_desc_repo, self.job_description_id, "failed")
+        except Exception as db_e:
+            logger.error(f"Background: Could not even update status to failed for {self.job_description_id}: {db_e}")
+
+
+@timed("job.process")
+def process_job_background_task(
+        job_description_id_str: str,
+        user_jwt: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        mark_failed: bool = True,
+        priority: int = JOB_PRIORITY_INTERACTIVE) -> bool:
+    """
+    The actual background task: fetches job, calls LLM, saves questions.
+    This is called by the job queue workers or the /api/internal/process-job-background endpoint.
+
+    Returns False if processing failed and may be retried. The job is only marked
+    as failed when `mark_failed` is set, i.e. on the last attempt. `priority` is the job's
+    scheduling class; its LLM call waits for capacity behind those of lower classes.
+    """
     try:
         job_description_id = UUID(job_description_id_str)
     except ValueError:
         logger.error(f"Invalid UUID for background processing: {job_description_id_str}")
-        return
-
-    logger.info(f"Background: Starting processing for job {job_description_id}")
-    job_desc = job_desc_repo.get_by_id(job_description_id)
+        return True
 
+    run = _JobRun(job_description_id, user_jwt, refresh_token)
+    job_desc = run.load()
     if not job_desc:
-        logger.error(f"Background: Job description {job_description_id} not found for processing.")
-        return
-
-    if job_desc.get('status') == 'completed':  # Avoid reprocessing
-        logger.info(f"Background: Job {job_description_id} already completed. Skipping.")
-        return
+        return True
 
     try:
-        job_desc_repo.update_status(job_description_id, "processing")
+        run.begin(job_desc)
+
+        description_text = _preprocessed_description(job_description_id, job_desc.get("description"))
+        interview_prep_data: InterviewPreparation = (
+            get_cached_preparation(description_text) or _similar_job_preparation(run, description_text))
 
-        description_text = job_desc.get("description")
-        interview_prep_data: InterviewPreparation = generate_response(description_text)
+        if not interview_prep_data:
+            interview_prep_data = _generation_flight.do(
+                description_hash(description_text),
+                lambda: _generate_and_cache_preparation(description_text, on_question=run.save_question, priority=priority)
+            )
 
         if not interview_prep_data:
             logger.error(f"Background: LLM failed for job {job_description_id}.")
-            job_desc_repo.update_status(job_description_id, "failed")
-            return
+            if mark_failed:
+                run.fail()
+            return False
 
-        job_desc_repo.update_title(job_description_id, interview_prep_data["job_title"])
+        run.complete(interview_prep_data)
+        _index_completed_job(run, description_text)
+        return True
 
-        questions_to_insert = []
+    except Exception as e:
+        logger.error(f"Background: Error during processing job {job_description_id}: {e}")
+        if mark_failed:
+            run.fail()
+        return False
 
-        for bq in interview_prep_data["behavioral_questions"]:
-            questions_to_insert.append({
-                "job_description_id": str(job_description_id),
-                "content": bq["question"],
-                "type": "Behavioral",
-                "keyword": bq["category"],
-                "explanation": bq["explanation"]
-            })
 
-        for tq in interview_prep_data["technical_questions"]:
-            questions_to_insert.append({
-                "job_description_id": str(job_description_id),
-                "content": tq["question"],
-                "type": "Technical",
-                "keyword": tq["skill_area"],
-                "explanation": tq["explanation"]
-            })
+def _continue_batch(
+        next_job_description_id_strs: Optional[List[str]],
+        user_jwt: Optional[str],
+        refresh_token: Optional[str],
+        priority: int):
+    """Hands the rest of a chunked batch to the next invocation once this chunk is done."""
+    if not next_job_description_id_strs:
+        return
+    try:
+        next_job_description_ids = [UUID(job_description_id_str) for job_description_id_str in next_job_description_id_strs]
+    except ValueError:
+        logger.error("Background: Invalid UUID in the rest of a job batch; not continuing it.")
+        return
+    get_job_queue().enqueue_batch(next_job_description_ids, user_jwt, refresh_token, priority=priority)
 
-        if questions_to_insert:
-            question_repo.create_questions_batch(questions_to_insert)
 
-        job_desc_repo.update_status(job_description_id, "completed")
-        logger.info(f"Background: Successfully processed job {job_description_id}")
+def process_job_batch(
+        job_description_id_strs: List[str],
+        user_jwt: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        concurrency: int = JOB_BATCH_CONCURRENCY,
+        priority: int = JOB_PRIORITY_BULK,
+        next_job_description_id_strs: Optional[List[str]] = None):
+    """
+    Processes a chunk handed over by the HTTP trigger, at most `concurrency` jobs at a time,
+    then triggers the batch's next chunk. The jobs' LLM calls are scheduled by their class.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(job_description_id_strs)))) as executor:
+        list(executor.map(
+            lambda job_description_id_str: process_job_background_task(
+                job_description_id_str, user_jwt=user_jwt, refresh_token=refresh_token, priority=priority),
+            job_description_id_strs
+        ))
+    _continue_batch(next_job_description_id_strs, user_jwt, refresh_token, priority)
+
+
+async def _async_generate_and_cache_preparation(
+        description_text: str, priority: int = JOB_PRIORITY_INTERACTIVE) -> Optional["InterviewPreparation"]:
+    interview_prep_data = get_cached_preparation(description_text)
+    if interview_prep_data:
+        return interview_prep_data
+
+    from api.services.llm_calls import async_generate_response
+    interview_prep_data = await async_generate_response(description_text, priority=_llm_priority(priority))
+    if interview_prep_data:
+        cache_preparation(description_text, interview_prep_data)
+    return interview_prep_data
+
+
+@timed("job.process")
+async def async_process_job_background_task(
+        job_description_id_str: str,
+        user_jwt: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        mark_failed: bool = True,
+        priority: int = JOB_PRIORITY_INTERACTIVE) -> bool:
+    """
+    Async variant of `process_job_background_task` for the ASGI entry point.
+    The LLM call is awaited on the event loop; the short database steps run in worker threads.
+    """
+    try:
+        job_description_id = UUID(job_description_id_str)
+    except ValueError:
+        logger.error(f"Invalid UUID for background processing: {job_description_id_str}")
+        return True
+
+    run = await asyncio.to_thread(_JobRun, job_description_id, user_jwt, refresh_token)
+    job_desc = await asyncio.to_thread(run.load)
+    if not job_desc:
+        return True
+
+    try:
+        await asyncio.to_thread(run.begin, job_desc)
+
+        description_text = _preprocessed_description(job_description_id, job_desc.get("description"))
+        interview_prep_data: InterviewPreparation = get_cached_preparation(description_text)
+        if not interview_prep_data:
+            interview_prep_data = await asyncio.to_thread(_similar_job_preparation, run, description_text)
+
+        if not interview_prep_data:
+            interview_prep_data = await _async_generation_flight.do(
+                description_hash(description_text),
+                lambda: _async_generate_and_cache_preparation(description_text, priority)
+            )
+
+        if not interview_prep_data:
+            logger.error(f"Background: LLM failed for job {job_description_id}.")
+            if mark_failed:
+                await asyncio.to_thread(run.fail)
+            return False
+
+        await asyncio.to_thread(run.complete, interview_prep_data)
+        _index_completed_job(run, description_text)
+        return True
 
     except Exception as e:
         logger.error(f"Background: Error during processing job {job_description_id}: {e}")
+        if mark_failed:
+            await asyncio.to_thread(run.fail)
+        return False
+
+
+async def async_process_job_batch(
+        job_description_id_strs: List[str],
+        user_jwt: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        concurrency: int = JOB_BATCH_CONCURRENCY,
+        priority: int = JOB_PRIORITY_BULK,
+        next_job_description_id_strs: Optional[List[str]] = None):
+    """Async variant of `process_job_batch`."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(job_description_id_str: str):
+        async with semaphore:
+            await async_process_job_background_task(
+                job_description_id_str, user_jwt=user_jwt, refresh_token=refresh_token, priority=priority)
+
+    await asyncio.gather(*(process(job_description_id_str) for job_description_id_str in job_description_id_strs))
+    await asyncio.to_thread(_continue_batch, next_job_description_id_strs, user_jwt, refresh_token, priority)
+
+
+def _read_job(job_desc_repo: JobDescriptionRepository, job_id: UUID) -> Optional[Dict]:
+    """Reads a job and its questions in one query, shared by concurrent readers of the same job."""
+    # Keyed by client too, so readers with different credentials never share rows
+    key = (str(job_id), id(job_desc_repo.client))
+    return _job_read_flight.do(key, lambda: job_desc_repo.get_by_id_with_questions(job_id))
+
+
+def _job_result_key(job_id: UUID, user_id: Optional[UUID]) -> Tuple[str, str]:
+    return str(job_id), str(user_id)
+
+
+def _compute_etag(details: Dict) -> str:
+    body = json.dumps(details, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+
+
+def _wait_for_status_change(
+        job_desc_repo: JobDescriptionRepository,
+        job_id: UUID,
+        subscriber: queue.Queue,
+        job_desc_data: Dict,
+        wait: float) -> Dict:
+    """
+    Blocks until the job's status differs from the one in `job_desc_data` or `wait` seconds pass.
+    Woken by status events from the background task; re-reads periodically for jobs
+    processed in another process.
+    """
+    known_status = job_desc_data.get("status")
+    deadline = time.time() + wait
+
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return job_desc_data
+
         try:
-            job_desc_repo.update_status(job_description_id, "failed")
-        except Exception as db_e:
-            logger.error(f"Background: Could not even update status to failed for {job_description_id}: {db_e}")
+            message = subscriber.get(timeout=min(JOB_STREAM_POLL_INTERVAL, remaining))
+            if message["event"] != "status" or message["data"]["status"] == known_status:
+                continue
+        except queue.Empty:
+            pass
+
+        latest = _read_job(job_desc_repo, job_id)
+        if latest:
+            job_desc_data = latest
+            if latest.get("status") != known_status:
+                return job_desc_data
 
 
-def get_job_details(job_id_str: str) -> Optional[Dict]:
+def get_job_details(job_id_str: str, wait: float = 0, known_status: Optional[str] = None) -> Optional[Dict]:
     """
     Retrieves job description, its status, and if completed, its generated questions
     and formats it according to the frontend QuestionsResponse interface.
+
+    With `wait` > 0 this is a long poll: if the job is still running and its status equals
+    `known_status` (default: the current status), it waits up to `wait` seconds for a change.
     """
+    result = get_job_details_with_etag(job_id_str, wait=wait, known_status=known_status)
+    return result[0] if result else None
 
-    supabase_client = get_supabase_client()
-    job_desc_repo = JobDescriptionRepository(supabase_client)
-    question_repo = QuestionRepository(supabase_client)
 
+def get_job_details_with_etag(
+        job_id_str: str,
+        wait: float = 0,
+        known_status: Optional[str] = None,
+        user_id: Optional[UUID] = None) -> Optional[Tuple[Dict, str]]:
+    """
+    Like `get_job_details`, but also returns a strong ETag of the response body.
+    Completed jobs never change, so their response and ETag are memoized per job and user.
+    """
     try:
         job_id = UUID(job_id_str)
     except ValueError:
         logger.warning(f"Invalid UUID format for job_id: {job_id_str}")
         return None
 
-    logger.debug(f"Fetching details for job_id: {job_id}")
-    job_desc_data = job_desc_repo.get_by_id(job_id)
+    cached = completed_job_cache.get(_job_result_key(job_id, user_id))
+    if cached:
+        sampled_logger.debug(f"Serving memoized completed job {job_id}")
+        return cached
 
-    if not job_desc_data:
-        logger.warning(f"Job description not found for job_id: {job_id}")
-        return None
+    supabase_client = get_supabase_client()
+    job_desc_repo = JobDescriptionRepository(supabase_client)
+
+    sampled_logger.debug(f"Fetching details for job_id: {job_id}")
 
-    # Speech Token
-    speech_token_text = None
+    # Subscribe before the first read so no status change falls between the two
+    subscriber = job_event_hub.subscribe(job_id) if wait > 0 else None
     try:
-        speech_token_text = speech_service.get_speech_token()
-        logger.debug(f"Successfully fetched speech token for job {job_id}")
-    except ConnectionError as ce:
-        logger.error(f"Speech service connection error for job {job_id}: {str(ce)}")
-    except Exception as e:
-        logger.error(f"Failed to get speech token for job {job_id}: {str(e)}")
+        job_desc_data = _read_job(job_desc_repo, job_id)
+
+        if not job_desc_data:
+            logger.warning(f"Job description not found for job_id: {job_id}")
+            return None
+
+        status = job_desc_data.get("status")
+        if subscriber and status not in FINAL_JOB_STATUSES and status == (known_status or status):
+            job_desc_data = _wait_for_status_change(
+                job_desc_repo, job_id, subscriber, job_desc_data, min(wait, JOB_LONG_POLL_MAX_WAIT))
+    finally:
+        if subscriber:
+            job_event_hub.unsubscribe(job_id, subscriber)
 
     # Base Response Structure
     response_shell = {
         "status": job_desc_data.get("status", "unknown"),
         "description": job_desc_data.get("description", ""),
-        "speech_token": speech_token_text,
         "results": None  # Will be populated if status is 'completed'
     }
 
     # Populate Results if Completed ---
     if response_shell["status"] == "completed":
-        db_questions = question_repo.get_questions_by_job_description_id(job_id)
+        db_questions = job_desc_data.get("questions") or []
 
         behavioral_questions_list = []
         technical_questions_list = []
 
         for q_data in db_questions:
-            if q_data.get("type").lower() == "behavioral":
-                behavioral_questions_list.append({
-                    "question": q_data.get("content"),
-                    "category": q_data.get("keyword"),
-                    "explanation": q_data.get("explanation")
-                })
-            elif q_data.get("type").lower() == "technical":
-                technical_questions_list.append({
-                    "question": q_data.get("content"),
-                    "skill_area": q_data.get("keyword"),
-                    "explanation": q_data.get("explanation")
-                })
+            question_type, question = _format_question(q_data)
+            if question_type == "behavioral":
+                behavioral_questions_list.append(question)
+            elif question_type == "technical":
+                technical_questions_list.append(question)
 
         response_shell["results"] = {
             "job_title": job_desc_data.get("title"),
@@ -266,17 +749,139 @@ def get_job_details(job_id_str: str) -> Optional[Dict]:
     else:
         logger.info(f"Job {job_id} status is '{response_shell['status']}'. Results not populated.")
 
-    return response_shell
+    result = (response_shell, _compute_etag(response_shell))
+    if response_shell["status"] == "completed":
+        completed_job_cache.set(_job_result_key(job_id, user_id), result)
+
+    return result
+
+
+def stream_job_events(job_id_str: str) -> Optional[Iterator[Tuple[str, Dict]]]:
+    """
+    Returns a generator of (event, data) pairs for a job: every question as soon as it is
+    generated, and every status change, ending when the job completes or fails.
+    Events come from the in-process event hub, with a periodic database read as the fallback
+    for jobs processed by another process (which sees the questions once the job completes).
+    """
+    supabase_client = get_supabase_client()
+    job_desc_repo = JobDescriptionRepository(supabase_client)
+
+    try:
+        job_id = UUID(job_id_str)
+    except ValueError:
+        logger.warning(f"Invalid UUID format for job_id: {job_id_str}")
+        return None
+
+    # Subscribe before the first read so no event falls between the two
+    subscriber = job_event_hub.subscribe(job_id)
+    job_desc_data = _read_job(job_desc_repo, job_id)
+
+    if not job_desc_data:
+        job_event_hub.unsubscribe(job_id, subscriber)
+        logger.warning(f"Job description not found for job_id: {job_id}")
+        return None
+
+    def events():
+        sent_questions = set()
+        status = None
+        deadline = time.time() + JOB_STREAM_TIMEOUT
+
+        def question_event(question_type: str, question: Dict):
+            key = (question_type, question.get("question"))
+            if key in sent_questions:
+                return None
+            sent_questions.add(key)
+            return "question", {"type": question_type, **question}
+
+        def sync_from_db(job_data: Optional[Dict]):
+            nonlocal status
+            if not job_data:
+                return
+            for q_data in job_data.get("questions") or []:
+                question_type, question = _format_question(q_data)
+                if question_type:
+                    event = question_event(question_type, question)
+                    if event:
+                        yield event
+            if job_data.get("status") != status:
+                status = job_data.get("status")
+                yield "status", {"status": status}
+
+        try:
+            yield from sync_from_db(job_desc_data)
+
+            while status not in FINAL_JOB_STATUSES and time.time() < deadline:
+                try:
+                    message = subscriber.get(timeout=JOB_STREAM_POLL_INTERVAL)
+                except queue.Empty:
+                    yield from sync_from_db(_read_job(job_desc_repo, job_id))
+                    yield "heartbeat", {"status": status}
+                    continue
+
+                if message["event"] == "question":
+                    data = dict(message["data"])
+                    event = question_event(data.pop("type"), data)
+                    if event:
+                        yield event
+                elif message["event"] == "status" and message["data"]["status"] != status:
+                    status = message["data"]["status"]
+                    yield "status", message["data"]
+        finally:
+            job_event_hub.unsubscribe(job_id, subscriber)
 
-def get_user_job_details():
-        """Fetch all job descriptions."""
-        supabase_client = get_supabase_client()
-        job_desc_repo = JobDescriptionRepository(supabase_client)
+    return events()
+
+
+def _encode_job_cursor(record: Dict) -> str:
+    raw = f"{record['created_at']}|{record['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_job_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(job_id))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _job_summary(record: Dict) -> Dict:
+    # The stored preview is one character longer than shown, so a cut description can be told apart
+    description = record.get("description_preview") or record.get("description") or ""
+    preview = description[:JOB_DESCRIPTION_PREVIEW_LENGTH]
+    if len(description) > JOB_DESCRIPTION_PREVIEW_LENGTH:
+        preview = preview.rstrip() + "…"
+
+    return {
+        "id": record.get("id"),
+        "title": record.get("title"),
+        "status": record.get("status"),
+        "created_at": record.get("created_at"),
+        "description_preview": preview
+    }
 
-        data = job_desc_repo.get_job_details()
-        if data:
-            job_desc_repo.logger.info(f"Fetched {len(data[1])} job descriptions.")
-            return data
-        else:
-            job_desc_repo.logger.warning(f"No job descriptions found.")
-            return None
\ No newline at end of file
+
+def get_user_job_details(limit: int = JOB_LIST_DEFAULT_LIMIT, cursor: Optional[str] = None) -> Optional[Dict]:
+    """
+    Fetch a page of the user's job description summaries, newest first.
+    Returns the page and the cursor of the next page (None on the last page).
+    """
+    limit = max(1, min(limit, JOB_LIST_MAX_LIMIT))
+    cursor_created_at, cursor_id = _decode_job_cursor(cursor) if cursor else (None, None)
+
+    supabase_client = get_supabase_client()
+    job_desc_repo = JobDescriptionRepository(supabase_client)
+
+    # One extra row tells whether another page follows
+    records = job_desc_repo.get_job_summaries(limit + 1, cursor_created_at, cursor_id)
+    if records is None:
+        return None
+
+    page = records[:limit]
+    next_cursor = _encode_job_cursor(page[-1]) if len(records) > limit else None
+
+    logger.info(f"Fetched {len(page)} job descriptions.")
+    return {
+        "jobs": [_job_summary(record) for record in page],
+        "next_cursor": next_cursor
+    }
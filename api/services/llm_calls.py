@@ -1,34 +1,82 @@
 import os
 import json
+import threading
 import traceback
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
 import openai
-from openai import OpenAI
-from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
 
 from api.utils.logger_config import logger
-from api.models import InterviewPreparation, Feedback
-from api.prompts import question_generation_prompt, answer_analysis_prompt
+from api.utils.metrics import timed
+from api.models import InterviewPreparation, Feedback, OverallFeedback, SegmentAnalysis
+from api.prompts import (
+    ANSWER_ANALYSIS_MODEL,
+    QUESTION_GENERATION_MODEL,
+    answer_analysis_prompt,
+    question_generation_prompt,
+    segment_analysis_prompt,
+    session_feedback_prompt,
+)
+from api.services.description_preprocessing import estimate_tokens
+from api.services.llm_scheduler import LLMScheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
 
-load_dotenv()
+# Expected completion sizes, counted against the tokens-per-minute budget up front
+QUESTION_GENERATION_OUTPUT_TOKENS = 1500
+ANSWER_ANALYSIS_OUTPUT_TOKENS = 600
+SEGMENT_ANALYSIS_OUTPUT_TOKENS = 300
+SESSION_FEEDBACK_OUTPUT_TOKENS = 400
 
 
-# Initialize OpenAI API client
-try:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    logger.info("OpenAI client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize OpenAI client: {str(e)}\n{traceback.format_exc()}")
-    raise
+_client_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
 
 
-def generate_response(job_description: str) -> Optional[InterviewPreparation]:
+def _create_clients():
+    """Builds both OpenAI clients on first use; the async one serves the ASGI entry point."""
+    global _client, _async_client
+
+    with _client_lock:
+        if _client is not None:
+            return
+        # Retries are left to the scheduler so they respect the shared rate limits
+        try:
+            _async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+            logger.info("OpenAI client initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI client: {str(e)}\n{traceback.format_exc()}")
+            raise
+
+
+def get_client() -> OpenAI:
+    if _client is None:
+        _create_clients()
+    return _client
+
+
+def get_async_client() -> AsyncOpenAI:
+    if _client is None:
+        _create_clients()
+    return _async_client
+
+
+llm_scheduler = LLMScheduler()
+
+
+def _estimated_tokens(messages, output_tokens: int) -> int:
+    return sum(estimate_tokens(message["content"]) for message in messages) + output_tokens
+
+
+@timed("llm.question_generation")
+def generate_response(job_description: str, priority: int = PRIORITY_BACKGROUND) -> Optional[InterviewPreparation]:
     """
     Generates structured interview questions based on a job description using OpenAI Chat Completion.
 
     Args:
         job_description: The job description as a string.
+        priority: Scheduling priority of the OpenAI call (see llm_scheduler).
 
     Returns:
         A dictionary representing the structured JSON output, or None if an error occurs.
@@ -36,20 +84,26 @@ def generate_response(job_description: str) -> Optional[InterviewPreparation]:
     logger.debug(f"Generating response for job description of length: {len(job_description)}")
 
     user_message = {"role": "user", "content": job_description}
+    messages = [question_generation_prompt, user_message]
 
     try:
         logger.info("Sending request to OpenAI API")
-        response = client.beta.chat.completions.parse(
-            model="gpt-4o-mini",
-            messages=[question_generation_prompt, user_message],
-            response_format=InterviewPreparation,
-            temperature=0.2
+        response = llm_scheduler.call(
+            QUESTION_GENERATION_MODEL,
+            _estimated_tokens(messages, QUESTION_GENERATION_OUTPUT_TOKENS),
+            lambda: get_client().beta.chat.completions.parse(
+                model=QUESTION_GENERATION_MODEL,
+                messages=messages,
+                response_format=InterviewPreparation,
+                temperature=0.2
+            ),
+            priority=priority
         )
-        
+
         logger.info("Successfully generated interview questions")
         json_output = response.choices[0].message
 
-        logger.info(f"Generated JSON output from OpenAI API: {json_output.content}")
+        logger.debug(f"Generated JSON output from OpenAI API ({len(json_output.content)} chars)")
         # Return the parsed JSON content in the expected format
         return json.loads(json_output.content)
 
@@ -75,18 +129,117 @@ def generate_response(job_description: str) -> Optional[InterviewPreparation]:
         return None
 
 
-def generate_answer_analysis(answer_text: str) -> Optional[dict]:
+# Keys of InterviewPreparation in schema order, and the key that follows each question list.
+# Structured outputs emit keys in schema order, so once the following key appears
+# the preceding list is complete.
+_QUESTION_LISTS = {
+    "behavioral": ("behavioral_questions", "technical_questions"),
+    "technical": ("technical_questions", "additional_notes"),
+}
+
+
+def _completed_questions(partial: dict, emitted: Dict[str, int], final: bool = False):
+    """Yields (question_type, question) for questions in a partial parse that are fully received."""
+    for question_type, (list_key, next_key) in _QUESTION_LISTS.items():
+        questions = partial.get(list_key) or []
+        list_done = final or next_key in partial
+        completed_count = len(questions) if list_done else max(0, len(questions) - 1)
+
+        while emitted[question_type] < completed_count:
+            yield question_type, questions[emitted[question_type]]
+            emitted[question_type] += 1
+
+
+@timed("llm.question_generation")
+def stream_response(
+        job_description: str,
+        on_question: Callable[[str, dict], None],
+        priority: int = PRIORITY_BACKGROUND) -> Optional[InterviewPreparation]:
+    """
+    Streaming variant of `generate_response`. Parses the JSON incrementally and calls
+    `on_question(question_type, question)` as soon as each behavioral or technical
+    question is complete.
+
+    Returns:
+        A dictionary representing the full structured JSON output, or None if an error occurs.
+    """
+    logger.debug(f"Streaming response for job description of length: {len(job_description)}")
+
+    user_message = {"role": "user", "content": job_description}
+    messages = [question_generation_prompt, user_message]
+    emitted = {"behavioral": 0, "technical": 0}
+
+    def run_stream():
+        with get_client().beta.chat.completions.stream(
+            model=QUESTION_GENERATION_MODEL,
+            messages=messages,
+            response_format=InterviewPreparation,
+            temperature=0.2
+        ) as stream:
+            for event in stream:
+                if event.type == "content.delta" and isinstance(event.parsed, dict):
+                    for question_type, question in _completed_questions(event.parsed, emitted):
+                        on_question(question_type, question)
+
+            return stream.get_final_completion()
+
+    try:
+        logger.info("Sending streaming request to OpenAI API")
+        completion = llm_scheduler.call(
+            QUESTION_GENERATION_MODEL,
+            _estimated_tokens(messages, QUESTION_GENERATION_OUTPUT_TOKENS),
+            run_stream,
+            priority=priority,
+            # Questions already handed to the caller cannot be taken back
+            can_retry=lambda: not any(emitted.values())
+        )
+
+        result = json.loads(completion.choices[0].message.content)
+        for question_type, question in _completed_questions(result, emitted, final=True):
+            on_question(question_type, question)
+
+        logger.info("Successfully streamed interview questions")
+        return result
+
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON Decode Error: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except openai.APIConnectionError as e:
+        logger.error(f"Failed to connect to OpenAI API: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except openai.APIError as e:
+        logger.error(f"OpenAI API returned an API Error: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {str(e)}\n{traceback.format_exc()}")
+        return None
+
+
+def _answer_analysis_message(answer_text: str, question: Optional[str]) -> dict:
+    if not question:
+        return {"role": "user", "content": answer_text}
+    return {"role": "user", "content": f"Interview question: {question}\n\nAnswer: {answer_text}"}
+
+
+@timed("llm.answer_analysis")
+def generate_answer_analysis(answer_text: str, question: Optional[str] = None) -> Optional[dict]:
     logger.debug(f"Analyzing answer of length: {len(answer_text)}")
 
-    user_message = {"role": "user", "content": answer_text}
+    user_message = _answer_analysis_message(answer_text, question)
+    messages = [answer_analysis_prompt, user_message]
 
     try:
         logger.info("Sending answer analysis request to OpenAI API")
-        response = client.beta.chat.completions.parse(
-            model="gpt-4o-mini",
-            messages=[answer_analysis_prompt, user_message],
-            response_format=Feedback,
-            temperature=0.2
+        response = llm_scheduler.call(
+            ANSWER_ANALYSIS_MODEL,
+            _estimated_tokens(messages, ANSWER_ANALYSIS_OUTPUT_TOKENS),
+            lambda: get_client().beta.chat.completions.parse(
+                model=ANSWER_ANALYSIS_MODEL,
+                messages=messages,
+                response_format=Feedback,
+                temperature=0.2
+            ),
+            priority=PRIORITY_INTERACTIVE
         )
 
         logger.info("Successfully generated answer analysis")
@@ -97,3 +250,125 @@ def generate_answer_analysis(answer_text: str) -> Optional[dict]:
         error_msg = f"Error generating answer analysis: {str(e)}"
         logger.error(f"{error_msg}\n{traceback.format_exc()}")
         return None
+
+
+def _parse_interactive(messages, response_format, output_tokens: int) -> dict:
+    response = llm_scheduler.call(
+        ANSWER_ANALYSIS_MODEL,
+        _estimated_tokens(messages, output_tokens),
+        lambda: get_client().beta.chat.completions.parse(
+            model=ANSWER_ANALYSIS_MODEL,
+            messages=messages,
+            response_format=response_format,
+            temperature=0.2
+        ),
+        priority=PRIORITY_INTERACTIVE
+    )
+    return json.loads(response.choices[0].message.content)
+
+
+@timed("llm.segment_analysis")
+def generate_segment_analysis(segment_text: str, question: Optional[str] = None) -> Optional[dict]:
+    """Tags one transcript segment of a live answer and returns short notes on it (SegmentAnalysis)."""
+    logger.debug(f"Analyzing answer segment of length: {len(segment_text)}")
+
+    messages = [segment_analysis_prompt, _answer_analysis_message(segment_text, question)]
+
+    try:
+        return _parse_interactive(messages, SegmentAnalysis, SEGMENT_ANALYSIS_OUTPUT_TOKENS)
+    except Exception as e:
+        logger.error(f"Error generating segment analysis: {str(e)}\n{traceback.format_exc()}")
+        return None
+
+
+@timed("llm.session_feedback")
+def generate_session_feedback(
+        question: Optional[str],
+        segment_notes: List[str],
+        tagged_phrases: List[dict]) -> Optional[dict]:
+    """Overall feedback (OverallFeedback) for a live answer from its segment notes instead of its transcript."""
+    lines = [f"Interview question: {question}", ""] if question else []
+    lines.append("Segment notes:")
+    lines.extend(f"{i}. {notes}" for i, notes in enumerate(segment_notes, start=1))
+    if tagged_phrases:
+        lines.extend(["", "Tagged phrases:"])
+        lines.extend(f"- [{tag['type']}] {tag['phrase']}" for tag in tagged_phrases)
+
+    messages = [session_feedback_prompt, {"role": "user", "content": "\n".join(lines)}]
+
+    try:
+        return _parse_interactive(messages, OverallFeedback, SESSION_FEEDBACK_OUTPUT_TOKENS)
+    except Exception as e:
+        logger.error(f"Error generating session feedback: {str(e)}\n{traceback.format_exc()}")
+        return None
+
+
+@timed("llm.question_generation")
+async def async_generate_response(
+        job_description: str, priority: int = PRIORITY_BACKGROUND) -> Optional[InterviewPreparation]:
+    """Async variant of `generate_response` using the AsyncOpenAI client."""
+    logger.debug(f"Generating response for job description of length: {len(job_description)}")
+
+    user_message = {"role": "user", "content": job_description}
+    messages = [question_generation_prompt, user_message]
+
+    try:
+        logger.info("Sending async request to OpenAI API")
+        response = await llm_scheduler.async_call(
+            QUESTION_GENERATION_MODEL,
+            _estimated_tokens(messages, QUESTION_GENERATION_OUTPUT_TOKENS),
+            lambda: get_async_client().beta.chat.completions.parse(
+                model=QUESTION_GENERATION_MODEL,
+                messages=messages,
+                response_format=InterviewPreparation,
+                temperature=0.2
+            ),
+            priority=priority
+        )
+
+        logger.info("Successfully generated interview questions")
+        return json.loads(response.choices[0].message.content)
+
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON Decode Error: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except openai.APIConnectionError as e:
+        logger.error(f"Failed to connect to OpenAI API: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except openai.APIError as e:
+        logger.error(f"OpenAI API returned an API Error: {str(e)}\n{traceback.format_exc()}")
+        return None
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {str(e)}\n{traceback.format_exc()}")
+        return None
+
+
+@timed("llm.answer_analysis")
+async def async_generate_answer_analysis(answer_text: str, question: Optional[str] = None) -> Optional[dict]:
+    """Async variant of `generate_answer_analysis` using the AsyncOpenAI client."""
+    logger.debug(f"Analyzing answer of length: {len(answer_text)}")
+
+    user_message = _answer_analysis_message(answer_text, question)
+    messages = [answer_analysis_prompt, user_message]
+
+    try:
+        logger.info("Sending async answer analysis request to OpenAI API")
+        response = await llm_scheduler.async_call(
+            ANSWER_ANALYSIS_MODEL,
+            _estimated_tokens(messages, ANSWER_ANALYSIS_OUTPUT_TOKENS),
+            lambda: get_async_client().beta.chat.completions.parse(
+                model=ANSWER_ANALYSIS_MODEL,
+                messages=messages,
+                response_format=Feedback,
+                temperature=0.2
+            ),
+            priority=PRIORITY_INTERACTIVE
+        )
+
+        logger.info("Successfully generated answer analysis")
+        return json.loads(response.choices[0].message.content)
+
+    except Exception as e:
+        error_msg = f"Error generating answer analysis: {str(e)}"
+        logger.error(f"{error_msg}\n{traceback.format_exc()}")
+        return None
@@ -0,0 +1,323 @@
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import openai
+
+from api.utils.logger_config import logger
+from api.utils.metrics import metrics, span
+
+# Defaults match the gpt-4o-mini tier 1 quota; override per deployment
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "30.0"))
+# Longest Retry-After hint that is waited out; a call told to wait longer fails instead
+LLM_RETRY_AFTER_MAX = float(os.getenv("LLM_RETRY_AFTER_MAX", "60.0"))
+LLM_MAX_QUEUE_WAIT = float(os.getenv("LLM_MAX_QUEUE_WAIT", "120.0"))
+# How often async callers waiting for capacity re-check the buckets
+LLM_ASYNC_POLL_INTERVAL = float(os.getenv("LLM_ASYNC_POLL_INTERVAL", "0.05"))
+
+# Lower values are admitted first. Question generation runs at PRIORITY_BACKGROUND plus the
+# job's scheduling class (api/job_queue/base_queue.py), so bulk jobs yield to single jobs
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+
+
+llm_retries = metrics.counter(
+    "hiremeplease_llm_retries_total", "Retried LLM calls by model and error type.", ["model", "error"])
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waited longer than allowed for rate-limit capacity."""
+
+
+class TokenBucket:
+    """Continuously refilling bucket; `capacity` units per `period` seconds. Not thread-safe on its own."""
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request larger than the bucket is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float):
+        self.tokens -= amount
+
+    def adjust(self, delta: float):
+        """Corrects an earlier estimate once the real usage is known (positive delta refunds)."""
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class _ModelLimiter:
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.blocked_until = 0.0
+        self.waiting: List[tuple] = []  # heap of (priority, sequence)
+
+
+class LLMScheduler:
+    """
+    Shared admission control for OpenAI calls. Requests-per-minute and tokens-per-minute
+    buckets are kept per model; waiting calls are admitted in priority order so interactive
+    answer analyses go ahead of background question generation. Rate-limit, connection and
+    5xx errors are retried with jittered exponential backoff, honoring `Retry-After` hints of
+    up to `retry_after_max` seconds.
+    """
+
+    def __init__(self,
+                 rpm_limit: int = LLM_RPM_LIMIT,
+                 tpm_limit: int = LLM_TPM_LIMIT,
+                 max_retries: int = LLM_MAX_RETRIES,
+                 backoff_base: float = LLM_BACKOFF_BASE,
+                 backoff_max: float = LLM_BACKOFF_MAX,
+                 max_queue_wait: float = LLM_MAX_QUEUE_WAIT,
+                 retry_after_max: float = LLM_RETRY_AFTER_MAX):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_queue_wait = max_queue_wait
+        self.retry_after_max = retry_after_max
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self.retries = 0
+        self.rate_limited = 0
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = _ModelLimiter(self.rpm_limit, self.tpm_limit)
+        return limiter
+
+    def _admit(self, limiter: _ModelLimiter, entry: tuple, estimated_tokens: int, now: float) -> Optional[float]:
+        """
+        Takes capacity for `entry` if it is next in line and the model has room, returning 0.
+        Otherwise returns the seconds until the model has room, or None if `entry` is not next.
+        Caller holds the condition.
+        """
+        if limiter.waiting[0] != entry:
+            return None
+        wait = max(
+            limiter.blocked_until - now,
+            limiter.requests.wait_time(1, now),
+            limiter.tokens.wait_time(estimated_tokens, now),
+        )
+        if wait <= 0:
+            limiter.requests.consume(1)
+            limiter.tokens.consume(estimated_tokens)
+            return 0.0
+        return wait
+
+    def _leave(self, limiter: _ModelLimiter, entry: tuple):
+        """Removes a waiter that was admitted or gave up, and wakes the others. Caller holds the condition."""
+        limiter.waiting.remove(entry)
+        heapq.heapify(limiter.waiting)
+        self._condition.notify_all()
+
+    def acquire(self, model: str, estimated_tokens: int, priority: int = PRIORITY_BACKGROUND):
+        """Blocks until the model has capacity for one request of `estimated_tokens` and this call is next in line."""
+        deadline = time.monotonic() + self.max_queue_wait
+
+        with self._condition:
+            limiter = self._limiter(model)
+            entry = (priority, next(self._sequence))
+            heapq.heappush(limiter.waiting, entry)
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._admit(limiter, entry, estimated_tokens, now)
+                    if wait == 0:
+                        return
+
+                    if now >= deadline:
+                        raise LLMQueueTimeout(f"Timed out waiting for {model} rate-limit capacity")
+
+                    # Waiters behind the head of the line are woken when it is admitted
+                    self._condition.wait(min(wait, deadline - now) if wait is not None else deadline - now)
+            finally:
+                self._leave(limiter, entry)
+
+    async def async_acquire(self, model: str, estimated_tokens: int, priority: int = PRIORITY_BACKGROUND):
+        """
+        `acquire` for coroutines. Waits on the event loop instead of a thread, so any number of
+        queued calls cost no executor threads; the lock is only held for each short check.
+        """
+        deadline = time.monotonic() + self.max_queue_wait
+
+        with self._condition:
+            limiter = self._limiter(model)
+            entry = (priority, next(self._sequence))
+            heapq.heappush(limiter.waiting, entry)
+
+        try:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    wait = self._admit(limiter, entry, estimated_tokens, now)
+                if wait == 0:
+                    return
+
+                if now >= deadline:
+                    raise LLMQueueTimeout(f"Timed out waiting for {model} rate-limit capacity")
+
+                # Thread waiters' notifications do not reach the event loop, so waiters re-check
+                # at least every LLM_ASYNC_POLL_INTERVAL for refunds and a new head of the line
+                await asyncio.sleep(min(wait if wait is not None else LLM_ASYNC_POLL_INTERVAL,
+                                        LLM_ASYNC_POLL_INTERVAL, deadline - now))
+        finally:
+            with self._condition:
+                self._leave(limiter, entry)
+
+    def record_usage(self, model: str, estimated_tokens: int, actual_tokens: Optional[int]):
+        if actual_tokens is None:
+            return
+        with self._condition:
+            self._limiter(model).tokens.adjust(estimated_tokens - actual_tokens)
+            self._condition.notify_all()
+
+    def _pause_model(self, model: str, seconds: float):
+        """After a 429 every caller of the model waits, not just the one that was rejected."""
+        with self._condition:
+            limiter = self._limiter(model)
+            limiter.blocked_until = max(limiter.blocked_until, time.monotonic() + seconds)
+            self.rate_limited += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """The delay before the next attempt, or None if the server asks for a longer wait than allowed."""
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            # The server knows when capacity returns; backoff_max only bounds our own guesses
+            if retry_after > self.retry_after_max:
+                return None
+            return retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _on_error(self, model: str, error: Exception, attempt: int) -> Optional[float]:
+        """Returns the delay before the next attempt, or None if the call should give up."""
+        delay = self._retry_delay(error, attempt)
+        if isinstance(error, openai.RateLimitError):
+            self._pause_model(model, self.retry_after_max if delay is None else delay)
+        if delay is None:
+            logger.warning(
+                f"LLM call to {model} failed ({type(error).__name__}) and asked to retry after more than "
+                f"{self.retry_after_max:.0f}s; giving up")
+            return None
+        with self._condition:
+            self.retries += 1
+        llm_retries.inc(model=model, error=type(error).__name__)
+        logger.warning(
+            f"LLM call to {model} failed ({type(error).__name__}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def call(self,
+             model: str,
+             estimated_tokens: int,
+             fn: Callable[[], Any],
+             priority: int = PRIORITY_BACKGROUND,
+             can_retry: Optional[Callable[[], bool]] = None) -> Any:
+        """Runs `fn` once capacity is available, retrying transient OpenAI errors."""
+        attempt = 0
+        while True:
+            with span("llm.queue_wait"):
+                self.acquire(model, estimated_tokens, priority)
+            try:
+                result = fn()
+                self.record_usage(model, estimated_tokens, _total_tokens(result))
+                return result
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries or (can_retry is not None and not can_retry()):
+                    raise
+                delay = self._on_error(model, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def async_call(self,
+                         model: str,
+                         estimated_tokens: int,
+                         fn: Callable[[], Awaitable[Any]],
+                         priority: int = PRIORITY_BACKGROUND) -> Any:
+        """Async variant of `call`; waiting for capacity suspends the coroutine, not a thread."""
+        attempt = 0
+        while True:
+            with span("llm.queue_wait"):
+                await self.async_acquire(model, estimated_tokens, priority)
+            try:
+                result = await fn()
+                self.record_usage(model, estimated_tokens, _total_tokens(result))
+                return result
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._on_error(model, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            now = time.monotonic()
+            models = {}
+            for model, limiter in self._limiters.items():
+                limiter.requests.wait_time(0, now)  # refill before reporting
+                limiter.tokens.wait_time(0, now)
+                models[model] = {
+                    "waiting": len(limiter.waiting),
+                    "requests_available": int(limiter.requests.tokens),
+                    "tokens_available": int(limiter.tokens.tokens),
+                    "paused_for": max(0.0, round(limiter.blocked_until - now, 2)),
+                }
+            return {"retries": self.retries, "rate_limited": self.rate_limited, "models": models}
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to backoff
+    return None
+
+
+def _total_tokens(result: Any) -> Optional[int]:
+    usage = getattr(result, "usage", None)
+    return getattr(usage, "total_tokens", None)
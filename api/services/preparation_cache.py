@@ -0,0 +1,48 @@
+import os
+import re
+import hashlib
+from typing import TYPE_CHECKING, Optional
+
+from api.prompts import QUESTION_GENERATION_MODEL, question_generation_prompt_version
+from api.utils.logger_config import logger
+from api.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from api.models import InterviewPreparation
+
+PREPARATION_CACHE_TTL_SECONDS = int(os.getenv("PREPARATION_CACHE_TTL_SECONDS", "86400"))
+PREPARATION_CACHE_MAX_ENTRIES = int(os.getenv("PREPARATION_CACHE_MAX_ENTRIES", "1000"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+preparation_cache = TTLCache(max_size=PREPARATION_CACHE_MAX_ENTRIES, ttl_seconds=PREPARATION_CACHE_TTL_SECONDS)
+
+
+def normalize_description(description: str) -> str:
+    """Collapses whitespace and case so trivially different pastes share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", description).strip().casefold()
+
+
+def description_hash(description: str) -> str:
+    """Content address of a job description for the current model and prompt version."""
+    key_material = "\x1f".join([
+        QUESTION_GENERATION_MODEL,
+        question_generation_prompt_version,
+        normalize_description(description),
+    ])
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def get_cached_preparation(description: str) -> Optional["InterviewPreparation"]:
+    interview_prep_data = preparation_cache.get(description_hash(description))
+    if interview_prep_data is not None:
+        logger.info("Interview preparation cache hit.")
+    return interview_prep_data
+
+
+def get_cached_preparation_by_hash(description_hash_value: str) -> Optional["InterviewPreparation"]:
+    return preparation_cache.get(description_hash_value)
+
+
+def cache_preparation(description: str, interview_prep_data: "InterviewPreparation"):
+    preparation_cache.set(description_hash(description), interview_prep_data)
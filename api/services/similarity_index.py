@@ -0,0 +1,165 @@
+import os
+import re
+import hashlib
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+SIMILAR_JOB_REUSE_ENABLED = os.getenv("SIMILAR_JOB_REUSE_ENABLED", "true").lower() == "true"
+# Estimated Jaccard similarity of the descriptions' shingle sets needed to reuse a question set
+SIMILAR_JOB_THRESHOLD = float(os.getenv("SIMILAR_JOB_THRESHOLD", "0.85"))
+# Roughly 1 KB per entry; the oldest entries are overwritten once the index is full
+SIMILARITY_INDEX_MAX_ENTRIES = int(os.getenv("SIMILARITY_INDEX_MAX_ENTRIES", "200000"))
+
+SHINGLE_WORDS = 4
+SIGNATURE_SIZE = 64
+# 8 bands of 8 rows: a description at 0.85 similarity shares a band with its match ~92% of the time
+BANDS = 8
+ROWS_PER_BAND = SIGNATURE_SIZE // BANDS
+
+_WORD_RE = re.compile(r"\w+")
+_VALUE_MASK = 0xFFFFFFFF
+
+
+@dataclass
+class SimilarJob:
+    job_id: str
+    description_hash: str
+    similarity: float
+
+
+def _shingles(description: str) -> set:
+    """
+    Word 4-grams taken within lines, so reordered bullets and an edited location line only
+    change the shingles of the lines involved. Short lines count as one shingle.
+    """
+    shingles = set()
+    for line in description.casefold().splitlines():
+        words = _WORD_RE.findall(line)
+        if len(words) <= SHINGLE_WORDS:
+            if words:
+                shingles.add(" ".join(words))
+            continue
+        for i in range(len(words) - SHINGLE_WORDS + 1):
+            shingles.add(" ".join(words[i:i + SHINGLE_WORDS]))
+    return shingles
+
+
+def minhash_signature(description: str) -> Optional[List[int]]:
+    """
+    One-permutation MinHash: each shingle is hashed once and lands in one of SIGNATURE_SIZE
+    bins, keeping the bin minimum. Empty bins borrow from the next filled bin (densification).
+    Returns None for text without words.
+    """
+    signature = [None] * SIGNATURE_SIZE
+    for shingle in _shingles(description):
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        bin_index = h % SIGNATURE_SIZE
+        value = (h // SIGNATURE_SIZE) & _VALUE_MASK
+        if signature[bin_index] is None or value < signature[bin_index]:
+            signature[bin_index] = value
+
+    if all(value is None for value in signature):
+        return None
+
+    for i in range(SIGNATURE_SIZE):
+        offset = 1
+        while signature[i] is None:
+            borrowed = signature[(i + offset) % SIGNATURE_SIZE]
+            if borrowed is not None:
+                # Offset keeps borrowed values distinguishable from the bin they came from
+                signature[i] = (borrowed + offset * 0x9E3779B1) & _VALUE_MASK
+            offset += 1
+    return signature
+
+
+class SimilarJobIndex:
+    """
+    LSH index over MinHash signatures of completed jobs' processed descriptions.
+    A lookup probes BANDS dictionaries and compares the few candidates' signatures, so its
+    cost does not grow with the number of indexed jobs. Signatures live in one flat array
+    used as a ring buffer of `max_entries` slots.
+    """
+
+    def __init__(self, max_entries: int = SIMILARITY_INDEX_MAX_ENTRIES, threshold: float = SIMILAR_JOB_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._signatures = array("I")
+        self._job_ids: List[str] = []
+        self._description_hashes: List[str] = []
+        self._slots_by_job: Dict[str, int] = {}
+        self._bands: List[Dict[int, int]] = [{} for _ in range(BANDS)]
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_keys(signature) -> List[int]:
+        return [hash(tuple(signature[b * ROWS_PER_BAND:(b + 1) * ROWS_PER_BAND])) for b in range(BANDS)]
+
+    def _slot_signature(self, slot: int):
+        return self._signatures[slot * SIGNATURE_SIZE:(slot + 1) * SIGNATURE_SIZE]
+
+    def add(self, job_id, description: str, description_hash: str):
+        signature = minhash_signature(description)
+        if signature is None:
+            return
+        job_id = str(job_id)
+        band_keys = self._band_keys(signature)
+
+        with self._lock:
+            if job_id in self._slots_by_job:
+                return
+
+            slot = self._next_slot
+            if slot < len(self._job_ids):
+                self._evict(slot)
+                self._signatures[slot * SIGNATURE_SIZE:(slot + 1) * SIGNATURE_SIZE] = array("I", signature)
+                self._job_ids[slot] = job_id
+                self._description_hashes[slot] = description_hash
+            else:
+                self._signatures.extend(signature)
+                self._job_ids.append(job_id)
+                self._description_hashes.append(description_hash)
+
+            self._slots_by_job[job_id] = slot
+            for band, key in zip(self._bands, band_keys):
+                band[key] = slot  # The newest job wins a shared bucket
+            self._next_slot = (slot + 1) % self.max_entries
+
+    def _evict(self, slot: int):
+        for band, key in zip(self._bands, self._band_keys(self._slot_signature(slot))):
+            if band.get(key) == slot:
+                del band[key]
+        self._slots_by_job.pop(self._job_ids[slot], None)
+
+    def find_similar(self, description: str, exclude_job_id=None) -> Optional[SimilarJob]:
+        """Returns the most similar indexed job at or above the threshold, if any."""
+        signature = minhash_signature(description)
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+        exclude_job_id = str(exclude_job_id) if exclude_job_id else None
+
+        with self._lock:
+            candidates = {slot for band, key in zip(self._bands, band_keys)
+                          if (slot := band.get(key)) is not None}
+
+            best = None
+            for slot in candidates:
+                if self._job_ids[slot] == exclude_job_id:
+                    continue
+                stored = self._slot_signature(slot)
+                similarity = sum(1 for a, b in zip(signature, stored) if a == b) / SIGNATURE_SIZE
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = SimilarJob(self._job_ids[slot], self._description_hashes[slot], similarity)
+        return best
+
+    def __len__(self) -> int:
+        return len(self._slots_by_job)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._slots_by_job), "max_size": self.max_entries}
+
+
+similar_job_index = SimilarJobIndex()
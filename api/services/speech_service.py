@@ -1,32 +1,151 @@
 import os
+import time
+import asyncio
+import threading
+import httpx
 import requests
 
-from dotenv import load_dotenv
+from typing import Optional
+from api.utils.http_pool import get_async_httpx_client, get_http_session
 from api.utils.logger_config import logger
+from api.utils.metrics import timed
 
-load_dotenv()
+# Azure issues tokens valid for 10 minutes; refresh a little ahead of that.
+SPEECH_TOKEN_TTL_SECONDS = int(os.getenv("SPEECH_TOKEN_TTL_SECONDS", "540"))
+SPEECH_TOKEN_REFRESH_AHEAD_SECONDS = int(os.getenv("SPEECH_TOKEN_REFRESH_AHEAD_SECONDS", "120"))
+# Clients use a token for a whole practice session; never hand out one closer to expiry than this
+SPEECH_TOKEN_MIN_REMAINING_SECONDS = int(os.getenv("SPEECH_TOKEN_MIN_REMAINING_SECONDS", "300"))
+# Overridable so the service can be pointed at a local stand-in (see benchmarks/)
+SPEECH_TOKEN_ENDPOINT = os.getenv(
+    "SPEECH_TOKEN_ENDPOINT", "https://{region}.api.cognitive.microsoft.com/sts/v1.0/issueToken")
 
 
 class SpeechService:
-    def __init__(self):
+    def __init__(self,
+                 token_ttl_seconds: int = SPEECH_TOKEN_TTL_SECONDS,
+                 refresh_ahead_seconds: int = SPEECH_TOKEN_REFRESH_AHEAD_SECONDS,
+                 min_remaining_seconds: int = SPEECH_TOKEN_MIN_REMAINING_SECONDS):
         self.speech_key = os.getenv("SPEECH_KEY")
         self.speech_region = os.getenv("NEXT_PUBLIC_SPEECH_REGION")
         if not self.speech_key or not self.speech_region:
             logger.error("Speech key or region not configured in environment variables.")
 
+        self.token_ttl_seconds = token_ttl_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        # A fresh token must be servable, or every request would fetch a new one
+        self.min_remaining_seconds = min(min_remaining_seconds, token_ttl_seconds // 2)
+
+        self._token: Optional[str] = None
+        self._expires_at: float = 0.0
+        self._refresh_lock = threading.Lock()
+        self._async_refresh_lock: Optional[asyncio.Lock] = None
+        self._refreshing = False
+
+    @property
+    def token_expires_in(self) -> int:
+        """Seconds until the cached token expires (0 if none is cached)."""
+        return max(0, int(self._expires_at - time.time()))
+
+    def _servable(self, now: float) -> bool:
+        """Whether the cached token has at least `min_remaining_seconds` of validity left."""
+        return bool(self._token) and now < self._expires_at - self.min_remaining_seconds
+
+    @timed("speech_token")
     def get_speech_token(self):
+        """
+        Returns a cached speech token with at least `min_remaining_seconds` of validity left.
+        A token approaching that limit is refreshed in the background while the cached one is
+        still served; past it the token is refreshed synchronously. Only one refresh runs at a time.
+        """
         if not self.speech_key or not self.speech_region:
             raise ConnectionError("Speech service not configured.")
 
+        now = time.time()
+        token, expires_at = self._token, self._expires_at
+        serve_until = expires_at - self.min_remaining_seconds
+
+        if token and now < serve_until - self.refresh_ahead_seconds:
+            return token
+
+        if token and now < serve_until:
+            self._start_background_refresh()
+            return token
+
+        with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._servable(time.time()):
+                return self._token
+            return self._refresh_token()
+
+    @timed("speech_token")
+    async def async_get_speech_token(self):
+        """
+        Async variant of `get_speech_token` sharing the same cache. Expired tokens are
+        refreshed with the async HTTP client; one refresh at a time per event loop.
+        """
+        if not self.speech_key or not self.speech_region:
+            raise ConnectionError("Speech service not configured.")
+
+        now = time.time()
+        token, expires_at = self._token, self._expires_at
+        serve_until = expires_at - self.min_remaining_seconds
+
+        if token and now < serve_until - self.refresh_ahead_seconds:
+            return token
+
+        if token and now < serve_until:
+            self._start_background_refresh()
+            return token
+
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+
+        async with self._async_refresh_lock:
+            if self._servable(time.time()):
+                return self._token
+
+            token = await self._async_fetch_speech_token()
+            self._token = token
+            self._expires_at = time.time() + self.token_ttl_seconds
+            return token
+
+    def _start_background_refresh(self):
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        refresh_thread = threading.Thread(target=self._background_refresh)
+        refresh_thread.daemon = True
+        refresh_thread.start()
+
+    def _background_refresh(self):
+        try:
+            with self._refresh_lock:
+                self._refresh_token()
+        except ConnectionError:
+            pass  # Already logged; the cached token stays valid until it expires
+        finally:
+            self._refreshing = False
+
+    def _refresh_token(self) -> str:
+        """Fetches a new token from Azure and caches it. Caller must hold the refresh lock."""
+        token = self._fetch_speech_token()
+        self._token = token
+        self._expires_at = time.time() + self.token_ttl_seconds
+        return token
+
+    @timed("speech.issue_token")
+    def _fetch_speech_token(self) -> str:
         headers = {
             "Ocp-Apim-Subscription-Key": self.speech_key,
             "Content-Type": "application/x-www-form-urlencoded",
         }
-        token_url = f"https://{self.speech_region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
+        token_url = SPEECH_TOKEN_ENDPOINT.format(region=self.speech_region)
 
         logger.debug("Requesting speech token")
         try:
-            token_response = requests.post(token_url, headers=headers, timeout=10)
+            token_response = get_http_session().post(token_url, headers=headers, timeout=10)
             token_response.raise_for_status()  # Raises HTTPError for bad responses (4xx or 5xx)
             logger.debug("Successfully obtained speech token.")
             return token_response.text
@@ -34,9 +153,35 @@ class SpeechService:
             logger.error(f"Failed to get speech token: {str(e)}")
             raise ConnectionError(f"Failed to get speech token: {str(e)}") from e
 
+    @timed("speech.issue_token")
+    async def _async_fetch_speech_token(self) -> str:
+        headers = {
+            "Ocp-Apim-Subscription-Key": self.speech_key,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        token_url = SPEECH_TOKEN_ENDPOINT.format(region=self.speech_region)
+
+        logger.debug("Requesting speech token (async)")
+        try:
+            token_response = await get_async_httpx_client().post(token_url, headers=headers, timeout=10)
+            token_response.raise_for_status()
+            logger.debug("Successfully obtained speech token.")
+            return token_response.text
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get speech token: {str(e)}")
+            raise ConnectionError(f"Failed to get speech token: {str(e)}") from e
+
+
+_default_speech_service: Optional[SpeechService] = None
+_default_speech_service_lock = threading.Lock()
 
-default_speech_service = SpeechService()
 
+def get_default_speech_service() -> SpeechService:
+    """Returns the process-wide speech service, created on first use."""
+    global _default_speech_service
 
-def get_default_speech_service():
-    return default_speech_service
+    if _default_speech_service is None:
+        with _default_speech_service_lock:
+            if _default_speech_service is None:
+                _default_speech_service = SpeechService()
+    return _default_speech_service
@@ -0,0 +1,394 @@
+import os
+import math
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from flask import g, jsonify, make_response, request
+
+from api.utils.authentication import validate_token_and_get_user_id
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import metrics, span
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Multiplies every rate and burst below, to loosen or tighten all limits without a deploy
+ADMISSION_LIMIT_SCALE = float(os.getenv("ADMISSION_LIMIT_SCALE", "1.0"))
+# LLM-bound requests served at once across all worker processes sharing the store
+ADMISSION_LLM_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_LLM_MAX_IN_FLIGHT", "32"))
+ADMISSION_LLM_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_LLM_RETRY_AFTER_SECONDS", "2"))
+# A slot held longer than this (e.g. by a killed process) is reclaimed
+ADMISSION_LLM_LEASE_SECONDS = float(os.getenv("ADMISSION_LLM_LEASE_SECONDS", "120"))
+ADMISSION_DB_PATH = os.getenv("ADMISSION_DB_PATH", "admission.db")
+# Behind a proxy (Vercel) the client address comes from this header instead of the socket
+ADMISSION_CLIENT_IP_HEADER = os.getenv("ADMISSION_CLIENT_IP_HEADER", "X-Forwarded-For" if os.getenv("VERCEL_URL") else "")
+
+# Buckets untouched this long are full again and can be forgotten
+_BUCKET_IDLE_SECONDS = 3600
+_PRUNE_EVERY = 1000
+
+admission_rejections = metrics.counter(
+    "hiremeplease_admission_rejections_total", "Requests rejected by admission control by policy and reason.",
+    ["policy", "reason"])
+llm_in_flight = metrics.gauge(
+    "hiremeplease_llm_requests_in_flight", "LLM-bound requests being served, across processes sharing the store.")
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """Token-bucket limits of one group of routes, per client and for all clients together."""
+    name: str
+    client_per_minute: float
+    client_burst: float
+    route_per_minute: Optional[float] = None
+    uses_llm: bool = False
+
+    def buckets(self, identity: str) -> List[Tuple[str, float, float]]:
+        """(key, capacity, refill per second) of every bucket a request must take tokens from."""
+        buckets = [(f"{self.name}:{identity}",
+                    self.client_burst * ADMISSION_LIMIT_SCALE,
+                    self.client_per_minute * ADMISSION_LIMIT_SCALE / 60)]
+        if self.route_per_minute:
+            # Allows a minute's worth of requests at once across all clients
+            buckets.append((self.name,
+                            self.route_per_minute * ADMISSION_LIMIT_SCALE,
+                            self.route_per_minute * ADMISSION_LIMIT_SCALE / 60))
+        return buckets
+
+
+# Job creation is cheap for the request but costs an LLM generation per job in the background
+JOB_CREATION_POLICY = AdmissionPolicy("jobs", client_per_minute=20, client_burst=20, route_per_minute=600)
+ANSWER_ANALYSIS_POLICY = AdmissionPolicy(
+    "analyses", client_per_minute=30, client_burst=10, route_per_minute=400, uses_llm=True)
+# Every live session holds a slot in a bounded in-memory store, so starting them is limited too
+SESSION_START_POLICY = AdmissionPolicy("analysis-sessions", client_per_minute=10, client_burst=5,
+                                       route_per_minute=600)
+# Pushed segments are analyzed in the background, so they take tokens but no in-flight slot
+SEGMENT_ANALYSIS_POLICY = AdmissionPolicy("analysis-segments", client_per_minute=120, client_burst=30,
+                                          route_per_minute=2000)
+
+
+@dataclass
+class Rejection:
+    status: int
+    reason: str
+    retry_after: float
+    error: str
+
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class MemoryAdmissionStore:
+    """Bucket and in-flight state of this process only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._leases: Dict[int, Tuple[float, int]] = {}  # lease -> (expires_at, slots)
+        self._next_lease = 0
+        self._lock = threading.Lock()
+        self._takes = 0
+
+    def take(self, buckets: List[Tuple[str, float, float]], cost: float) -> float:
+        """
+        Takes `cost` tokens from every bucket, or from none. Returns 0 or the seconds until all have enough.
+        A cost above a bucket's capacity is admitted once it is full and leaves it in debt.
+        """
+        now = time.time()
+        with self._lock:
+            self._takes += 1
+            if self._takes % _PRUNE_EVERY == 0:
+                self._buckets = {key: state for key, state in self._buckets.items()
+                                 if state[1] > now - _BUCKET_IDLE_SECONDS}
+
+            levels = []
+            for key, capacity, rate in buckets:
+                tokens, updated_at = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + (now - updated_at) * rate))
+
+            wait = _wait_time(buckets, levels, cost)
+            for (key, capacity, _), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens - (cost if wait == 0 else 0), now)
+            return wait
+
+    def acquire_slot(self, limit: int, slots: int = 1) -> Optional[int]:
+        """Leases `slots` in-flight slots at once, or none if fewer than that are free."""
+        now = time.time()
+        with self._lock:
+            self._leases = {lease: state for lease, state in self._leases.items() if state[0] > now}
+            if sum(state[1] for state in self._leases.values()) + slots > limit:
+                return None
+            self._next_lease += 1
+            self._leases[self._next_lease] = (now + ADMISSION_LLM_LEASE_SECONDS, slots)
+            return self._next_lease
+
+    def release_slot(self, lease: int):
+        with self._lock:
+            self._leases.pop(lease, None)
+
+    def in_flight(self) -> int:
+        now = time.time()
+        with self._lock:
+            return sum(slots for expires_at, slots in self._leases.values() if expires_at > now)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS llm_leases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    expires_at REAL NOT NULL,
+    slots INTEGER NOT NULL DEFAULT 1
+);
+"""
+
+
+class SQLiteAdmissionStore:
+    """
+    Bucket and in-flight state in a SQLite file, shared by every worker process on the host.
+    Each decision is one short write transaction; in-flight slots are leases that expire,
+    so a crashed process cannot hold them forever.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = ADMISSION_DB_PATH):
+        self.path = path
+        self._takes = 0
+        self._local = threading.local()
+
+        self._connection().execute("PRAGMA journal_mode=WAL")
+        self._connection().executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection().execute("PRAGMA table_info(llm_leases)")}
+        if "slots" not in columns:  # Files created before leases could hold several slots
+            self._connection().execute("ALTER TABLE llm_leases ADD COLUMN slots INTEGER NOT NULL DEFAULT 1")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread: requests decide admission without reconnecting
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def take(self, buckets: List[Tuple[str, float, float]], cost: float) -> float:
+        with self._transaction() as conn:
+            now = time.time()  # Read after the write lock is held; other processes may have waited on it
+            self._takes += 1  # The write lock also serializes this process's threads
+            if self._takes % _PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM buckets WHERE updated_at <= ?", (now - _BUCKET_IDLE_SECONDS,))
+
+            levels = []
+            for key, capacity, rate in buckets:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                levels.append(min(capacity, tokens + (now - updated_at) * rate))
+
+            wait = _wait_time(buckets, levels, cost)
+            conn.executemany(
+                "INSERT INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                [(key, tokens - (cost if wait == 0 else 0), now)
+                 for (key, _, _), tokens in zip(buckets, levels)]
+            )
+            return wait
+
+    def acquire_slot(self, limit: int, slots: int = 1) -> Optional[int]:
+        with self._transaction() as conn:
+            now = time.time()
+            conn.execute("DELETE FROM llm_leases WHERE expires_at <= ?", (now,))
+            if conn.execute("SELECT COALESCE(SUM(slots), 0) FROM llm_leases").fetchone()[0] + slots > limit:
+                return None
+            cursor = conn.execute("INSERT INTO llm_leases (expires_at, slots) VALUES (?, ?)",
+                                  (now + ADMISSION_LLM_LEASE_SECONDS, slots))
+            return cursor.lastrowid
+
+    def release_slot(self, lease: int):
+        self._connection().execute("DELETE FROM llm_leases WHERE id = ?", (lease,))
+
+    def in_flight(self) -> int:
+        return self._connection().execute(
+            "SELECT COALESCE(SUM(slots), 0) FROM llm_leases WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+
+def _wait_time(buckets: List[Tuple[str, float, float]], levels: List[float], cost: float) -> float:
+    wait = 0.0
+    for (_, capacity, rate), tokens in zip(buckets, levels):
+        # A request larger than the bucket is admitted once the bucket is full; it is still
+        # charged in full, and the debt delays the client's next requests
+        needed = min(cost, capacity)
+        if tokens < needed:
+            wait = max(wait, (needed - tokens) / rate)
+    return wait
+
+
+def get_admission_store_backend() -> str:
+    """
+    Selects the store from ADMISSION_STORE. Defaults to process memory on Vercel, where
+    every instance is a separate machine, and to a SQLite file shared by local workers elsewhere.
+    """
+    default_backend = "memory" if os.getenv("VERCEL_URL") else "sqlite"
+    return os.getenv("ADMISSION_STORE", default_backend).lower()
+
+
+class AdmissionController:
+    """Decides whether a request is served now or rejected right away with a Retry-After."""
+
+    def __init__(self, llm_max_in_flight: int = ADMISSION_LLM_MAX_IN_FLIGHT):
+        self.llm_max_in_flight = llm_max_in_flight
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    backend = get_admission_store_backend()
+                    if backend == "sqlite":
+                        self._store = SQLiteAdmissionStore()
+                    elif backend == "memory":
+                        self._store = MemoryAdmissionStore()
+                    else:
+                        raise ValueError(f"Unknown admission store: {backend}")
+                    metrics.on_collect(lambda: llm_in_flight.set(self._store.in_flight()))
+                    logger.info(f"Using '{backend}' admission store.")
+        return self._store
+
+    def admit(self,
+              policy: AdmissionPolicy,
+              identity: str,
+              cost: float = 1,
+              slots: int = 1) -> Tuple[Optional[Rejection], Optional[int]]:
+        """
+        Returns (rejection, lease). A request that is let in gets no rejection and, for LLM-bound
+        policies, a lease on `slots` in-flight slots (one per concurrent LLM call it makes) that
+        must be passed to `release`.
+        """
+        try:
+            wait = self.store.take(policy.buckets(identity), cost)
+            if wait > 0:
+                return self._reject(policy, identity, Rejection(
+                    429, "rate_limited", wait, "Too many requests, please retry later")), None
+
+            if not policy.uses_llm:
+                return None, None
+            lease = self.store.acquire_slot(self.llm_max_in_flight, max(1, min(slots, self.llm_max_in_flight)))
+            if lease is None:
+                return self._reject(policy, identity, Rejection(
+                    503, "llm_saturated", ADMISSION_LLM_RETRY_AFTER_SECONDS,
+                    "Service is at capacity, please retry shortly")), None
+            return None, lease
+
+        except Exception as e:
+            # Admission control must not take the API down with it
+            logger.error(f"Admission control failed for {policy.name}, admitting the request: {e}")
+            return None, None
+
+    @staticmethod
+    def _reject(policy: AdmissionPolicy, identity: str, rejection: Rejection) -> Rejection:
+        admission_rejections.inc(policy=policy.name, reason=rejection.reason)
+        sampled_logger.warning(
+            f"Admission: rejected {policy.name} request from {identity} ({rejection.reason}, "
+            f"retry after {rejection.retry_after:.1f}s)")
+        return rejection
+
+    def release(self, lease: Optional[int]):
+        if lease is None:
+            return
+        try:
+            self.store.release_slot(lease)
+        except Exception as e:
+            logger.error(f"Admission control failed to release in-flight slot {lease}: {e}")
+
+
+admission_controller = AdmissionController()
+
+
+def client_identity(headers: Mapping[str, str], remote_addr: Optional[str], user_id=None) -> str:
+    """The signed-in user if there is one, otherwise the client address."""
+    if user_id is None:
+        auth_header = headers.get("Authorization") or ""
+        if auth_header.startswith("Bearer "):
+            try:
+                user_id = validate_token_and_get_user_id(auth_header.split(" ")[1])
+            except Exception:
+                user_id = None
+    if user_id:
+        return f"user:{user_id}"
+
+    forwarded = headers.get(ADMISSION_CLIENT_IP_HEADER) if ADMISSION_CLIENT_IP_HEADER else None
+    client_ip = forwarded.split(",")[0].strip() if forwarded else remote_addr
+    return f"ip:{client_ip or 'unknown'}"
+
+
+def admission_control(policy: AdmissionPolicy,
+                      cost: Optional[Callable[[Optional[dict]], int]] = None,
+                      slots: Optional[Callable[[Optional[dict]], int]] = None):
+    """
+    Decorator for routes that consume rate-limited capacity. Place it below `login_optional`
+    so signed-in users are limited per user rather than per address. `cost` maps the JSON body
+    to a number of tokens, for routes that carry several units of work per request, and `slots`
+    to the number of LLM calls the route runs at once.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def decorated_function(*args, **kwargs):
+            if not ADMISSION_ENABLED:
+                return func(*args, **kwargs)
+
+            with span("admission"):
+                identity = client_identity(request.headers, request.remote_addr, g.get("user_id"))
+                body = request.get_json(silent=True)
+                tokens = max(1, cost(body) if cost else 1)
+                rejection, lease = admission_controller.admit(policy, identity, tokens, slots(body) if slots else 1)
+
+            if rejection is not None:
+                return jsonify({"error": rejection.error}), rejection.status, rejection.headers()
+            if lease is None:
+                return func(*args, **kwargs)
+
+            try:
+                response = make_response(func(*args, **kwargs))
+            except Exception:
+                admission_controller.release(lease)
+                raise
+            if response.is_streamed:
+                # Streamed bodies are still calling the LLM after the view returns
+                response.call_on_close(lambda: admission_controller.release(lease))
+            else:
+                admission_controller.release(lease)
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def body_items_cost(key: str, maximum: Optional[int] = None) -> Callable[[Optional[dict]], int]:
+    """Cost of a batch request: the length of the list under `key` in its JSON body, up to `maximum`."""
+    def cost(body: Optional[dict]) -> int:
+        items = body.get(key) if isinstance(body, dict) else None
+        count = len(items) if isinstance(items, list) else 1
+        return min(count, maximum) if maximum else count
+    return cost
@@ -1,18 +1,33 @@
 import jwt
 import os
+import time
+import hashlib
 
 from typing import Optional
 from uuid import UUID
-from dotenv import load_dotenv
 from jwt import ExpiredSignatureError, InvalidTokenError
 from functools import wraps
 from flask import request, g, jsonify
 
-from api.utils.logger_config import logger
-
-load_dotenv()
+from api.utils.jwks_cache import jwks_cache
+from api.utils.logger_config import logger, sampled_logger
+from api.utils.metrics import span
+from api.utils.ttl_cache import TTLCache
 
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+# Supabase projects using asymmetric signing keys publish them as a JWKS
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+AUTH_CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CLAIMS_CACHE_MAX_ENTRIES", "10000"))
+# Used for tokens without an `exp` claim; other tokens are cached until they expire
+AUTH_CLAIMS_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CLAIMS_CACHE_TTL_SECONDS", "300"))
+AUTH_NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("AUTH_NEGATIVE_CACHE_TTL_SECONDS", "60"))
+# Lifetime of tokens minted for background workers acting on behalf of a user
+WORKER_JWT_TTL_SECONDS = int(os.getenv("WORKER_JWT_TTL_SECONDS", "3600"))
+
+# Verified user ids keyed by token digest, so repeat requests with the same token skip verification
+verified_claims_cache = TTLCache(max_size=AUTH_CLAIMS_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CLAIMS_CACHE_TTL_SECONDS)
+_INVALID_TOKEN = object()  # Negative cache entry
 
 
 def login_required(func):
@@ -23,7 +38,9 @@ def login_required(func):
 
     @wraps(func)
     def decorated_function(*args, **kwargs):
-        if not get_current_user():
+        with span("auth"):
+            user_id = get_current_user()
+        if not user_id:
             logger.warning("Unauthorized access attempt.")
             return jsonify({"error": "Authentication required"}), 401
         return func(*args, **kwargs)
@@ -39,7 +56,8 @@ def login_optional(func):
 
     @wraps(func)
     def decorated_function(*args, **kwargs):
-        get_current_user()
+        with span("auth"):
+            get_current_user()
         return func(*args, **kwargs)
 
     return decorated_function
@@ -53,7 +71,7 @@ def get_current_user() -> Optional[UUID]:
     """
     auth_header = request.headers.get("Authorization")
     if not auth_header:
-        logger.warning("Authorization header is missing. No user is authenticated.")
+        sampled_logger.debug("Authorization header is missing. No user is authenticated.")
         return None
 
     if not auth_header.startswith("Bearer "):
@@ -67,7 +85,7 @@ def get_current_user() -> Optional[UUID]:
     # Store refresh token
     refresh_token = request.headers.get("refresh-token", None)
     if not refresh_token:
-        logger.warning("Refresh token is missing")
+        sampled_logger.warning("Refresh token is missing")
 
     g.refresh_token = refresh_token
 
@@ -78,33 +96,94 @@ def get_current_user() -> Optional[UUID]:
 
 
 def validate_token_and_get_user_id(token: str) -> Optional[UUID]:
-    if not SUPABASE_JWT_SECRET:
-        logger.error("SUPABASE_JWT_SECRET is not configured.")
-        return None
+    """
+    Returns the user id of a valid token. Results are cached per token: valid tokens until
+    their `exp`, invalid ones for AUTH_NEGATIVE_CACHE_TTL_SECONDS.
+    """
+    cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    cached = verified_claims_cache.get(cache_key)
+    if cached is not None:
+        return None if cached is _INVALID_TOKEN else cached
+
+    user_id, expires_at = _verify_token(token)
+    if user_id is not None:
+        ttl_seconds = expires_at - time.time() if expires_at else AUTH_CLAIMS_CACHE_TTL_SECONDS
+        verified_claims_cache.set(cache_key, user_id, ttl_seconds=ttl_seconds)
+    elif expires_at == 0:
+        # Definitive rejection; configuration or network problems (None) are not cached
+        verified_claims_cache.set(cache_key, _INVALID_TOKEN, ttl_seconds=AUTH_NEGATIVE_CACHE_TTL_SECONDS)
+    return user_id
+
+
+def _verification_key(token: str):
+    """Picks the key for the token's algorithm: the JWT secret for HS256, the JWKS for asymmetric keys."""
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+
+    if algorithm == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            logger.error("SUPABASE_JWT_SECRET is not configured.")
+            return None, algorithm
+        return SUPABASE_JWT_SECRET, algorithm
+
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        return jwks_cache.get_signing_key(header.get("kid")), algorithm
 
+    raise InvalidTokenError(f"Unsupported signing algorithm {algorithm}")
+
+
+def _verify_token(token: str):
+    """
+    Returns (user_id, expires_at). On failure user_id is None; expires_at is 0 when the
+    token itself is invalid (cacheable) and None when it could not be checked.
+    """
     try:
+        key, algorithm = _verification_key(token)
+        if key is None:
+            if algorithm in ASYMMETRIC_ALGORITHMS and jwks_cache.loaded:
+                logger.warning("Token signed with a key that is not in the JWKS.")
+                return None, 0
+            return None, None
+
         payload = jwt.decode(
             token,
-            SUPABASE_JWT_SECRET,
-            algorithms=['HS256'],
+            key,
+            algorithms=[algorithm],
             audience="authenticated",
         )
         user_id = payload.get('sub')
 
         if not user_id:
             logger.warning("User ID (sub claim) not found in token payload.")
-            return None
+            return None, 0
 
-        logger.info(f"User ID extracted from token: {user_id[:8]}...")
-        return UUID(user_id)
+        sampled_logger.info(f"User ID extracted from token: {user_id[:8]}...")
+        return UUID(user_id), payload.get("exp")
 
     except ExpiredSignatureError:
         logger.warning("Token has expired.")
-        return None
+        return None, 0
     except InvalidTokenError as e:  # errors like invalid signature, malformed token etc.
         masked_token = f"{token[:5]}...{token[-5:]}" if len(token) > 10 else token
         logger.warning(f"Invalid token: {e}. Received {masked_token}")
-        return None
+        return None, 0
     except Exception as e:
         logger.error(f"An unexpected error occurred during token processing: {e}")
+        return None, None
+
+
+def mint_user_jwt(user_id: str, ttl_seconds: int = WORKER_JWT_TTL_SECONDS) -> Optional[str]:
+    """
+    Signs a short-lived access token for `user_id` with the project's JWT secret, so background
+    workers can act as the user without keeping the user's own tokens. None without a secret.
+    """
+    if not SUPABASE_JWT_SECRET:
+        logger.error("SUPABASE_JWT_SECRET is not configured. Cannot mint a token for a background job.")
         return None
+
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": str(user_id), "role": "authenticated", "aud": "authenticated", "iat": now, "exp": now + ttl_seconds},
+        SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
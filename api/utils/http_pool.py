@@ -0,0 +1,112 @@
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from api.utils.logger_config import logger
+
+# The HTTP libraries are imported when a pool is first built, not on the cold start
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "50"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "60"))
+
+_lock = threading.Lock()
+_requests_session = None
+_httpx_transport = None
+_httpx_client = None
+_async_httpx_client = None
+
+
+def get_http_session() -> "requests.Session":
+    """
+    Returns the process-wide keep-alive `requests` session used for outbound calls
+    (Azure speech, internal triggers). Connections are reused across requests.
+    """
+    global _requests_session
+
+    if _requests_session is None:
+        with _lock:
+            if _requests_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_MAX_KEEPALIVE,
+                    pool_maxsize=HTTP_POOL_MAX_CONNECTIONS,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _requests_session = session
+                logger.info("Shared HTTP session created.")
+
+    return _requests_session
+
+
+def get_httpx_transport() -> "httpx.HTTPTransport":
+    """
+    Returns the process-wide httpx transport. Every httpx client built on top of it
+    shares a single HTTP/2 keep-alive connection pool.
+    """
+    global _httpx_transport
+
+    if _httpx_transport is None:
+        with _lock:
+            if _httpx_transport is None:
+                import httpx
+
+                _httpx_transport = httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+                    ),
+                )
+                logger.info("Shared httpx transport created.")
+
+    return _httpx_transport
+
+
+def get_httpx_client() -> "httpx.Client":
+    """
+    Returns a shared httpx client on the pooled transport. Only suitable for callers
+    that pass their headers per request (e.g. the Supabase auth client).
+    """
+    global _httpx_client
+
+    if _httpx_client is None:
+        transport = get_httpx_transport()
+        with _lock:
+            if _httpx_client is None:
+                import httpx
+
+                _httpx_client = httpx.Client(transport=transport, follow_redirects=True)
+
+    return _httpx_client
+
+
+def get_async_httpx_client() -> "httpx.AsyncClient":
+    """
+    Returns the shared async httpx client. It belongs to the event loop that first uses it,
+    so it is only meant for the single-loop ASGI entry point.
+    """
+    global _async_httpx_client
+
+    if _async_httpx_client is None:
+        import httpx
+
+        _async_httpx_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info("Shared async httpx client created.")
+
+    return _async_httpx_client
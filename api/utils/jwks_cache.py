@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+from typing import Any, Dict, Optional
+
+from jwt import PyJWK
+from jwt.exceptions import PyJWKError
+
+from api.utils.http_pool import get_http_session
+from api.utils.logger_config import logger
+from api.utils.metrics import timed
+
+SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
+SUPABASE_JWKS_URL = os.getenv(
+    "SUPABASE_JWKS_URL", f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json" if SUPABASE_URL else "")
+JWKS_REFRESH_INTERVAL_SECONDS = int(os.getenv("JWKS_REFRESH_INTERVAL_SECONDS", "600"))
+# An unknown `kid` (key rotation) forces a refetch, but not more often than this
+JWKS_MIN_REFETCH_INTERVAL_SECONDS = int(os.getenv("JWKS_MIN_REFETCH_INTERVAL_SECONDS", "30"))
+
+
+class JWKSCache:
+    """
+    Local copy of the project's JSON Web Key Set. Keys past `refresh_interval` are still
+    served while a background refresh runs; only the first lookup, or a lookup for a `kid`
+    we have never seen, waits on the network.
+    """
+
+    def __init__(self,
+                 url: str = SUPABASE_JWKS_URL,
+                 refresh_interval: int = JWKS_REFRESH_INTERVAL_SECONDS,
+                 min_refetch_interval: int = JWKS_MIN_REFETCH_INTERVAL_SECONDS):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+
+        self._keys: Dict[str, PyJWK] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the key set has been fetched successfully at least once."""
+        return self._fetched_at > 0
+
+    def get_signing_key(self, kid: Optional[str]) -> Optional[Any]:
+        """Returns the verification key for `kid`, or None if the key set does not contain it."""
+        if not self.url:
+            logger.error("JWKS URL is not configured; cannot verify asymmetrically signed tokens.")
+            return None
+
+        now = time.time()
+        key = self._keys.get(kid)
+
+        if key is not None:
+            if now - self._fetched_at > self.refresh_interval:
+                self._start_background_refresh()
+            return key.key
+
+        with self._refresh_lock:
+            # Another caller may have fetched the key while we waited for the lock
+            key = self._keys.get(kid)
+            if key is None and time.time() - self._attempted_at >= self.min_refetch_interval:
+                self._refresh_keys()
+                key = self._keys.get(kid)
+
+        return key.key if key is not None else None
+
+    def _start_background_refresh(self):
+        with self._refresh_lock:
+            # While the endpoint is down, failed attempts are spaced like forced refetches
+            if self._refreshing or time.time() - self._attempted_at < self.min_refetch_interval:
+                return
+            self._refreshing = True
+
+        refresh_thread = threading.Thread(target=self._background_refresh)
+        refresh_thread.daemon = True
+        refresh_thread.start()
+
+    def _background_refresh(self):
+        try:
+            with self._refresh_lock:
+                self._refresh_keys()
+        finally:
+            self._refreshing = False
+
+    def _refresh_keys(self):
+        """Fetches the key set and replaces the cached keys. Caller must hold the refresh lock."""
+        self._attempted_at = time.time()
+        try:
+            jwks = self._fetch_jwks()
+        except Exception as e:
+            # Keep serving the keys we have; they stay usable until the issuer stops signing with them
+            logger.error(f"Failed to fetch JWKS from {self.url}: {e}")
+            return
+
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                key = PyJWK(jwk)
+            except PyJWKError as e:
+                # e.g. an RSA/EC key while the `cryptography` package is not installed
+                logger.warning(f"Skipping unusable JWK {jwk.get('kid')}: {e}")
+                continue
+            keys[jwk.get("kid")] = key
+
+        self._keys = keys
+        self._fetched_at = time.time()
+        logger.info(f"Loaded {len(keys)} signing key(s) from JWKS.")
+
+    @timed("auth.jwks_fetch")
+    def _fetch_jwks(self) -> Dict[str, Any]:
+        response = get_http_session().get(self.url, timeout=5)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._keys),
+            "age_seconds": round(time.time() - self._fetched_at, 1) if self._fetched_at else None,
+        }
+
+
+jwks_cache = JWKSCache()
@@ -1,8 +1,19 @@
+import os
+import re
 import sys
+import json
+import random
+import traceback
+
 from loguru import logger
 
-# Remove default logger
-logger.remove()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "console").lower()  # "console" or "json"
+# Records are handed to a background thread; the request thread never waits on stderr
+LOG_ENQUEUE = os.getenv("LOG_ENQUEUE", "true").lower() == "true"
+# Share of records from `sampled_logger` (per-request chatter) that is kept
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+LOG_MAX_MESSAGE_LENGTH = int(os.getenv("LOG_MAX_MESSAGE_LENGTH", "1000"))
 
 # Color configurations for different log levels (for console output)
 CONSOLE_FORMAT = (
@@ -12,13 +23,81 @@ CONSOLE_FORMAT = (
     "<bold>{level.icon} <level>{message}</level></bold>"
 )
 
+_REDACTIONS = (
+    (re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+"), "[REDACTED_JWT]"),
+    (re.compile(r"(?i)\bbearer\s+[\w.~+/=-]+"), "Bearer [REDACTED]"),
+    (re.compile(r"\bsk-[\w-]{8,}"), "sk-[REDACTED]"),
+)
+
+
+def _redact(text: str) -> str:
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _sanitize(record):
+    """Redacts credentials and truncates oversized messages before any sink sees them."""
+    message = _redact(record["message"])
+
+    if len(message) > LOG_MAX_MESSAGE_LENGTH:
+        message = f"{message[:LOG_MAX_MESSAGE_LENGTH]}... [truncated {len(message) - LOG_MAX_MESSAGE_LENGTH} chars]"
+
+    record["message"] = message
+
+
+def _sample(record) -> bool:
+    sample_rate = record["extra"].get("sample_rate")
+    return sample_rate is None or random.random() < sample_rate
+
+
+def _formatted_exception(record) -> str:
+    """The record's traceback with credentials redacted; exception messages often quote requests."""
+    return _redact("".join(traceback.format_exception(*record["exception"])))
+
+
+def _console_format(record) -> str:
+    # Loguru would append the raw traceback to a format string, so it is added here, redacted
+    if record["exception"]:
+        record["extra"]["formatted_exception"] = _formatted_exception(record)
+        return CONSOLE_FORMAT + "\n{extra[formatted_exception]}"
+    return CONSOLE_FORMAT + "\n"
+
+
+def _json_format(record) -> str:
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    extra = {key: value for key, value in record["extra"].items() if key not in ("sample_rate", "serialized")}
+    if extra:
+        payload["extra"] = extra
+    if record["exception"]:
+        payload["exception"] = _formatted_exception(record)
+
+    record["extra"]["serialized"] = json.dumps(payload, default=str)
+    return "{extra[serialized]}\n"
+
+
+# Remove default logger
+logger.remove()
+logger.configure(patcher=_sanitize)
+
 # Add handler for stderr to capture logs in Vercel.
 # Vercel captures stdout and stderr automatically.
 logger.add(
     sys.stderr,
-    format=CONSOLE_FORMAT,
-    level="DEBUG",  # Or your desired minimum level for Vercel logs
-    colorize=True,  # Keep color for local development if you run this locally
+    format=_json_format if LOG_FORMAT == "json" else _console_format,
+    level=LOG_LEVEL,
+    filter=_sample,
+    enqueue=LOG_ENQUEUE,
+    colorize=None if LOG_FORMAT != "json" else False,  # Color only when attached to a terminal
+    backtrace=False,
+    diagnose=False,  # Variable values in tracebacks could leak tokens
 )
 
 # Configure custom color levels and icons (cosmetic for console)
@@ -28,3 +107,6 @@ logger.level("WARNING", color="<yellow>", icon="⚠️")
 logger.level("ERROR", color="<red>", icon="❌")
 logger.level("CRITICAL", color="<red><bold>", icon="🚨")
 logger.level("DEBUG", color="<blue>", icon="🔍")
+
+# For high-volume, per-request messages: only LOG_SAMPLE_RATE of them are emitted
+sampled_logger = logger.bind(sample_rate=LOG_SAMPLE_RATE)
@@ -0,0 +1,136 @@
+"""
+Cold-start benchmark: every sample is a fresh interpreter, as on a new serverless instance.
+
+    python -m benchmarks.cold_start                          # all routes, 5 cold starts each
+    python -m benchmarks.cold_start --route analyses --runs 10
+    python -m benchmarks.cold_start --output cold.json       # save results
+    python -m benchmarks.cold_start --baseline cold.json     # compare against saved results
+
+For each route it reports the time to import api/index.py, the first (cold) and second (warm)
+request through the Flask test client, and the process wall time including interpreter startup.
+Outbound services are the local stand-ins from benchmarks/fakes.py; the job queue uses the
+HTTP trigger backend, as on Vercel.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from typing import Callable, Dict, List
+
+from .fakes import FakeBackend, FakeBackendConfig
+from .run import JWT_SECRET, _configure_environment, _delta
+
+_DESCRIPTION = "Backend Engineer\n\nBuild and operate Python services.\n\nRequirements:\n- 5+ years of Python"
+
+
+def _seed_job(backend: FakeBackend) -> Dict:
+    row = backend.tables.insert("job_descriptions", {"description": _DESCRIPTION, "status": "created"})[0]
+    return {"method": "POST", "path": "/api/internal/process-job-background",
+            "json": {"job_description_id": row["id"]}}
+
+
+def _fixed(method: str, path: str, body: Dict = None) -> Callable[[FakeBackend], Dict]:
+    return lambda backend: {"method": method, "path": path, "json": body}
+
+
+# Each factory returns a fresh request per call, so the warm request does not hit the same row
+ROUTES: Dict[str, Callable[[FakeBackend], Dict]] = {
+    "home": _fixed("GET", "/api"),
+    "speech-token": _fixed("GET", "/api/speech-token"),
+    "analyses": _fixed("POST", "/api/analyses", {
+        "answer_text": "I led the migration of our monolith to services.",
+        "question": "Tell me about a project you led."}),
+    "create-job": _fixed("POST", "/api/jobs", {"description": _DESCRIPTION}),
+    "process-job": _seed_job,
+}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--route", choices=[*ROUTES, "all"], default="all")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per route")
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--db-latency", type=float, default=0.0)
+    parser.add_argument("--speech-latency", type=float, default=0.0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare results against a JSON file written with --output")
+    return parser.parse_args()
+
+
+def _cold_start(backend: FakeBackend, route: str) -> Dict:
+    requests_json = json.dumps([ROUTES[route](backend), ROUTES[route](backend)])
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start_child", requests_json],
+        capture_output=True, text=True, timeout=120,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold start of {route} failed:\n{completed.stderr}")
+
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    sample["process_ms"] = wall_ms
+    return sample
+
+
+def _summarize(samples: List[Dict]) -> Dict:
+    summary = {
+        key: round(statistics.median(sample[key] for sample in samples), 1)
+        for key in ("process_ms", "import_ms", "first_request_ms", "second_request_ms")
+    }
+    summary["modules"] = samples[-1]["modules"]
+    summary["errors"] = sum(1 for sample in samples if sample["status"] >= 400)
+    return summary
+
+
+def _print_report(results: Dict[str, Dict], baseline: Dict):
+    keys = ("process_ms", "import_ms", "first_request_ms", "second_request_ms")
+    print(f"{'route (median)':<16}{'process ms':>12}{'import ms':>12}{'1st req ms':>12}{'2nd req ms':>12}"
+          f"{'modules':>9}{'errors':>8}")
+    for route, stats in results.items():
+        print(f"{route:<16}" + "".join(f"{stats[key]:>12}" for key in keys)
+              + f"{stats['modules']:>9}{stats['errors']:>8}")
+        previous = baseline.get(route)
+        if previous:
+            print(f"{'  vs baseline':<16}" + "".join(f"{_delta(stats[key], previous[key]):>12}" for key in keys))
+
+
+def main():
+    args = _parse_args()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("routes", {})
+
+    backend = FakeBackend(FakeBackendConfig(
+        llm_latency=args.llm_latency,
+        db_latency=args.db_latency,
+        speech_latency=args.speech_latency,
+    ), jwt_secret=JWT_SECRET)
+    backend.start()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Children inherit the environment and log only critical errors
+        _configure_environment(backend, work_dir, "CRITICAL")
+        os.environ["JOB_QUEUE_BACKEND"] = "http"
+
+        names = list(ROUTES) if args.route == "all" else [args.route]
+        results = {}
+        for name in names:
+            results[name] = _summarize([_cold_start(backend, name) for _ in range(args.runs)])
+
+    backend.stop()
+    _print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "routes": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
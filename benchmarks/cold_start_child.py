@@ -0,0 +1,37 @@
+"""
+One cold-start sample, run by benchmarks/cold_start.py in a fresh interpreter. Imports nothing
+before the app so the measured import time and module count are the app's own.
+
+    python -m benchmarks.cold_start_child '[{"method": "GET", "path": "/api", "json": null}, ...]'
+"""
+import os
+import sys
+import json
+import time
+
+
+def main(requests_json: str):
+    started = time.perf_counter()
+    from api.index import app
+    imported = time.perf_counter()
+
+    client = app.test_client()
+    timings = []
+    for spec in json.loads(requests_json):
+        request_started = time.perf_counter()
+        response = client.open(spec["path"], method=spec["method"], json=spec["json"])
+        timings.append((time.perf_counter() - request_started, response.status_code))
+
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_request_ms": timings[0][0] * 1000,
+        "second_request_ms": timings[1][0] * 1000,
+        "status": timings[0][1],
+        "modules": len(sys.modules),
+    }))
+    sys.stdout.flush()
+    os._exit(0)  # Do not wait for background threads (job triggers, token refreshes)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
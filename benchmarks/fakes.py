@@ -0,0 +1,395 @@
+"""
+Local stand-ins for the services the API talks to, served from one threaded HTTP server:
+
+- OpenAI chat completions (`/v1/chat/completions`), plain and streamed, returning
+  `InterviewPreparation` or `Feedback` JSON after a configurable latency.
+- An in-memory PostgREST (`/rest/v1/<table>`) covering the operations the repositories use,
+  plus the GoTrue `/auth/v1/user` lookup done by `set_session`.
+- The Azure speech `issueToken` endpoint.
+
+Every request is counted per endpoint so scenarios can report outbound calls.
+"""
+import json
+import time
+import uuid
+import random
+import hashlib
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import jwt
+
+STREAM_CHUNKS = 20
+_FILTER_OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in _in_list(b),
+    "not.in": lambda a, b: a not in _in_list(b),
+}
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "or", "and", "columns", "on_conflict"}
+
+
+class FakeBackendConfig:
+    def __init__(self,
+                 llm_latency: float = 0.5,
+                 db_latency: float = 0.005,
+                 speech_latency: float = 0.05,
+                 llm_rate_limit_ratio: float = 0.0,
+                 rpc_enabled: bool = True):
+        self.llm_latency = llm_latency
+        self.db_latency = db_latency
+        self.speech_latency = speech_latency
+        self.llm_rate_limit_ratio = llm_rate_limit_ratio
+        # False: database functions are missing, as before the supabase/migrations were applied
+        self.rpc_enabled = rpc_enabled
+
+
+class InMemoryTables:
+    """Tables keyed by name; rows are plain dicts. No row-level security is emulated."""
+
+    def __init__(self):
+        self.rows: Dict[str, List[Dict]] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def insert(self, table: str, payload) -> List[Dict]:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = payload if isinstance(payload, list) else [payload]
+        inserted = []
+        with self.lock:
+            for row in rows:
+                row = {"id": str(uuid.uuid4()), "created_at": now, **row}
+                if table == "job_descriptions":
+                    # Generated column of supabase/migrations
+                    row["description_preview"] = (row.get("description") or "")[:201]
+                self.rows[table].append(row)
+                inserted.append(dict(row))
+        return inserted
+
+    def select(self, table: str, filters, order: Optional[str], limit: Optional[int], embed: List[str]) -> List[Dict]:
+        with self.lock:
+            rows = [dict(row) for row in self.rows[table] if _matches(row, filters)]
+            for child in embed:
+                for row in rows:
+                    row[child] = [dict(c) for c in self.rows[child] if c.get(f"{table[:-1]}_id") == row["id"]]
+
+        for column, descending in reversed(_parse_order(order)):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column) or ""), reverse=descending)
+        return rows[:limit] if limit is not None else rows
+
+    def update(self, table: str, filters, changes: Dict) -> List[Dict]:
+        with self.lock:
+            updated = []
+            for row in self.rows[table]:
+                if _matches(row, filters):
+                    row.update(changes)
+                    updated.append(dict(row))
+            return updated
+
+    def delete(self, table: str, filters) -> List[Dict]:
+        with self.lock:
+            deleted = [row for row in self.rows[table] if _matches(row, filters)]
+            self.rows[table] = [row for row in self.rows[table] if not _matches(row, filters)]
+            return deleted
+
+    def complete_job(self, params: Dict) -> Optional[int]:
+        """Same effect as the complete_job function in supabase/migrations; None if the job does not exist."""
+        job_id = params["p_job_description_id"]
+        now = datetime.now(timezone.utc).isoformat()
+        with self.lock:
+            job = next((row for row in self.rows["job_descriptions"] if row["id"] == job_id), None)
+            if job is None:
+                return None
+            if job.get("status") == "completed":
+                return 0
+            self.rows["questions"] = [row for row in self.rows["questions"] if row.get("job_description_id") != job_id]
+            for question in params.get("p_questions") or []:
+                self.rows["questions"].append({"id": str(uuid.uuid4()), "created_at": now, **question,
+                                               "job_description_id": job_id})
+            job["title"] = params.get("p_title") or job.get("title")
+            job["status"] = "completed"
+            return len(params.get("p_questions") or [])
+
+
+def _matches(row: Dict, filters) -> bool:
+    for column, operator, value in filters:
+        cell = row.get(column)
+        if not _FILTER_OPERATORS[operator](None if cell is None else str(cell), value):
+            return False
+    return True
+
+
+def _parse_order(order: Optional[str]):
+    if not order:
+        return []
+    parsed = []
+    for part in order.split(","):
+        column, _, direction = part.partition(".")
+        parsed.append((column, direction.startswith("desc")))
+    return parsed
+
+
+def _in_list(operand: str) -> List[str]:
+    return [value.strip('"') for value in operand.strip("()").split(",")]
+
+
+def _parse_filters(params):
+    filters = []
+    for column, value in params:
+        if column in _RESERVED_PARAMS:
+            continue
+        operator, _, operand = value.partition(".")
+        if operator == "not":
+            negated, _, operand = operand.partition(".")
+            operator = f"not.{negated}"
+        if operator in _FILTER_OPERATORS:
+            filters.append((column, operator, operand.strip('"')))
+    return filters
+
+
+def _embedded_tables(select: str) -> List[str]:
+    return [part.split("(")[0].strip() for part in select.split(",") if "(" in part]
+
+
+def _interview_preparation(seed: str) -> Dict:
+    return {
+        "job_title": f"Benchmark Engineer {seed[:6]}",
+        "industry": "Software",
+        "experience_level": "Senior",
+        "behavioral_questions": [
+            {"question": f"Tell me about a time you led a project ({seed[:4]}-{i}).",
+             "category": "Leadership", "explanation": "Assesses ownership and communication."}
+            for i in range(5)
+        ],
+        "technical_questions": [
+            {"question": f"How would you scale service {seed[:4]}-{i}?",
+             "skill_area": "System design", "explanation": "Assesses architecture trade-offs."}
+            for i in range(5)
+        ],
+        "additional_notes": "Generated by the benchmark OpenAI stand-in.",
+    }
+
+
+def _feedback(seed: str) -> Dict:
+    return {
+        "Summary of Strengths": f"Clear structure ({seed[:6]}).",
+        "Areas for Improvement": "Quantify the impact.",
+        "Specific Suggestions": ["Use the STAR format.", "Mention metrics."],
+        "Practice Exercises": ["Rehearse a two-minute version."],
+        "Encouragement": "Good progress.",
+        "tagged_answer": [{"phrase": "I led", "type": "good", "comment": "Shows ownership."}],
+    }
+
+
+def _overall_feedback(seed: str) -> Dict:
+    feedback = _feedback(seed)
+    del feedback["tagged_answer"]
+    return feedback
+
+
+def _segment_analysis(seed: str) -> Dict:
+    return {
+        "tagged_answer": [{"phrase": "I led", "type": "good", "comment": f"Shows ownership ({seed[:6]})."}],
+        "notes": "Names the project and the candidate's role; the impact is not quantified yet.",
+    }
+
+
+# Structured-output schema name -> response factory
+_RESPONSES = {
+    "Feedback": _feedback,
+    "OverallFeedback": _overall_feedback,
+    "SegmentAnalysis": _segment_analysis,
+    "InterviewPreparation": _interview_preparation,
+}
+
+
+class FakeBackend:
+    """Starts the combined fake server on a free local port."""
+
+    def __init__(self, config: FakeBackendConfig, jwt_secret: str):
+        self.config = config
+        self.jwt_secret = jwt_secret
+        self.tables = InMemoryTables()
+        self.calls = Counter()
+        self._calls_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-backend", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, endpoint: str):
+        with self._calls_lock:
+            self.calls[endpoint] += 1
+
+    def reset_calls(self) -> Dict[str, int]:
+        with self._calls_lock:
+            calls = dict(self.calls)
+            self.calls.clear()
+            return calls
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"null") if length else None
+
+            def _send(self, status: int, payload, content_type: str = "application/json", headers=None):
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def _dispatch(self, method: str):
+                url = urlsplit(self.path)
+                if url.path == "/v1/chat/completions":
+                    return self._chat_completion()
+                if url.path.endswith("/issueToken"):
+                    return self._issue_token()
+                if url.path == "/auth/v1/user":
+                    return self._auth_user()
+                if url.path.startswith("/rest/v1/"):
+                    return self._postgrest(method, url.path[len("/rest/v1/"):], parse_qsl(url.query))
+                self._send(404, {"error": f"No fake for {method} {url.path}"})
+
+            def _chat_completion(self):
+                request = self._body()
+                schema = (request.get("response_format") or {}).get("json_schema", {}).get("name", "")
+                prompt = "".join(str(m.get("content")) for m in request.get("messages", []))
+                seed = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+                backend.count(f"openai {schema or 'chat'}")
+
+                if random.random() < backend.config.llm_rate_limit_ratio:
+                    return self._send(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                                      "code": "rate_limit_exceeded"}},
+                                      headers={"retry-after-ms": "200"})
+
+                content = json.dumps(_RESPONSES.get(schema, _interview_preparation)(seed))
+                usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                         "total_tokens": (len(prompt) + len(content)) // 4}
+                completion_id = f"chatcmpl-{seed[:12]}"
+
+                if request.get("stream"):
+                    return self._stream_completion(request["model"], completion_id, content)
+
+                time.sleep(backend.config.llm_latency)
+                self._send(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop", "logprobs": None,
+                                 "message": {"role": "assistant", "content": content, "refusal": None}}],
+                    "usage": usage,
+                })
+
+            def _stream_completion(self, model: str, completion_id: str, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                size = max(1, len(content) // STREAM_CHUNKS + 1)
+                pieces = [content[i:i + size] for i in range(0, len(content), size)]
+                for i, piece in enumerate(pieces):
+                    time.sleep(backend.config.llm_latency / len(pieces))
+                    delta = {"content": piece, **({"role": "assistant"} if i == 0 else {})}
+                    finish_reason = "stop" if i == len(pieces) - 1 else None
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _issue_token(self):
+                backend.count("speech issueToken")
+                time.sleep(backend.config.speech_latency)
+                self._send(200, f"fake-speech-token-{uuid.uuid4().hex}".encode("utf-8"), content_type="text/plain")
+
+            def _auth_user(self):
+                backend.count("auth GET user")
+                token = (self.headers.get("Authorization") or "").removeprefix("Bearer ")
+                try:
+                    claims = jwt.decode(token, backend.jwt_secret, algorithms=["HS256"], audience="authenticated")
+                except jwt.InvalidTokenError:
+                    return self._send(401, {"msg": "Invalid token"})
+                self._send(200, {"id": claims["sub"], "aud": "authenticated", "role": "authenticated",
+                                 "email": claims.get("email"), "app_metadata": {}, "user_metadata": {},
+                                 "created_at": datetime.now(timezone.utc).isoformat()})
+
+            def _postgrest(self, method: str, table: str, params):
+                backend.count(f"postgrest {method} {table}")
+                time.sleep(backend.config.db_latency)
+                if table.startswith("rpc/"):
+                    return self._rpc(table[len("rpc/"):])
+                query = dict(params)
+                filters = _parse_filters(params)
+
+                if method == "GET":
+                    select = query.get("select", "*")
+                    limit = int(query["limit"]) if "limit" in query else None
+                    rows = backend.tables.select(table, filters, query.get("order"), limit, _embedded_tables(select))
+                elif method == "POST":
+                    rows = backend.tables.insert(table, self._body())
+                elif method == "PATCH":
+                    rows = backend.tables.update(table, filters, self._body() or {})
+                else:
+                    self._body()  # Unread bodies would be parsed as the next request on this connection
+                    rows = backend.tables.delete(table, filters)
+
+                self._send(201 if method == "POST" else 200, rows)
+
+            def _rpc(self, function: str):
+                params = self._body()
+                if function != "complete_job" or not backend.config.rpc_enabled:
+                    return self._send(404, {"code": "PGRST202", "details": None, "hint": None,
+                                            "message": f"Could not find the function public.{function}"})
+                inserted = backend.tables.complete_job(params)
+                if inserted is None:
+                    return self._send(400, {"code": "P0002", "details": None, "hint": None,
+                                            "message": "Job description not found"})
+                self._send(200, inserted)
+
+        return Handler
@@ -0,0 +1,108 @@
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import jwt
+import requests
+
+
+@dataclass
+class Sample:
+    route: str
+    latency: float
+    status: int
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+
+class LoadClient:
+    """HTTP client for the app under test; one keep-alive session per thread, one identity per virtual user."""
+
+    def __init__(self, base_url: str, users: int = 0, jwt_secret: Optional[str] = None):
+        self.base_url = base_url
+        self._local = threading.local()
+        self._identities = [self._identity(i, jwt_secret) for i in range(users)]
+        self._samples: List[Sample] = []
+        self._samples_lock = threading.Lock()
+
+    @staticmethod
+    def _identity(index: int, jwt_secret: str) -> Dict[str, str]:
+        claims = {
+            "sub": f"00000000-0000-4000-8000-{index:012d}",
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": f"user{index}@benchmark.local",
+            "exp": int(time.time()) + 3600,
+        }
+        return {
+            "Authorization": f"Bearer {jwt.encode(claims, jwt_secret, algorithm='HS256')}",
+            "refresh-token": f"benchmark-refresh-{index}",
+        }
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def request(self, method: str, path: str, route: str, user: int = 0, record: bool = True, **kwargs):
+        headers = dict(kwargs.pop("headers", None) or {})
+        if self._identities:
+            headers.update(self._identities[user % len(self._identities)])
+
+        started = time.perf_counter()
+        try:
+            response = self._session().request(method, self.base_url + path, headers=headers, timeout=60, **kwargs)
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, 0
+        if record:
+            self.record(Sample(route, time.perf_counter() - started, status))
+        return response
+
+    def record(self, sample: Sample):
+        with self._samples_lock:
+            self._samples.append(sample)
+
+    def take_samples(self) -> List[Sample]:
+        with self._samples_lock:
+            samples, self._samples = self._samples, []
+            return samples
+
+
+def run_concurrently(tasks: Iterable[Callable[[], None]], concurrency: int):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(task) for task in tasks]:
+            future.result()
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Dict]:
+    by_route: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+
+    summary = {}
+    for route, route_samples in sorted(by_route.items()):
+        latencies = sorted(s.latency for s in route_samples)
+        summary[route] = {
+            "count": len(route_samples),
+            "errors": sum(1 for s in route_samples if not s.ok),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "throughput_rps": round(len(route_samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+    return summary
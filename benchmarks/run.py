@@ -0,0 +1,204 @@
+"""
+Offline load test of the API against local stand-ins for OpenAI, Supabase and Azure speech.
+
+    python -m benchmarks.run                                # all scenarios, Flask app
+    python -m benchmarks.run --scenario analysis-burst --app asgi --llm-latency 1.0
+    python -m benchmarks.run --output baseline.json         # save results
+    python -m benchmarks.run --baseline baseline.json       # compare against saved results
+
+Reports p50/p95/p99 latency and throughput per route, and the outbound calls each scenario made.
+Application settings (JOB_QUEUE_WORKERS, LLM_RPM_LIMIT, ...) are read from the environment as usual,
+except that admission control only runs in the scenarios that measure it (analysis-flood).
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+import jwt
+
+from .fakes import FakeBackend, FakeBackendConfig
+from .load import LoadClient, summarize
+from .scenarios import SCENARIOS, ScenarioFailed, ScenarioOptions
+
+JWT_SECRET = "benchmark-jwt-secret"
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--app", choices=["wsgi", "asgi"], default="wsgi",
+                        help="Serve api/index.py with a threaded WSGI server or api/asgi.py with uvicorn")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per burst scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds the polling storm runs")
+    parser.add_argument("--users", type=int, default=0, help="Authenticated virtual users (0 = anonymous)")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0,
+                        help="Share of job descriptions/answers repeating an earlier one")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    parser.add_argument("--speech-latency", type=float, default=0.05)
+    parser.add_argument("--llm-rate-limit-ratio", type=float, default=0.0,
+                        help="Share of LLM calls answered with a 429")
+    parser.add_argument("--no-db-functions", action="store_true",
+                        help="Answer database function calls as missing, exercising the sequential-write fallbacks")
+    parser.add_argument("--log-level", default="ERROR", help="Application log level during the run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare results against a JSON file written with --output")
+    return parser.parse_args()
+
+
+def _configure_environment(backend: FakeBackend, work_dir: str, log_level: str):
+    anon_key = jwt.encode({"role": "anon", "iss": "supabase"}, JWT_SECRET, algorithm="HS256")
+    os.environ.update({
+        "NEXT_PUBLIC_SUPABASE_URL": backend.url,
+        "NEXT_PUBLIC_SUPABASE_ANON_KEY": anon_key,
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_BASE_URL": f"{backend.url}/v1",
+        "SPEECH_KEY": "benchmark-speech-key",
+        "NEXT_PUBLIC_SPEECH_REGION": "local",
+        "SPEECH_TOKEN_ENDPOINT": f"{backend.url}/sts/v1.0/issueToken",
+        "JOB_QUEUE_BACKEND": "sqlite",
+        "JOB_QUEUE_PATH": os.path.join(work_dir, "job_queue.db"),
+        "ADMISSION_DB_PATH": os.path.join(work_dir, "admission.db"),
+        "LOG_LEVEL": log_level,  # Keeps logging from dominating the measurements
+    })
+    os.environ.pop("VERCEL_URL", None)
+
+
+def _start_app(kind: str) -> str:
+    """Imports the app only now, after the environment points at the fakes, and serves it on a free port."""
+    if kind == "asgi":
+        import socket
+        import uvicorn
+        from api.asgi import app
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, name="asgi-server", daemon=True).start()
+        while not server.started:
+            time.sleep(0.05)
+        return f"http://127.0.0.1:{port}"
+
+    from werkzeug.serving import make_server
+    from api.index import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # No per-request access log
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="wsgi-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def _set_admission(enabled: bool):
+    """Turns admission control on or off in the running app; the check reads the flag on every request."""
+    from api.utils import admission
+    admission.ADMISSION_ENABLED = enabled
+
+
+def _print_report(name: str, elapsed: float, routes: dict, outbound: dict, baseline: dict = None):
+    print(f"\n== {name} ({elapsed:.1f}s) ==")
+    print(f"{'route':<34}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for route, stats in routes.items():
+        print(f"{route:<34}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10}"
+              f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['throughput_rps']:>9}")
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous:
+            deltas = "".join(
+                f"{_delta(stats[key], previous[key]):>10}" for key in ("p50_ms", "p95_ms", "p99_ms"))
+            print(f"{'  vs baseline':<49}{deltas}{_delta(stats['throughput_rps'], previous['throughput_rps']):>9}")
+
+    print("outbound calls:")
+    for endpoint, count in sorted(outbound.items()):
+        previous = (baseline or {}).get("outbound", {}).get(endpoint)
+        suffix = f"  (baseline {previous})" if previous is not None else ""
+        print(f"  {endpoint:<40}{count:>7}{suffix}")
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def main():
+    args = _parse_args()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    backend = FakeBackend(FakeBackendConfig(
+        llm_latency=args.llm_latency,
+        db_latency=args.db_latency,
+        speech_latency=args.speech_latency,
+        llm_rate_limit_ratio=args.llm_rate_limit_ratio,
+        rpc_enabled=not args.no_db_functions,
+    ), jwt_secret=JWT_SECRET)
+    backend.start()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        _configure_environment(backend, work_dir, args.log_level)
+        base_url = _start_app(args.app)
+
+        client = LoadClient(base_url, users=args.users, jwt_secret=JWT_SECRET)
+        options = ScenarioOptions(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            repeat_ratio=args.repeat_ratio,
+        )
+        names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+        results = {"app": args.app, "options": vars(options), "scenarios": {}}
+        failed = []
+
+        for name in names:
+            scenario = SCENARIOS[name]
+            _set_admission(scenario.admission)
+            try:
+                setup_result = scenario.setup(client, options) if scenario.setup else None
+                client.take_samples()
+                backend.reset_calls()
+
+                started = time.perf_counter()
+                if setup_result is None:
+                    scenario.run(client, options)
+                else:
+                    scenario.run(client, options, setup_result)
+                elapsed = time.perf_counter() - started
+            except ScenarioFailed as e:
+                # The other scenarios still run; the exit status reports the failure
+                print(f"\n== {name} FAILED: {e} ==")
+                results["scenarios"][name] = {"error": str(e)}
+                failed.append(name)
+                client.take_samples()
+                backend.reset_calls()
+                continue
+
+            routes = summarize(client.take_samples(), elapsed)
+            outbound = backend.reset_calls()
+            results["scenarios"][name] = {"elapsed_s": round(elapsed, 2), "routes": routes, "outbound": outbound}
+            _print_report(name, elapsed, routes, outbound, baseline.get("scenarios", {}).get(name))
+
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults written to {args.output}")
+
+        # Stop the job workers before their queue database is removed with the work directory
+        from api.services.job_service import get_job_queue
+        get_job_queue().stop()
+
+    backend.stop()
+    if failed:
+        sys.exit(f"Failed scenarios: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import time
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .load import LoadClient, Sample, run_concurrently
+
+FINAL_JOB_STATUSES = ("completed", "failed")
+JOB_POLL_WAIT_SECONDS = 5
+SPEAKING_SECONDS_PER_SEGMENT = 1.0
+
+
+class ScenarioFailed(Exception):
+    """Raised when a scenario cannot run, e.g. because its setup could not create anything to load."""
+
+
+@dataclass
+class ScenarioOptions:
+    requests: int = 50
+    concurrency: int = 10
+    duration: float = 10.0
+    repeat_ratio: float = 0.0
+    job_timeout: float = 120.0
+
+
+def _texts(prefix: str, count: int, repeat_ratio: float, body: str) -> List[str]:
+    """Distinct inputs, with `repeat_ratio` of them replaced by earlier ones to exercise the caches."""
+    texts = []
+    for i in range(count):
+        if texts and random.random() < repeat_ratio:
+            texts.append(random.choice(texts))
+        else:
+            texts.append(f"{prefix} #{i} ({random.getrandbits(32):08x})\n\n{body}")
+    return texts
+
+
+_JOB_DESCRIPTION = """About the role
+We are looking for a backend engineer to design, build and operate Python services.
+
+Responsibilities:
+- Build and maintain REST APIs used by millions of users
+- Own reliability and performance of the job processing pipeline
+- Collaborate with product and design on new features
+
+Requirements:
+- 5+ years of professional Python experience
+- Experience with PostgreSQL, queues and cloud infrastructure
+
+Benefits
+- Remote-first team, learning budget, health insurance
+
+We are an equal opportunity employer and value diversity at our company."""
+
+_ANSWER = ("In my last role I led the migration of our monolith to services. I started by mapping the "
+           "dependencies, agreed on milestones with the team and we shipped it in three months, "
+           "cutting deploy time from an hour to ten minutes.")
+
+
+def _create_job(client: LoadClient, description: str, user: int) -> Optional[str]:
+    response = client.request("POST", "/api/jobs", "POST /api/jobs", user=user, json={"description": description})
+    if response is None or response.status_code != 202:
+        return None
+    return response.json()["jobId"]
+
+
+def _wait_for_job(client: LoadClient, job_id: str, user: int, timeout: float, record: bool = True) -> Optional[str]:
+    """Long-polls a job like the questions page does; returns its final status or None on timeout."""
+    deadline = time.monotonic() + timeout
+    status = None
+    while time.monotonic() < deadline:
+        params = {"wait": JOB_POLL_WAIT_SECONDS}
+        if status:
+            params["status"] = status
+        response = client.request("GET", f"/api/jobs/{job_id}", "GET /api/jobs/<id> (long poll)",
+                                  user=user, record=record, params=params)
+        if response is None or response.status_code >= 400:
+            time.sleep(0.5)
+            continue
+        status = response.json().get("status")
+        if status in FINAL_JOB_STATUSES:
+            return status
+    return None
+
+
+def job_burst(client: LoadClient, options: ScenarioOptions):
+    """Creates `requests` jobs at once and follows each to completion."""
+    descriptions = _texts("Backend Engineer", options.requests, options.repeat_ratio, _JOB_DESCRIPTION)
+
+    def create_and_follow(i: int):
+        started = time.perf_counter()
+        job_id = _create_job(client, descriptions[i], user=i)
+        if job_id is None:
+            return
+        status = _wait_for_job(client, job_id, user=i, timeout=options.job_timeout)
+        client.record(Sample("job end-to-end", time.perf_counter() - started, 200 if status == "completed" else 500))
+
+    run_concurrently([lambda i=i: create_and_follow(i) for i in range(options.requests)], options.concurrency)
+
+
+def job_batch(client: LoadClient, options: ScenarioOptions):
+    """Imports `requests` postings in one batch request and follows each job to completion."""
+    descriptions = _texts("Imported posting", options.requests, options.repeat_ratio, _JOB_DESCRIPTION)
+
+    started = time.perf_counter()
+    response = client.request("POST", "/api/jobs/batch", "POST /api/jobs/batch", user=0,
+                              json={"descriptions": descriptions})
+    if response is None or response.status_code != 202:
+        return
+    job_ids = response.json()["jobIds"]
+
+    def follow(job_id: str):
+        status = _wait_for_job(client, job_id, user=0, timeout=options.job_timeout)
+        client.record(Sample("batch job end-to-end", time.perf_counter() - started, 200 if status == "completed" else 500))
+
+    run_concurrently([lambda job_id=job_id: follow(job_id) for job_id in job_ids], options.concurrency)
+
+
+def _setup_polling_storm(client: LoadClient, options: ScenarioOptions) -> List[str]:
+    job_ids = [_create_job(client, description, user=0)
+               for description in _texts("Polling target", max(1, options.concurrency // 5), 0.0, _JOB_DESCRIPTION)]
+    job_ids = [job_id for job_id in job_ids if job_id]
+    if not job_ids:
+        raise ScenarioFailed("setup could not create any job to poll (every POST /api/jobs failed)")
+    for job_id in job_ids:
+        _wait_for_job(client, job_id, user=0, timeout=options.job_timeout, record=False)
+    return job_ids
+
+
+def polling_storm(client: LoadClient, options: ScenarioOptions, job_ids: List[str]):
+    """`concurrency` clients re-poll a handful of completed jobs for `duration` seconds, sending ETags back."""
+    if not job_ids:
+        raise ScenarioFailed("no jobs to poll")
+    deadline = time.monotonic() + options.duration
+
+    def poller(i: int):
+        etags: Dict[str, str] = {}
+        while time.monotonic() < deadline:
+            job_id = random.choice(job_ids)
+            headers = {"If-None-Match": etags[job_id]} if job_id in etags else {}
+            response = client.request("GET", f"/api/jobs/{job_id}", "GET /api/jobs/<id>", user=0, headers=headers)
+            if response is not None and response.headers.get("ETag"):
+                etags[job_id] = response.headers["ETag"]
+
+    run_concurrently([lambda i=i: poller(i) for i in range(options.concurrency)], options.concurrency)
+
+
+def analysis_burst(client: LoadClient, options: ScenarioOptions):
+    """Submits `requests` answer analyses at once."""
+    answers = _texts("Answer", options.requests, options.repeat_ratio, _ANSWER)
+
+    def analyze(i: int):
+        client.request("POST", "/api/analyses", "POST /api/analyses", user=i,
+                       json={"answer_text": answers[i], "question": "Tell me about a project you led."})
+
+    run_concurrently([lambda i=i: analyze(i) for i in range(options.requests)], options.concurrency)
+
+
+def analysis_flood(client: LoadClient, options: ScenarioOptions):
+    """
+    A single user sends `requests` answer analyses as fast as `concurrency` allows. Admission
+    control should admit its burst and reject the rest at once with a Retry-After.
+    """
+    def analyze(i: int):
+        started = time.perf_counter()
+        response = client.request("POST", "/api/analyses", "POST /api/analyses", user=0, record=False,
+                                  json={"answer_text": f"{_ANSWER} ({i})", "question": "Tell me about a project you led."})
+        status = response.status_code if response is not None else 0
+        outcome = "rejected" if status in (429, 503) and response.headers.get("Retry-After") else "admitted"
+        # Rejections are the expected outcome here, so they are not counted as errors
+        client.record(Sample(f"POST /api/analyses ({outcome})", time.perf_counter() - started,
+                             200 if outcome == "rejected" else status))
+
+    run_concurrently([lambda i=i: analyze(i) for i in range(options.requests)], options.concurrency)
+
+
+def answer_sessions(client: LoadClient, options: ScenarioOptions):
+    """
+    `requests` users answer aloud: each pushes the answer one sentence at a time, as the speech
+    recognizer emits them, and asks for the feedback right after the last one.
+    """
+    segments = [sentence.strip() + "." for sentence in _ANSWER.split(".") if sentence.strip()]
+
+    def speak(i: int):
+        response = client.request("POST", "/api/analyses/sessions", "POST /api/analyses/sessions", user=i,
+                                  json={"question": "Tell me about a project you led."})
+        if response is None or response.status_code != 201:
+            return
+        session_id = response.json()["sessionId"]
+
+        for index, segment in enumerate(segments):
+            client.request("POST", f"/api/analyses/sessions/{session_id}/segments",
+                           "POST /api/analyses/sessions/<id>/segments", user=i,
+                           json={"index": index, "text": f"{segment} ({i})"})
+            time.sleep(SPEAKING_SECONDS_PER_SEGMENT)
+
+        client.request("POST", f"/api/analyses/sessions/{session_id}/finish",
+                       "POST /api/analyses/sessions/<id>/finish", user=i)
+
+    run_concurrently([lambda i=i: speak(i) for i in range(options.requests)], options.concurrency)
+
+
+def speech_tokens(client: LoadClient, options: ScenarioOptions):
+    """Fetches `requests` speech tokens at once, as many clients opening the questions page would."""
+    def fetch(i: int):
+        client.request("GET", "/api/speech-token", "GET /api/speech-token", user=i)
+
+    run_concurrently([lambda i=i: fetch(i) for i in range(options.requests)], options.concurrency)
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable
+    setup: Optional[Callable] = None
+    # Only scenarios that measure admission control run with it; elsewhere its per-client
+    # limits would reject the load being measured
+    admission: bool = False
+
+
+SCENARIOS = {
+    "job-burst": Scenario("job-burst", job_burst),
+    "job-batch": Scenario("job-batch", job_batch),
+    "polling-storm": Scenario("polling-storm", polling_storm, setup=_setup_polling_storm),
+    "analysis-burst": Scenario("analysis-burst", analysis_burst),
+    "analysis-flood": Scenario("analysis-flood", analysis_flood, admission=True),
+    "answer-sessions": Scenario("answer-sessions", answer_sessions),
+    "speech-tokens": Scenario("speech-tokens", speech_tokens),
+}
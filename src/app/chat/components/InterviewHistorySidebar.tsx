@@ -19,16 +19,55 @@ interface InterviewItem {
   parsedDate: Date;
 }
 
-async function fetchJobHistory() {
+interface JobHistoryPage {
+  jobs: unknown[];
+  nextCursor: string | null;
+}
+
+const JOB_HISTORY_PAGE_SIZE = 50;
+
+async function fetchJobHistory(cursor: string | null = null): Promise<JobHistoryPage> {
   try {
-    const res = await apiClient.get('/api/fetch');
-    return res.data; 
+    const params = cursor ? { limit: JOB_HISTORY_PAGE_SIZE, cursor } : { limit: JOB_HISTORY_PAGE_SIZE };
+    const res = await apiClient.get('/api/jobs', { params });
+    return {
+      jobs: Array.isArray(res.data.jobs) ? res.data.jobs : [],
+      nextCursor: res.data.next_cursor ?? null,
+    };
   } catch (error) {
     console.error("Error fetching interview history:", error);
-    return []; 
+    return { jobs: [], nextCursor: cursor }; // Keep the cursor so "Load more" can retry
   }
 }
 
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+function formatInterviewItems(rawInterviewItems: any[]): InterviewItem[] {
+  return rawInterviewItems
+    .map(item => {
+      if (!item.id) { // Ensure item has an ID, which should be the Job ID
+          // console.warn("Interview item skipped due to missing ID:", item);
+          return null;
+      }
+      const dateValue = item.created_at;
+      const dateForParsing = dateValue || new Date().toISOString();
+      const tempDate = new Date(dateForParsing);
+      const localStartOfDay = new Date(tempDate.getFullYear(), tempDate.getMonth(), tempDate.getDate());
+      // Format display date as YYYY-MM-DD
+      const year = tempDate.getFullYear();
+      const month = (tempDate.getMonth() + 1).toString().padStart(2, '0');
+      const day = tempDate.getDate().toString().padStart(2, '0');
+      const displayDate = `${year}-${month}-${day}`;
+
+      return {
+        id: item.id,
+        title: item.title,
+        date: displayDate,
+        parsedDate: localStartOfDay,
+      };
+    })
+    .filter((item): item is InterviewItem => item !== null); // Type guard to filter out nulls
+}
+
 // Helper function to group interviews bsaed on date ranges
 function groupInterviews(
   interviews: InterviewItem[]
@@ -72,53 +111,46 @@ export const InterviewHistorySidebar: React.FC<InterviewHistorySidebarProps> = (
   currentJobId 
 }) => {
   const [isProfileOpen, setIsProfileOpen] = useState(false);
-  const [groupedInterviewHistory, setGroupedInterviewHistory] = useState<
-    Record<string, InterviewItem[]>
-  >({});
+  const [interviewItems, setInterviewItems] = useState<InterviewItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
-    const fetchAndGroupInterviews = async () => {
-      const fetchedData = await fetchJobHistory();
-      const rawInterviewItems = Array.isArray(fetchedData) && fetchedData.length > 1 ? fetchedData[1] : null;
-
-      if (rawInterviewItems && Array.isArray(rawInterviewItems)) {
-        const formattedData: InterviewItem[] = rawInterviewItems
-          .map(item => {
-            if (!item.id) { // Ensure item has an ID, which should be the Job ID
-                // console.warn("Interview item skipped due to missing ID:", item);
-                return null;
-            }
-            const dateValue = item.created_at;
-            const dateForParsing = dateValue || new Date().toISOString();
-            const tempDate = new Date(dateForParsing);
-            const localStartOfDay = new Date(tempDate.getFullYear(), tempDate.getMonth(), tempDate.getDate());
-            // Format display date as YYYY-MM-DD
-            const year = tempDate.getFullYear();
-            const month = (tempDate.getMonth() + 1).toString().padStart(2, '0');
-            const day = tempDate.getDate().toString().padStart(2, '0');
-            const displayDate = `${year}-${month}-${day}`;
-            
-            return {
-              id: item.id,
-              title: item.title,
-              date: displayDate,
-              parsedDate: localStartOfDay,
-            };
-          })
-          .filter((item): item is InterviewItem => item !== null); // Type guard to filter out nulls
-        
-        setGroupedInterviewHistory(groupInterviews(formattedData));
-      } else {
-        setGroupedInterviewHistory({});
-      }
+    let isCancelled = false;
+
+    const fetchFirstPage = async () => {
+      const page = await fetchJobHistory();
+      if (isCancelled) return;
+      setInterviewItems(formatInterviewItems(page.jobs));
+      setNextCursor(page.nextCursor);
     };
+
+    setInterviewItems([]);
+    setNextCursor(null);
     if (session) { // Only fetch if session exists
-        fetchAndGroupInterviews();
-    } else {
-        setGroupedInterviewHistory({}); // Clear history if no session
+        fetchFirstPage();
     }
+    return () => {
+      isCancelled = true;
+    };
   }, [session]); // Refetch if session changes (e.g., user logs in/out)
 
+  // Older history is fetched a page at a time, following the cursor of the previous page
+  const loadMore = async () => {
+    if (!nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    const page = await fetchJobHistory(nextCursor);
+    const loadedIds = new Set(interviewItems.map(item => item.id));
+    setInterviewItems([
+      ...interviewItems,
+      ...formatInterviewItems(page.jobs).filter(item => !loadedIds.has(item.id)),
+    ]);
+    setNextCursor(page.nextCursor);
+    setIsLoadingMore(false);
+  };
+
+  const groupedInterviewHistory = groupInterviews(interviewItems);
+
   const getOrderedGroupKeys = (groupedData: Record<string, InterviewItem[]>): string[] => {
     const predefinedOrder = ["Last 7 Days", "Previous 30 Days"];
     const monthYearKeys = Object.keys(groupedData)
@@ -177,6 +209,15 @@ export const InterviewHistorySidebar: React.FC<InterviewHistorySidebarProps> = (
         ) : (
           <p className="text-gray-500 text-sm text-center mt-4">No interview history yet. Click &quot;+ New&quot; to begin!</p>
         )}
+        {nextCursor && (
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="w-full mt-3 py-1.5 text-sm text-indigo-600 hover:text-indigo-700 font-medium disabled:text-gray-400"
+          >
+            {isLoadingMore ? "Loading…" : "Load more"}
+          </button>
+        )}
       </div>
       
       {/* Profile Button */}
@@ -130,7 +130,7 @@ export const QuestionPopup: React.FC<QuestionPopupProps> = ({ question, onClose,
         try {
             logger.info('Submitting answer for analysis');
             setIsLoading(true);
-            const res = await axios.post('/api/analyses', { answer_text: answerText });
+            const res = await axios.post('/api/analyses', { answer_text: answerText, question });
             const analysis: AnalysisResponse = res.data.analysis;
             setResponse(analysis);
             setIsLoading(false);
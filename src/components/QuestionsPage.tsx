@@ -12,7 +12,6 @@ import axios from "axios";
 export interface QuestionsResponse {
     status: string;
     description: string;
-    speech_token: string;
     results: {
         job_title: string;
         industry: string;
@@ -31,11 +30,15 @@ export interface QuestionsResponse {
     } | null;
 }
 
-export async function getJobDetails(jobId: string): Promise<QuestionsResponse | null> {
+// Seconds the server may hold a status request open until the job status changes
+const LONG_POLL_WAIT_SECONDS = 25;
+
+export async function getJobDetails(jobId: string, knownStatus?: string): Promise<QuestionsResponse | null> {
     try {
         logger.debug(`Fetching job details for ID: ${jobId}`);
 
-        const res = await apiClient.get(`/api/jobs/${jobId}`)
+        const params = knownStatus ? { wait: LONG_POLL_WAIT_SECONDS, status: knownStatus } : undefined;
+        const res = await apiClient.get(`/api/jobs/${jobId}`, { params })
 
         const data: QuestionsResponse = res.data;
         logger.info(`Successfully fetched job details for ID: ${jobId}`);
@@ -67,6 +70,25 @@ export async function getJobDetails(jobId: string): Promise<QuestionsResponse |
     }
 }
 
+export interface SpeechTokenResponse {
+    token: string;
+    expires_in: number;
+}
+
+// Fetch a new token this long before the current one expires
+const SPEECH_TOKEN_REFRESH_MARGIN_SECONDS = 120;
+const SPEECH_TOKEN_RETRY_SECONDS = 30;
+
+export async function getSpeechToken(): Promise<SpeechTokenResponse | null> {
+    try {
+        const res = await apiClient.get('/api/speech-token');
+        return { token: res.data.token, expires_in: res.data.expires_in };
+    } catch (error) {
+        logger.error("Error fetching speech token", { error });
+        return null;
+    }
+}
+
 export default function QuestionsPage({ jobId }: { jobId: string }) {
     const [jobResponse, setJobResponse] = useState<QuestionsResponse | null>(null);
     const [speechToken, setSpeechToken] = useState<string | null>(null);
@@ -78,11 +100,12 @@ export default function QuestionsPage({ jobId }: { jobId: string }) {
         setIsLoading(true);
         let timeoutId: NodeJS.Timeout | null = null;
         let isCancelled = false;
+        let lastStatus: string | undefined;
 
         const fetchJob = async () => {
             try {
                 logger.debug(`Polling job status for ID: ${jobId}`);
-                const response = await getJobDetails(jobId);
+                const response = await getJobDetails(jobId, lastStatus);
                 
                 if (isCancelled) return;
                 
@@ -94,11 +117,16 @@ export default function QuestionsPage({ jobId }: { jobId: string }) {
                 }
 
                 setJobResponse(response);
-                setSpeechToken(response.speech_token);
+                lastStatus = response.status;
 
-                if (response.status !== "completed") {
+                if (response.status === "failed") {
+                    logger.error(`Job ${jobId} failed`);
+                    setError("Failed to generate questions for this job.");
+                    setIsLoading(false);
+                } else if (response.status !== "completed") {
+                    // The server already waited for a status change, so poll again right away
                     logger.info(`Job ${jobId} still processing, scheduling next poll`);
-                    timeoutId = setTimeout(fetchJob, 2000);
+                    timeoutId = setTimeout(fetchJob, 0);
                 } else {
                     logger.info(`Job ${jobId} completed successfully`);
                     setIsLoading(false);
@@ -120,6 +148,36 @@ export default function QuestionsPage({ jobId }: { jobId: string }) {
         };
     }, [jobId, setIsLoading]);
 
+    const jobCompleted = jobResponse?.status === "completed";
+
+    useEffect(() => {
+        if (!jobCompleted) return;
+        let refreshTimeoutId: NodeJS.Timeout | null = null;
+        let isCancelled = false;
+
+        // Speech tokens expire; keep replacing the token before it does for as long as the page is open
+        const refreshSpeechToken = async () => {
+            const response = await getSpeechToken();
+            if (isCancelled) return;
+
+            let nextRefreshSeconds = SPEECH_TOKEN_RETRY_SECONDS;
+            if (response) {
+                setSpeechToken(response.token);
+                nextRefreshSeconds = Math.max(
+                    response.expires_in - SPEECH_TOKEN_REFRESH_MARGIN_SECONDS, SPEECH_TOKEN_RETRY_SECONDS);
+            }
+            logger.debug(`Refreshing speech token in ${nextRefreshSeconds}s`);
+            refreshTimeoutId = setTimeout(refreshSpeechToken, nextRefreshSeconds * 1000);
+        };
+
+        refreshSpeechToken();
+
+        return () => {
+            if (refreshTimeoutId) clearTimeout(refreshTimeoutId);
+            isCancelled = true;
+        };
+    }, [jobId, jobCompleted]);
+
     if (error) {
         logger.warn(`Rendering error state: ${error}`);
         return <div>Error: {error}</div>;
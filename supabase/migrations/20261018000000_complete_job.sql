@@ -0,0 +1,48 @@
+-- Finishes a processing run in one transaction: stores the generated questions, sets the
+-- title and marks the job completed. Called by api/db/repositories/job_completion_unit_of_work.py.
+--
+-- Runs as the caller (security invoker), so the row-level security policies of
+-- job_descriptions and questions apply exactly as they do to the individual writes.
+create or replace function public.complete_job(
+    p_job_description_id uuid,
+    p_title text,
+    p_questions jsonb
+) returns integer
+language plpgsql
+security invoker
+as $$
+declare
+    current_status text;
+    inserted integer;
+begin
+    -- Serializes concurrent completions of the same job
+    select status into current_status
+    from public.job_descriptions
+    where id = p_job_description_id
+    for update;
+
+    if not found then
+        raise exception 'Job description % not found', p_job_description_id using errcode = 'P0002';
+    end if;
+
+    -- Another worker completed it first; its questions stay as they are
+    if current_status = 'completed' then
+        return 0;
+    end if;
+
+    -- Questions left by an earlier, failed attempt
+    delete from public.questions where job_description_id = p_job_description_id;
+
+    insert into public.questions (job_description_id, content, type, keyword, explanation)
+    select p_job_description_id, q.content, q.type, q.keyword, q.explanation
+    from jsonb_populate_recordset(null::public.questions, coalesce(p_questions, '[]'::jsonb)) as q;
+    get diagnostics inserted = row_count;
+
+    update public.job_descriptions
+    set title = coalesce(p_title, title),
+        status = 'completed'
+    where id = p_job_description_id;
+
+    return inserted;
+end;
+$$;
@@ -0,0 +1,7 @@
+-- Stores the start of each job description next to it, so the job listing (GET /api/jobs)
+-- reads a short preview instead of every full description. Read by
+-- JobDescriptionRepository.get_job_summaries; one character more than the preview shown
+-- (JOB_DESCRIPTION_PREVIEW_LENGTH) tells whether the description was cut.
+alter table public.job_descriptions
+    add column if not exists description_preview text
+    generated always as (left(description, 201)) stored;
@@ -0,0 +1,48 @@
+from api.services.description_preprocessing import preprocess_description
+
+
+def test_heading_mentioning_benefits_keeps_its_responsibilities():
+    description = (
+        "Senior Backend Engineer\n"
+        "Benefits of our distributed architecture include scale:\n"
+        "- Own the Kafka consumers of the payments pipeline\n"
+        "- Scale payment settlement services to millions of transactions\n"
+        "Benefits:\n"
+        "- Health insurance\n"
+        "- 30 days of paid time off\n"
+    )
+
+    result = preprocess_description(description)
+
+    assert "Kafka consumers of the payments pipeline" in result.text
+    assert "payment settlement services" in result.text
+    assert "Health insurance" not in result.text
+    assert result.dropped_sections == ["Benefits"]
+
+
+def test_heading_mentioning_salary_keeps_its_section():
+    description = (
+        "Payroll Engineer\n"
+        "Salary platform work:\n"
+        "- Build salary calculation engine for 40 countries\n"
+        "- Maintain the tax rules of every payroll run\n"
+    )
+
+    result = preprocess_description(description)
+
+    assert "Build salary calculation engine for 40 countries" in result.text
+    assert "Maintain the tax rules of every payroll run" in result.text
+    assert result.dropped_sections == []
+
+
+def test_boilerplate_section_with_role_content_is_kept():
+    description = (
+        "Data Engineer\n"
+        "Compensation:\n"
+        "- You will design the compensation analytics warehouse\n"
+    )
+
+    result = preprocess_description(description)
+
+    assert "design the compensation analytics warehouse" in result.text
+    assert result.dropped_sections == []
@@ -0,0 +1,135 @@
+from uuid import UUID, uuid4
+
+import pytest
+import requests
+
+from api.job_queue import http_trigger_queue
+from api.job_queue.base_queue import JOB_PRIORITY_BULK, JOB_PRIORITY_INTERACTIVE
+from api.job_queue.http_trigger_queue import HttpTriggerJobQueue, trigger_chunk_size
+from api.services import job_service
+
+
+@pytest.fixture
+def chunks_of_five(monkeypatch):
+    monkeypatch.setattr(http_trigger_queue, "JOB_BATCH_CONCURRENCY", 5)
+    monkeypatch.setattr(http_trigger_queue, "JOB_TRIGGER_MAX_DURATION_SECONDS", 60)
+    monkeypatch.setattr(http_trigger_queue, "JOB_TRIGGER_SECONDS_PER_JOB", 60)
+
+
+@pytest.fixture
+def triggers(monkeypatch):
+    """Records the triggers a queue starts instead of sending them."""
+    started = []
+    monkeypatch.setattr(
+        HttpTriggerJobQueue, "_start_trigger",
+        lambda self, ids, user_jwt, refresh_token, priority, remaining_ids=None:
+            started.append((ids, priority, remaining_ids or [])))
+    return started
+
+
+class _FakeRepository:
+    failed = []
+
+    def __init__(self, client):
+        pass
+
+    def fail_unfinished(self, job_description_ids):
+        _FakeRepository.failed.append(list(job_description_ids))
+
+
+class _FakeSession:
+    def __init__(self, status_code=200, error=None):
+        self.status_code = status_code
+        self.error = error
+        self.posts = []
+
+    def post(self, url, json, timeout, headers):
+        self.posts.append(json)
+        if self.error:
+            raise self.error
+        return type("Response", (), {"status_code": self.status_code, "text": ""})()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    _FakeRepository.failed = []
+    monkeypatch.setattr(http_trigger_queue, "get_supabase_client", lambda **kwargs: None)
+    monkeypatch.setattr(http_trigger_queue, "JobDescriptionRepository", _FakeRepository)
+
+    def use(fake_session):
+        monkeypatch.setattr(http_trigger_queue, "get_http_session", lambda: fake_session)
+        return fake_session
+    return use
+
+
+def test_chunk_size_fits_the_function_time_limit(monkeypatch, chunks_of_five):
+    assert trigger_chunk_size() == 5
+
+    monkeypatch.setattr(http_trigger_queue, "JOB_TRIGGER_MAX_DURATION_SECONDS", 150)
+    assert trigger_chunk_size() == 10
+
+    monkeypatch.setattr(http_trigger_queue, "JOB_TRIGGER_SECONDS_PER_JOB", 300)
+    assert trigger_chunk_size() == 5
+
+
+@pytest.mark.parametrize("count, sizes", [(1, [1]), (5, [5]), (10, [5, 5]), (11, [5, 5, 1])])
+def test_interactive_batch_is_triggered_in_chunks(chunks_of_five, triggers, count, sizes):
+    job_ids = [uuid4() for _ in range(count)]
+
+    HttpTriggerJobQueue().enqueue_batch(job_ids, None, None, priority=JOB_PRIORITY_INTERACTIVE)
+
+    assert [len(ids) for ids, _, _ in triggers] == sizes
+    assert [job_id for ids, _, _ in triggers for job_id in ids] == job_ids
+    assert all(remaining == [] for _, _, remaining in triggers)
+
+
+@pytest.mark.parametrize("count", [3, 5, 12])
+def test_bulk_batch_triggers_only_its_first_chunk(chunks_of_five, triggers, count):
+    job_ids = [uuid4() for _ in range(count)]
+
+    HttpTriggerJobQueue().enqueue_batch(job_ids, None, None, priority=JOB_PRIORITY_BULK)
+
+    assert triggers == [(job_ids[:5], JOB_PRIORITY_BULK, job_ids[5:])]
+
+
+def test_trigger_payload_carries_class_and_rest_of_batch(session):
+    fake_session = session(_FakeSession())
+    job_ids = [uuid4() for _ in range(3)]
+
+    HttpTriggerJobQueue().trigger_background_job_processing(
+        job_ids[:1], None, None, JOB_PRIORITY_BULK, remaining_ids=job_ids[1:])
+
+    assert fake_session.posts == [{
+        "job_description_ids": [str(job_ids[0])],
+        "next_job_description_ids": [str(job_id) for job_id in job_ids[1:]],
+        "priority": JOB_PRIORITY_BULK,
+    }]
+    assert _FakeRepository.failed == []
+
+
+@pytest.mark.parametrize("fake_session", [_FakeSession(status_code=500),
+                                          _FakeSession(error=requests.exceptions.Timeout())])
+def test_failed_trigger_fails_the_chunk_and_the_rest_of_the_batch(session, fake_session):
+    session(fake_session)
+    job_ids = [uuid4() for _ in range(4)]
+
+    HttpTriggerJobQueue().trigger_background_job_processing(
+        job_ids[:2], None, None, JOB_PRIORITY_BULK, remaining_ids=job_ids[2:])
+
+    assert _FakeRepository.failed == [job_ids]
+
+
+def test_processed_chunk_triggers_the_next_one(monkeypatch):
+    processed = []
+    continued = []
+    monkeypatch.setattr(job_service, "process_job_background_task",
+                        lambda job_id, **kwargs: processed.append((job_id, kwargs["priority"])) or True)
+    monkeypatch.setattr(job_service, "get_job_queue", lambda: type("Queue", (), {
+        "enqueue_batch": lambda self, ids, user_jwt, refresh_token, priority: continued.append((ids, priority))})())
+    job_ids = [str(uuid4()) for _ in range(4)]
+
+    job_service.process_job_batch(job_ids[:2], priority=JOB_PRIORITY_BULK, next_job_description_id_strs=job_ids[2:])
+    job_service.process_job_batch(job_ids[2:], priority=JOB_PRIORITY_BULK, next_job_description_id_strs=[])
+
+    assert sorted(processed) == sorted((job_id, JOB_PRIORITY_BULK) for job_id in job_ids)
+    assert continued == [([UUID(job_id) for job_id in job_ids[2:]], JOB_PRIORITY_BULK)]
@@ -0,0 +1,146 @@
+import time
+import asyncio
+import threading
+
+import httpx
+import openai
+import pytest
+
+from api.services.llm_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMQueueTimeout,
+    LLMScheduler,
+    TokenBucket,
+)
+
+MODEL = "test-model"
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def _failing_once(error, result="ok"):
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise error
+        return result
+
+    return fn, calls
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(60, period=60.0)  # one token per second
+    now = bucket.updated_at
+
+    bucket.consume(60)
+
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+
+def test_token_bucket_admits_oversized_request_once_full():
+    bucket = TokenBucket(10, period=60.0)
+    now = bucket.updated_at
+
+    assert bucket.wait_time(50, now) == 0.0
+    bucket.consume(50)
+    assert bucket.wait_time(1, now) > 0
+
+
+def test_waiters_are_admitted_in_priority_order():
+    scheduler = LLMScheduler()
+    scheduler._limiter(MODEL).blocked_until = time.monotonic() + 0.3
+    admitted = []
+
+    def acquire(priority):
+        scheduler.acquire(MODEL, 10, priority)
+        admitted.append(priority)
+
+    background = threading.Thread(target=acquire, args=(PRIORITY_BACKGROUND,))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=acquire, args=(PRIORITY_INTERACTIVE,))
+    interactive.start()
+    background.join()
+    interactive.join()
+
+    assert admitted == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+
+
+def test_async_waiter_is_admitted_after_sync_waiter_ahead_of_it():
+    scheduler = LLMScheduler()
+    scheduler._limiter(MODEL).blocked_until = time.monotonic() + 0.3
+    admitted = []
+
+    sync_waiter = threading.Thread(
+        target=lambda: (scheduler.acquire(MODEL, 10, PRIORITY_INTERACTIVE), admitted.append("sync")))
+    sync_waiter.start()
+    time.sleep(0.05)
+
+    async def acquire():
+        await scheduler.async_acquire(MODEL, 10, PRIORITY_BACKGROUND)
+        admitted.append("async")
+
+    asyncio.run(acquire())
+    sync_waiter.join()
+
+    assert admitted == ["sync", "async"]
+    assert scheduler.stats()["models"][MODEL]["waiting"] == 0
+
+
+def test_acquire_times_out_when_capacity_does_not_return():
+    scheduler = LLMScheduler(max_queue_wait=0.1)
+    scheduler._limiter(MODEL).blocked_until = time.monotonic() + 60
+
+    with pytest.raises(LLMQueueTimeout):
+        scheduler.acquire(MODEL, 10)
+    assert scheduler.stats()["models"][MODEL]["waiting"] == 0
+
+
+def test_call_retries_after_the_servers_hint():
+    scheduler = LLMScheduler(backoff_base=0.01)
+    fn, calls = _failing_once(_rate_limit_error({"retry-after-ms": "200"}))
+
+    assert scheduler.call(MODEL, 10, fn) == "ok"
+
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    assert scheduler.retries == 1
+    assert scheduler.rate_limited == 1
+
+
+def test_call_gives_up_when_the_hint_exceeds_the_maximum():
+    scheduler = LLMScheduler(backoff_base=0.01, retry_after_max=1.0)
+    fn, calls = _failing_once(_rate_limit_error({"retry-after": "3600"}))
+
+    started = time.monotonic()
+    with pytest.raises(openai.RateLimitError):
+        scheduler.call(MODEL, 10, fn)
+
+    assert len(calls) == 1
+    assert time.monotonic() - started < 1.0
+    assert scheduler.retries == 0
+    # Other callers still wait, but no longer than the maximum
+    assert 0 < scheduler.stats()["models"][MODEL]["paused_for"] <= 1.0
+
+
+def test_async_call_gives_up_when_the_hint_exceeds_the_maximum():
+    scheduler = LLMScheduler(backoff_base=0.01, retry_after_max=1.0)
+    error = _rate_limit_error({"retry-after": "3600"})
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise error
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(scheduler.async_call(MODEL, 10, fn))
+    assert len(calls) == 1
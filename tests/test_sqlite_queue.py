@@ -0,0 +1,134 @@
+import time
+import sqlite3
+from uuid import uuid4
+
+import pytest
+
+from api.job_queue.base_queue import JOB_PRIORITY_BULK, JOB_PRIORITY_INTERACTIVE
+from api.job_queue.sqlite_queue import SQLiteJobQueue, _parse_user_weights
+
+ALICE = uuid4()
+BOB = uuid4()
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    def make(**kwargs):
+        kwargs.setdefault("backoff_base", 0)
+        return SQLiteJobQueue(path=str(tmp_path / "jobs.db"), **kwargs)
+    return make
+
+
+def _enqueue(queue, count, user_id, priority=JOB_PRIORITY_BULK):
+    job_ids = [uuid4() for _ in range(count)]
+    queue.enqueue_batch(job_ids, None, None, user_id=user_id, priority=priority)
+    return [str(job_id) for job_id in job_ids]
+
+
+def _claim_all(queue):
+    jobs = []
+    while (job := queue.claim()) is not None:
+        jobs.append(job)
+    return jobs
+
+
+def _row(queue, job):
+    with sqlite3.connect(queue.path) as conn:
+        return conn.execute("SELECT status, attempts, last_error FROM jobs WHERE id = ?", (job.id,)).fetchone()
+
+
+def test_users_take_turns_within_a_class(make_queue):
+    queue = make_queue()
+    alice_jobs = _enqueue(queue, 3, ALICE)
+    bob_jobs = _enqueue(queue, 3, BOB)
+
+    claimed = [job.job_description_id for job in _claim_all(queue)]
+
+    assert claimed == [alice_jobs[0], bob_jobs[0], alice_jobs[1], bob_jobs[1], alice_jobs[2], bob_jobs[2]]
+
+
+def test_weighted_user_gets_proportionally_more_turns(make_queue):
+    queue = make_queue(user_weights={str(ALICE): 2.0})
+    alice_jobs = _enqueue(queue, 4, ALICE)
+    bob_jobs = _enqueue(queue, 2, BOB)
+
+    claimed = [job.job_description_id for job in _claim_all(queue)]
+
+    assert claimed == [alice_jobs[0], bob_jobs[0], alice_jobs[1], alice_jobs[2], bob_jobs[1], alice_jobs[3]]
+
+
+def test_idle_user_starts_at_the_current_virtual_time(make_queue):
+    queue = make_queue()
+    alice_jobs = _enqueue(queue, 4, ALICE)
+    for _ in range(3):
+        queue.claim()
+    bob_jobs = _enqueue(queue, 3, BOB)
+
+    claimed = [job.job_description_id for job in _claim_all(queue)]
+
+    # Bob gets no credit for the time he was idle: one turn, then he alternates with Alice
+    assert claimed == [bob_jobs[0], alice_jobs[3], bob_jobs[1], bob_jobs[2]]
+
+
+def test_classes_are_claimed_in_priority_order(make_queue):
+    queue = make_queue()
+    bulk_jobs = _enqueue(queue, 2, ALICE, JOB_PRIORITY_BULK)
+    interactive_jobs = _enqueue(queue, 1, BOB, JOB_PRIORITY_INTERACTIVE)
+
+    claimed = [job.job_description_id for job in _claim_all(queue)]
+
+    assert claimed == interactive_jobs + bulk_jobs
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cannot_finish_it(make_queue):
+    queue = make_queue(visibility_timeout=0.1)
+    _enqueue(queue, 1, ALICE)
+
+    first = queue.claim()
+    assert queue.claim() is None
+    time.sleep(0.15)
+    second = queue.claim()
+
+    assert second.id == first.id
+    assert second.attempts == first.attempts + 1
+    assert not queue.extend_lease(first)
+    queue.ack(first)
+    queue.fail(first, "stale")
+    assert _row(queue, second)[:2] == ("running", 2)
+
+    assert queue.extend_lease(second)
+    queue.ack(second)
+    assert _row(queue, second) is None
+
+
+def test_failed_job_is_retried_then_dead_lettered(make_queue):
+    queue = make_queue(max_attempts=2)
+    _enqueue(queue, 1, ALICE)
+
+    first = queue.claim()
+    assert not first.is_last_attempt
+    queue.fail(first, "boom")
+    assert _row(queue, first) == ("queued", 1, "boom")
+
+    second = queue.claim()
+    assert second.is_last_attempt
+    queue.fail(second, "boom again")
+    assert _row(queue, second) == ("dead", 2, "boom again")
+    assert queue.claim() is None
+    assert queue.stats()["dead"] == 1
+
+
+def test_retry_waits_for_its_backoff(make_queue):
+    queue = make_queue(backoff_base=60)
+    _enqueue(queue, 1, ALICE)
+
+    queue.fail(queue.claim(), "boom")
+
+    assert queue.claim() is None
+    assert queue.stats()["queued"] == 1
+
+
+def test_user_weights_ignore_invalid_entries():
+    weights = _parse_user_weights("alice=2, bob=0,carol=x,dave=-1,erin=nan,=3,frank=inf,grace, heidi=0.5")
+
+    assert weights == {"alice": 2.0, "heidi": 0.5}